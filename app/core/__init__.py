@@ -3,6 +3,7 @@ Core modules for the application
 """
 
 from .config import settings
-from .database import Database
+from .database import Database, Transaction
+from .sqlite_backend import SqliteDatabase
 
-__all__ = ["settings", "Database"]
+__all__ = ["settings", "Database", "Transaction", "SqliteDatabase"]
@@ -19,6 +19,10 @@ class Settings(BaseSettings):
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     
+    # 데이터베이스 백엔드 (postgres | sqlite: 단일 서버 배포용 내장 DB)
+    DATABASE_BACKEND: str = os.getenv("DATABASE_BACKEND", "postgres")
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "data/wordquest.db")
+
     # 데이터베이스 설정 (WordQuest DB 공유)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://jayden@localhost:5432/wordquest")
     DATABASE_HOST: str = os.getenv("DATABASE_HOST", "localhost")
@@ -26,7 +30,43 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = os.getenv("DATABASE_NAME", "wordquest")
     DATABASE_USER: str = os.getenv("DATABASE_USER", "jayden")
     DATABASE_PASSWORD: str = os.getenv("DATABASE_PASSWORD", "")
-    
+
+    # 읽기 복제본 설정 (쉼표로 구분한 DSN 목록, 비어 있으면 프라이머리만 사용)
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = float(os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "10"))
+    DB_READ_YOUR_WRITES_SECONDS: float = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+    # 데이터베이스 계측 설정
+    DB_METRICS_ENABLED: bool = os.getenv("DB_METRICS_ENABLED", "True").lower() == "true"
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+    DB_SLOW_QUERY_LOG_SIZE: int = int(os.getenv("DB_SLOW_QUERY_LOG_SIZE", "100"))
+    DB_EXPLAIN_SAMPLE_RATE: float = float(os.getenv("DB_EXPLAIN_SAMPLE_RATE", "0.0"))
+
+    # 쿼리 시간 예산 (밀리초, 0이면 제한 없음)
+    DB_INTERACTIVE_TIMEOUT_MS: int = int(os.getenv("DB_INTERACTIVE_TIMEOUT_MS", "5000"))
+    DB_BATCH_TIMEOUT_MS: int = int(os.getenv("DB_BATCH_TIMEOUT_MS", "300000"))
+
+    # 스키마 부트스트랩 설정 (동시에 시작한 노드는 마이그레이션 잠금을 기다림)
+    DB_SCHEMA_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("DB_SCHEMA_LOCK_TIMEOUT_SECONDS", "300"))
+
+    # 학습 기록 write-behind 설정 (비동기 일괄 저장)
+    WRITE_BEHIND_ENABLED: bool = os.getenv("WRITE_BEHIND_ENABLED", "False").lower() == "true"
+    WRITE_BEHIND_BATCH_SIZE: int = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+    WRITE_BEHIND_FLUSH_INTERVAL_MS: int = int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", "500"))
+    WRITE_BEHIND_MAX_QUEUE: int = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+    WRITE_BEHIND_OVERFLOW: str = os.getenv("WRITE_BEHIND_OVERFLOW", "sync")  # sync | block
+    WRITE_BEHIND_JOURNAL_PATH: Optional[str] = os.getenv("WRITE_BEHIND_JOURNAL_PATH")
+    WRITE_BEHIND_JOURNAL_FSYNC: bool = os.getenv("WRITE_BEHIND_JOURNAL_FSYNC", "False").lower() == "true"
+    WRITE_BEHIND_DEAD_LETTER_PATH: Optional[str] = os.getenv("WRITE_BEHIND_DEAD_LETTER_PATH")
+
+    # 학습 기록 파티션/보존 설정 (월 단위 파티션)
+    LEARNING_PARTITION_MONTHS_AHEAD: int = int(os.getenv("LEARNING_PARTITION_MONTHS_AHEAD", "3"))
+    LEARNING_PARTITION_CHECK_INTERVAL_SECONDS: float = float(os.getenv("LEARNING_PARTITION_CHECK_INTERVAL_SECONDS", "3600"))
+    LEARNING_PARTITION_LOCK_TIMEOUT_MS: int = int(os.getenv("LEARNING_PARTITION_LOCK_TIMEOUT_MS", "2000"))
+    LEARNING_RETENTION_MONTHS: int = int(os.getenv("LEARNING_RETENTION_MONTHS", "0"))  # 0 = 무기한 보존
+    LEARNING_ARCHIVE_DIR: str = os.getenv("LEARNING_ARCHIVE_DIR", "archives")
+
     # OpenAI API 설정
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4")
@@ -36,6 +76,17 @@ class Settings(BaseSettings):
     SOLAR_API_KEY: Optional[str] = os.getenv("SOLAR_API_KEY")
     SOLAR_MODEL: str = os.getenv("SOLAR_MODEL", "solar-mini-250422")
     SOLAR_BASE_URL: str = os.getenv("SOLAR_BASE_URL", "https://api.upstage.ai/v1")
+
+    # 채팅 화면 기록 (세션에 보관하는 최근 대화 수, 이전 대화 한 번에 불러오는 수)
+    CHAT_TRANSCRIPT_MAX_TURNS: int = int(os.getenv("CHAT_TRANSCRIPT_MAX_TURNS", "20"))
+    CHAT_HISTORY_PAGE_SIZE: int = int(os.getenv("CHAT_HISTORY_PAGE_SIZE", "10"))
+    CHAT_TRANSCRIPT_MAX_EARLIER_TURNS: int = int(os.getenv("CHAT_TRANSCRIPT_MAX_EARLIER_TURNS", "100"))
+
+    # 페이지 데이터 동시 조회 스레드 수 (DB 연결 풀 크기 이하로 설정)
+    PAGE_LOADER_WORKERS: int = int(os.getenv("PAGE_LOADER_WORKERS", "4"))
+
+    # AI API HTTP 연결 풀 크기 (동시에 응답을 기다리는 요청 수)
+    AI_HTTP_POOL_SIZE: int = int(os.getenv("AI_HTTP_POOL_SIZE", "10"))
     
     # JWT 설정
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
@@ -56,6 +107,11 @@ class Settings(BaseSettings):
     
     # 캐시 설정
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+
+    # 사용자별 학습 통계 캐시 (memory | redis | none, redis는 REDIS_URL 사용)
+    STATS_CACHE_BACKEND: str = os.getenv("STATS_CACHE_BACKEND", "memory")
+    STATS_CACHE_TTL_SECONDS: float = float(os.getenv("STATS_CACHE_TTL_SECONDS", "300"))
+    STATS_CACHE_MAX_USERS: int = int(os.getenv("STATS_CACHE_MAX_USERS", "10000"))
     
     # 파일 업로드 설정
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
@@ -76,6 +132,10 @@ def get_database_url() -> str:
     else:
         return f"postgresql://{settings.DATABASE_USER}@{settings.DATABASE_HOST}:{settings.DATABASE_PORT}/{settings.DATABASE_NAME}"
 
+def get_replica_urls() -> list:
+    """읽기 복제본 DSN 목록"""
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
 def validate_settings() -> bool:
     """설정 유효성 검증"""
     required_vars = [
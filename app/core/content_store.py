@@ -0,0 +1,59 @@
+"""
+AI 응답 본문 내용 주소 기반(content-addressed) 중복 제거 저장소
+"""
+
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+BLOBS_TABLE = "claude_integration_content_blobs"
+
+# 학습 테이블별 본문 컬럼 -> 해시 컬럼
+BLOB_COLUMNS: Dict[str, Dict[str, str]] = {
+    'claude_integration_chat_messages': {'ai_response': 'ai_response_hash'},
+    'claude_integration_grammar_checks': {'corrected_text': 'corrected_text_hash'},
+    'claude_integration_vocabulary_checks': {'analysis_result': 'analysis_result_hash'},
+}
+
+# 다중 행 INSERT 시 테이블별로 덧붙일 충돌 처리 절
+INSERT_SUFFIXES: Dict[str, str] = {
+    BLOBS_TABLE: "ON CONFLICT (hash) DO NOTHING",
+}
+
+
+def content_hash(content: str) -> bytes:
+    """본문 SHA-256 해시 (SQL의 sha256(convert_to(content, 'UTF8'))와 동일)"""
+    return hashlib.sha256(content.encode('utf-8')).digest()
+
+
+def blob_record(content: str) -> Tuple[str, Tuple[str, ...], Tuple[Any, ...]]:
+    """본문 저장 행 (이미 있으면 INSERT_SUFFIXES에 따라 무시, 참조 수는 트리거가 관리)"""
+    return (
+        BLOBS_TABLE,
+        ('hash', 'content', 'byte_size'),
+        (content_hash(content), content, len(content.encode('utf-8')))
+    )
+
+
+def insert_suffix(table: str) -> str:
+    """테이블별 INSERT 충돌 처리 절"""
+    return INSERT_SUFFIXES.get(table, "")
+
+
+def blob_select(table: str, columns: Tuple[str, ...], alias: str = "t",
+                blob_alias_prefix: str = "b") -> Tuple[str, str]:
+    """본문 컬럼을 블롭에서 읽어오는 SELECT 식과 LEFT JOIN 절
+
+    반환값: (컬럼 식 목록, JOIN 절) - 기존 행처럼 본문이 테이블에 있으면 그대로 사용
+    """
+    blob_columns = BLOB_COLUMNS.get(table, {})
+    expressions = []
+    joins = []
+    for column in columns:
+        hash_column: Optional[str] = blob_columns.get(column)
+        if hash_column is None:
+            expressions.append(f"{alias}.{column}")
+            continue
+        blob_alias = f"{blob_alias_prefix}_{column}"
+        expressions.append(f"COALESCE({alias}.{column}, {blob_alias}.content) AS {column}")
+        joins.append(f"LEFT JOIN {BLOBS_TABLE} {blob_alias} ON {blob_alias}.hash = {alias}.{hash_column}")
+    return ", ".join(expressions), " ".join(joins)
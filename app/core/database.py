@@ -3,32 +3,325 @@ WordQuest 데이터베이스 연결 및 관리
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List
 from contextlib import contextmanager
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extensions import connection, cursor
 
-from .config import settings, get_database_url
+from .config import settings, get_database_url, get_replica_urls
+from .db_metrics import DatabaseMetrics, to_prometheus
+from .deadlines import BATCH, INTERACTIVE, get_watchdog
+from .migrations import (
+    MigrationRunner, REBUILD_COUNTERS_SQL, LOCK_COUNTERS_SQL, BACKFILL_ACTIVITIES_SQL,
+    REBUILD_DAILY_ROLLUP_SQL, LOCK_DAILY_ROLLUP_SQL, RECOUNT_BLOB_REFS_SQL, LOCK_BLOBS_SQL,
+    COLLECT_BLOBS_SQL
+)
+from .partitions import PartitionManager
+from .replicas import ReplicaRouter
 
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_RE = re.compile(r"%%|%\((\w+)\)s|%s")
+
+# 대기 중인 EXPLAIN 수집 상한 (넘으면 해당 샘플은 버림)
+EXPLAIN_MAX_PENDING = 4
+
+
+def _to_server_placeholders(query: str):
+    """psycopg2 플레이스홀더(%s, %(name)s)를 PREPARE용 $n으로 변환
+
+    반환값: (변환된 쿼리, 이름 목록 또는 위치 파라미터면 None)
+    """
+    names: List[str] = []
+    positional = 0
+
+    def replace(match):
+        nonlocal positional
+        if match.group(0) == "%%":
+            return "%"
+        if match.group(1):
+            if match.group(1) not in names:
+                names.append(match.group(1))
+            return f"${names.index(match.group(1)) + 1}"
+        positional += 1
+        return f"${positional}"
+
+    converted = _PLACEHOLDER_RE.sub(replace, query)
+    if names and positional:
+        raise ValueError("위치 파라미터와 이름 파라미터를 함께 사용할 수 없습니다")
+    return converted, (names if names else None)
+
+
+def _prepared_cache(conn) -> Dict[str, str]:
+    """연결별 준비된 문장 캐시 (이름 -> 원본 쿼리)"""
+    cache = getattr(conn, "prepared_statements", None)
+    if cache is None:
+        cache = {}
+        try:
+            conn.prepared_statements = cache
+        except AttributeError:
+            pass
+    return cache
+
+
+class PooledConnection(connection):
+    """준비된 문장 캐시를 보관하는 연결"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: Dict[str, str] = {}
+        # 세션에 설정된 statement_timeout (None이면 알 수 없음 → 다음 사용 시 설정)
+        self.statement_timeout_ms: Optional[int] = None
+
+
+class Transaction:
+    """하나의 연결/트랜잭션에서 여러 문장을 실행하는 작업 단위"""
+    
+    def __init__(self, db: "Database", conn, replica=None):
+        self.db = db
+        self.connection = conn
+        # 문장을 실행하는 복제본 (None이면 프라이머리, EXPLAIN 샘플링 대상 구분용)
+        self.replica = replica
+        self.cursor = db.new_cursor(conn)
+        self._tuple_cursor = None
+        self._savepoint_seq = 0
+        # 호출 전체의 마감 시각 (time.monotonic 기준, None이면 제한 없음)
+        self.deadline: Optional[float] = None
+    
+    def _check_deadline(self):
+        """마감 시각이 지났으면 다음 문장을 보내지 않고 취소 오류 발생"""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise psycopg2.extensions.QueryCanceledError("쿼리 시간 예산 초과")
+    
+    @property
+    def tuple_cursor(self):
+        """튜플 행을 반환하는 커서 (row_type 지정 시 사용)"""
+        if self._tuple_cursor is None:
+            self._tuple_cursor = self.connection.cursor()
+        return self._tuple_cursor
+    
+    def execute(self, query: str, params=None, fetch: Optional[bool] = None,
+                row_type=None) -> List[Any]:
+        """문장 실행 및 결과 반환
+
+        fetch=None이면 결과 집합 유무(cursor.description)로 판단합니다.
+        결과 행이 있으면 행 목록(SELECT, WITH, ... RETURNING),
+        없으면 [{"affected_rows": n}]을 반환합니다.
+        row_type(namedtuple 계열)을 지정하면 딕셔너리 대신 튜플 행을 row_type으로 반환합니다.
+        """
+        return self._run(query, params, fetch, query, params, row_type)
+    
+    def execute_prepared(self, name: str, query: str, params=None,
+                         fetch: Optional[bool] = None, row_type=None) -> List[Any]:
+        """서버 측 준비된 문장으로 실행 (연결별로 한 번만 PREPARE)"""
+        server_query, param_names = _to_server_placeholders(query)
+        cache = _prepared_cache(self.connection)
+        
+        if cache.get(name) != query:
+            # 캐시 미스: 롤백 등으로 캐시를 비웠을 수 있으므로 세션 상태를 확인 후 PREPARE
+            prepare_sql = f"PREPARE {name} AS {server_query}"
+            self.cursor.execute(
+                "SELECT statement FROM pg_prepared_statements WHERE name = %s", (name,)
+            )
+            existing = self.cursor.fetchone()
+            if not existing or existing['statement'].split() != prepare_sql.split():
+                if existing:
+                    self.cursor.execute(f"DEALLOCATE {name}")
+                self.cursor.execute(prepare_sql)
+            cache[name] = query
+        
+        if param_names is None:
+            args = tuple(params or ())
+        else:
+            args = tuple(params[param_name] for param_name in param_names)
+        execute_sql = f"EXECUTE {name}"
+        if args:
+            execute_sql += f" ({', '.join(['%s'] * len(args))})"
+        return self._run(execute_sql, args, fetch, query, params, row_type)
+    
+    def _run(self, sql: str, args, fetch: Optional[bool], label: str, label_params,
+             row_type=None) -> List[Any]:
+        """문장 실행, 결과 변환 및 계측"""
+        started = time.perf_counter()
+        rows = 0
+        error = False
+        cursor = self.cursor if row_type is None else self.tuple_cursor
+        try:
+            self._check_deadline()
+            cursor.execute(sql, args)
+            if fetch is None:
+                fetch = cursor.description is not None
+            if fetch:
+                result = cursor.fetchall() if cursor.description is not None else []
+                if row_type is not None:
+                    result = list(map(row_type._make, result))
+                rows = len(result)
+            else:
+                rows = cursor.rowcount
+                result = [{"affected_rows": cursor.rowcount}]
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.db._observe_query(label, label_params, started, rows, error, self.replica)
+    
+    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        """같은 문장을 여러 파라미터로 실행"""
+        started = time.perf_counter()
+        rows = 0
+        error = False
+        try:
+            self._check_deadline()
+            self.cursor.executemany(query, params_list)
+            rows = self.cursor.rowcount
+            return rows
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.db._observe_query(query, None, started, rows, error, self.replica)
+    
+    def execute_values(self, query: str, rows: List[tuple]) -> int:
+        """다중 행 VALUES INSERT ("... VALUES %s")"""
+        started = time.perf_counter()
+        error = False
+        try:
+            self._check_deadline()
+            execute_values(self.cursor, query, rows, page_size=max(len(rows), 1))
+            return len(rows)
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.db._observe_query(query, None, started, 0 if error else len(rows), error, self.replica)
+    
+    def execute_pipelined(self, statements: List[tuple]) -> int:
+        """여러 문장을 한 번의 왕복으로 전송 [(query, params), ...]
+
+        psycopg2는 파이프라인 모드가 없으므로 문장들을 클라이언트에서 바인딩해
+        하나의 다중 문장 요청으로 보냅니다. 결과 행은 반환하지 않습니다.
+        """
+        batch = b";\n".join(self.cursor.mogrify(query, params) for query, params in statements)
+        query_text = ";\n".join(query.strip() for query, _ in statements)
+        started = time.perf_counter()
+        error = False
+        try:
+            self._check_deadline()
+            self.cursor.execute(batch)
+            return len(statements)
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.db._observe_query(query_text, None, started, 0, error, self.replica)
+    
+    @contextmanager
+    def savepoint(self, name: Optional[str] = None):
+        """세이브포인트 (블록 내 예외 시 해당 지점까지만 롤백하고 예외 전파)"""
+        self._savepoint_seq += 1
+        name = name or f"sp_{self._savepoint_seq}"
+        self.cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except Exception:
+            self.cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        else:
+            self.cursor.execute(f"RELEASE SAVEPOINT {name}")
+    
+    def close(self):
+        """커서 종료"""
+        self.cursor.close()
+        if self._tuple_cursor is not None:
+            self._tuple_cursor.close()
+
+
 class Database:
     """WordQuest 데이터베이스 연결 관리"""
     
     def __init__(self):
         self.connection_pool = None
-        self._init_connection_pool()
+        self.metrics = DatabaseMetrics(
+            enabled=settings.DB_METRICS_ENABLED,
+            slow_query_ms=settings.DB_SLOW_QUERY_MS,
+            slow_log_size=settings.DB_SLOW_QUERY_LOG_SIZE,
+            explain_sample_rate=settings.DB_EXPLAIN_SAMPLE_RATE
+        )
+        self.replicas = ReplicaRouter(
+            get_replica_urls(),
+            max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+            check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+            read_your_writes=settings.DB_READ_YOUR_WRITES_SECONDS,
+            connection_factory=PooledConnection
+        )
+        # 연결 풀은 처음 연결을 요청할 때 현재 프로세스에서 생성 (import 시 연결하지 않음)
+        self._pool_pid: Optional[int] = None
+        self._pool_lock = threading.Lock()
+        # 이 프로세스에서 스키마 부트스트랩을 마쳤는지 여부
+        self._schema_ready = False
+        # 마지막 파티션 점검 시각 (쓰기 경로에서 주기적으로 점검)
+        self._partitions_checked_at: Optional[float] = None
+        self._partition_check_lock = threading.Lock()
+        # 호출 유형별 쿼리 시간 예산 (밀리초, 0이면 제한 없음)
+        self.budgets = {
+            INTERACTIVE: settings.DB_INTERACTIVE_TIMEOUT_MS,
+            BATCH: settings.DB_BATCH_TIMEOUT_MS,
+        }
+        self.watchdog = get_watchdog()
+        # 샘플링한 쿼리의 EXPLAIN은 요청 스레드가 아닌 백그라운드 스레드 하나에서 수집
+        self._explain_executor: Optional[ThreadPoolExecutor] = None
+        self._explain_pending = 0
+        self._explain_lock = threading.Lock()
+    
+    def _ensure_pool(self):
+        """현재 프로세스의 연결 풀 반환 (fork된 자식이면 상속한 풀을 버리고 새로 생성)"""
+        pid = os.getpid()
+        if self._pool_pid != pid:
+            with self._pool_lock:
+                if self._pool_pid != pid:
+                    if self._pool_pid is not None:
+                        self.reset_after_fork()
+                    self._init_connection_pool()
+                    self._pool_pid = pid
+        return self.connection_pool
+    
+    def reset_after_fork(self):
+        """fork된 자식 프로세스에서 부모의 연결 상태 폐기
+
+        상속한 연결은 부모와 소켓을 공유하므로 닫지 않고(닫으면 부모 세션이 종료됨)
+        참조만 보관한 채 버리고, 다음 요청 때 자식 프로세스의 풀을 새로 만듭니다.
+        """
+        if self.connection_pool is not None:
+            _inherited_pools.append(self.connection_pool)
+        self.connection_pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+        self._partition_check_lock = threading.Lock()
+        # 작업 스레드는 자식 프로세스에 없으므로 실행기를 버림
+        self._explain_executor = None
+        self._explain_pending = 0
+        self._explain_lock = threading.Lock()
+        _inherited_pools.extend(self.replicas.reset_after_fork())
     
     def _init_connection_pool(self):
         """연결 풀 초기화"""
         try:
             database_url = get_database_url()
-            self.connection_pool = SimpleConnectionPool(
+            # 세션 스레드와 백그라운드 플러시 스레드가 풀을 공유하므로 스레드 안전 풀 사용
+            self.connection_pool = ThreadedConnectionPool(
                 minconn=1,
                 maxconn=10,
-                dsn=database_url
+                dsn=database_url,
+                connection_factory=PooledConnection
             )
             logger.info("✅ 데이터베이스 연결 풀 초기화 완료")
         except Exception as e:
@@ -36,17 +329,27 @@ class Database:
             self.connection_pool = None
     
     @contextmanager
-    def get_connection(self):
-        """데이터베이스 연결 컨텍스트 매니저"""
+    def get_connection(self, budget=BATCH):
+        """데이터베이스 연결 컨텍스트 매니저
+
+        budget: 연결에 적용할 시간 예산 (세션 statement_timeout, None이면 제한 없음).
+        풀 연결에는 이전 사용자가 설정한 값이 남아 있으므로 빌릴 때마다 맞춥니다.
+        """
         conn = None
         try:
-            if self.connection_pool:
-                conn = self.connection_pool.getconn()
-                yield conn
-            else:
-                # 연결 풀이 없으면 직접 연결
-                conn = psycopg2.connect(get_database_url())
-                yield conn
+            checkout_started = time.perf_counter()
+            try:
+                if self._ensure_pool():
+                    conn = self.connection_pool.getconn()
+                else:
+                    # 연결 풀이 없으면 직접 연결
+                    conn = psycopg2.connect(get_database_url(), connection_factory=PooledConnection)
+            except Exception:
+                self.metrics.record_checkout(0.0, failed=True)
+                raise
+            self.metrics.record_checkout((time.perf_counter() - checkout_started) * 1000)
+            self._apply_budget(conn, budget)
+            yield conn
         except Exception as e:
             logger.error(f"데이터베이스 연결 오류: {e}")
             if conn:
@@ -60,10 +363,10 @@ class Database:
                     conn.close()
     
     @contextmanager
-    def get_cursor(self, commit: bool = True):
-        """데이터베이스 커서 컨텍스트 매니저"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
+    def get_cursor(self, commit: bool = True, budget=BATCH):
+        """데이터베이스 커서 컨텍스트 매니저 (budget: get_connection과 같음)"""
+        with self.get_connection(budget) as conn:
+            cursor = self.new_cursor(conn)
             try:
                 yield cursor
                 if commit:
@@ -74,6 +377,10 @@ class Database:
             finally:
                 cursor.close()
     
+    def new_cursor(self, conn):
+        """딕셔너리 행을 반환하는 커서 생성"""
+        return conn.cursor(cursor_factory=RealDictCursor)
+    
     def test_connection(self) -> bool:
         """데이터베이스 연결 테스트"""
         try:
@@ -86,29 +393,320 @@ class Database:
             logger.error(f"❌ 데이터베이스 연결 테스트 실패: {e}")
             return False
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
-        """쿼리 실행 및 결과 반환"""
+    @contextmanager
+    def transaction(self, budget=INTERACTIVE):
+        """작업 단위 트랜잭션 컨텍스트 매니저
+
+        with db.transaction() as tx:
+            tx.execute(...)
+            with tx.savepoint():
+                tx.execute(...)
+
+        블록이 정상 종료되면 커밋, 예외가 발생하면 롤백합니다.
+        budget: 시간 예산 ('interactive', 'batch', 밀리초 숫자, None이면 제한 없음)
+        """
+        with self.get_connection(budget) as conn:
+            with self._transaction_scope(conn, budget) as tx:
+                yield tx
+    
+    def timeout_ms(self, budget) -> int:
+        """시간 예산을 밀리초로 변환 (0이면 제한 없음)"""
+        if budget is None:
+            return 0
+        if isinstance(budget, (int, float)):
+            return max(int(budget), 0)
+        if budget not in self.budgets:
+            raise ValueError(f"알 수 없는 쿼리 시간 예산: {budget}")
+        return self.budgets[budget]
+    
+    def _apply_budget(self, conn, budget):
+        """빌린 연결의 세션 statement_timeout을 시간 예산에 맞춤 (바로 커밋해 세션 값으로 유지)"""
+        timeout_ms = self.timeout_ms(budget)
+        if getattr(conn, "statement_timeout_ms", None) == timeout_ms:
+            return
+        with conn.cursor() as cursor:
+            self._set_statement_timeout(cursor, conn, timeout_ms)
+        if not conn.autocommit:
+            conn.commit()
+    
+    def _set_statement_timeout(self, cursor, conn, timeout_ms: int):
+        """세션 statement_timeout 설정 (연결에 이미 같은 값이면 생략)"""
+        if getattr(conn, "statement_timeout_ms", None) == timeout_ms:
+            return
+        cursor.execute("SELECT set_config('statement_timeout', %s, false)", (str(timeout_ms),))
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute(query, params)
-                if query.strip().upper().startswith('SELECT'):
-                    return cursor.fetchall()
-                else:
-                    return [{"affected_rows": cursor.rowcount}]
+            conn.statement_timeout_ms = timeout_ms
+        except AttributeError:
+            pass
+    
+    @contextmanager
+    def _transaction_scope(self, conn, budget=INTERACTIVE, replica=None):
+        """주어진 연결에서 커밋/롤백 범위 관리
+
+        시간 예산이 있으면 서버의 statement_timeout(문장 단위)과 함께
+        호출 전체의 마감 시각을 감시해 넘으면 connection.cancel()로 취소합니다.
+        replica: 연결을 빌린 복제본 (프라이머리 연결이면 None)
+        """
+        tx = Transaction(self, conn, replica)
+        timeout_ms = self.timeout_ms(budget)
+        token = None
+        try:
+            self._set_statement_timeout(tx.cursor, conn, timeout_ms)
+            if timeout_ms:
+                tx.deadline = time.monotonic() + timeout_ms / 1000
+                token = self.watchdog.watch(conn, tx.deadline)
+            yield tx
+            if token is not None:
+                self.watchdog.release(token)
+                token = None
+            conn.commit()
+        except Exception:
+            if token is not None:
+                self.watchdog.release(token)
+                token = None
+            if not conn.closed:
+                conn.rollback()
+            # 롤백된 트랜잭션 안의 PREPARE/SET은 신뢰할 수 없으므로 캐시를 비움
+            _prepared_cache(conn).clear()
+            if hasattr(conn, "statement_timeout_ms"):
+                conn.statement_timeout_ms = None
+            raise
+        finally:
+            if token is not None:
+                self.watchdog.release(token)
+            if not conn.closed:
+                tx.close()
+    
+    @contextmanager
+    def _replica_transaction(self, replica, budget=INTERACTIVE):
+        """복제본 연결에서의 읽기 트랜잭션"""
+        conn = replica.ensure_pool().getconn()
+        broken = False
+        try:
+            with self._transaction_scope(conn, budget, replica) as tx:
+                yield tx
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            replica.pool.putconn(conn, close=broken or bool(conn.closed))
+    
+    def _read(self, work, user_id=None, budget=INTERACTIVE):
+        """읽기 작업을 복제본에서 실행 (복제본 장애 시 프라이머리에서 재시도)
+
+        시간 예산 초과(QueryCanceledError)는 프라이머리에서 다시 시도하지 않습니다.
+        """
+        replica = self.replicas.choose(user_id)
+        if replica is not None:
+            try:
+                with self._replica_transaction(replica, budget) as tx:
+                    return work(tx)
+            except psycopg2.extensions.QueryCanceledError:
+                raise
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                self.replicas.record_failure(replica, e)
+        with self.transaction(budget) as tx:
+            return work(tx)
+    
+    def note_write(self, user_id):
+        """사용자 쓰기 기록 (read-your-writes: 잠시 해당 사용자의 읽기를 프라이머리로)"""
+        self.replicas.note_write(user_id)
+    
+    def execute_query(self, query: str, params: Optional[tuple] = None,
+                      fetch: Optional[bool] = None, read_only: bool = False,
+                      user_id: Optional[int] = None, row_type=None,
+                      budget=INTERACTIVE) -> List[Any]:
+        """쿼리 실행 및 결과 반환
+
+        결과 행이 있는 문장(SELECT, WITH, ... RETURNING)은 행 목록을,
+        그 외에는 [{"affected_rows": n}]을 반환합니다. fetch로 강제할 수 있습니다.
+        read_only=True이면 복제본으로 라우팅합니다 (user_id는 read-your-writes 판단용).
+        row_type을 지정하면 행을 딕셔너리 대신 row_type 튜플로 반환합니다.
+        budget을 넘기면 쿼리를 취소하고 QueryCanceledError를 발생시킵니다.
+        """
+        try:
+            if read_only:
+                return self._read(
+                    lambda tx: tx.execute(query, params, fetch=fetch, row_type=row_type), user_id, budget
+                )
+            with self.transaction(budget) as tx:
+                return tx.execute(query, params, fetch=fetch, row_type=row_type)
         except Exception as e:
             logger.error(f"쿼리 실행 오류: {e}")
             raise
     
-    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+    def execute_prepared(self, name: str, query: str, params=None,
+                         fetch: Optional[bool] = None, read_only: bool = False,
+                         user_id: Optional[int] = None, row_type=None,
+                         budget=INTERACTIVE) -> List[Any]:
+        """자주 쓰는 고정 쿼리를 서버 측 준비된 문장으로 실행 (연결별 캐시)"""
+        try:
+            if read_only:
+                return self._read(
+                    lambda tx: tx.execute_prepared(name, query, params, fetch=fetch, row_type=row_type),
+                    user_id, budget
+                )
+            with self.transaction(budget) as tx:
+                return tx.execute_prepared(name, query, params, fetch=fetch, row_type=row_type)
+        except Exception as e:
+            logger.error(f"준비된 문장 실행 오류 ({name}): {e}")
+            raise
+    
+    def stream_query(self, query: str, params=None, itersize: int = 2000,
+                     row_type=None, budget=BATCH) -> Iterator[Any]:
+        """서버 측(named) 커서로 결과를 itersize행씩 가져오는 제너레이터
+
+        전체 결과를 메모리에 올리지 않으므로 결과 크기와 무관하게 메모리 사용량이 일정합니다.
+        제너레이터를 끝까지 소비하거나 close()할 때까지 연결을 점유합니다.
+        row_type을 지정하면 행을 딕셔너리 대신 row_type 튜플로 반환합니다.
+        budget은 FETCH 한 번마다의 제한이며 (소비 속도는 호출자에 달려 있으므로)
+        전체 스트림의 마감 시각은 두지 않습니다.
+        """
+        started = time.perf_counter()
+        rows = 0
+        error = False
+        with self.get_connection(budget) as conn:
+            cursor = conn.cursor(
+                name=f"wq_stream_{uuid.uuid4().hex[:12]}",
+                cursor_factory=RealDictCursor if row_type is None else None
+            )
+            cursor.itersize = itersize
+            try:
+                cursor.execute(query, params)
+                for row in cursor:
+                    rows += 1
+                    yield row if row_type is None else row_type._make(row)
+            except Exception:
+                error = True
+                raise
+            finally:
+                if not conn.closed:
+                    cursor.close()
+                    conn.rollback()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.metrics.record_query(query, elapsed_ms, rows, error)
+    
+    def execute_many(self, query: str, params_list: List[tuple], budget=BATCH) -> int:
         """여러 쿼리 실행"""
         try:
-            with self.get_cursor() as cursor:
-                cursor.executemany(query, params_list)
-                return cursor.rowcount
+            with self.transaction(budget) as tx:
+                return tx.execute_many(query, params_list)
         except Exception as e:
             logger.error(f"여러 쿼리 실행 오류: {e}")
             raise
     
+    def execute_values_batch(self, statements: List[tuple], budget=BATCH) -> int:
+        """여러 다중 행 INSERT를 한 트랜잭션에서 실행 [("... VALUES %s", [행, ...]), ...]"""
+        try:
+            with self.transaction(budget) as tx:
+                return sum(tx.execute_values(query, rows) for query, rows in statements)
+        except Exception as e:
+            logger.error(f"일괄 INSERT 실행 오류: {e}")
+            raise
+    
+    def _observe_query(self, query: str, params, started: float, rows: int, error: bool,
+                       replica=None):
+        """쿼리 계측 기록 (슬로우 쿼리 로그, EXPLAIN 샘플링)
+
+        replica: 쿼리를 실행한 복제본 (EXPLAIN도 같은 대상에서 실행, None이면 프라이머리)
+        """
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self.metrics.record_query(query, elapsed_ms, max(rows, 0), error):
+            logger.warning(f"🐢 슬로우 쿼리 ({elapsed_ms:.1f}ms): {' '.join(query.split())[:200]}")
+        if not error and self.metrics.should_explain(query):
+            self._submit_explain(query, params, replica)
+    
+    def _submit_explain(self, query: str, params, replica=None):
+        """EXPLAIN 수집을 백그라운드 스레드에 맡김 (대기 중인 수집이 많으면 샘플을 버림)
+
+        요청 스레드가 연결을 쥔 채 두 번째 연결을 빌리거나 쿼리를 다시 실행하며
+        기다리지 않도록 SQL과 파라미터만 넘깁니다.
+        """
+        with self._explain_lock:
+            if self._explain_pending >= EXPLAIN_MAX_PENDING:
+                return
+            if self._explain_executor is None:
+                self._explain_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="db-explain"
+                )
+            self._explain_pending += 1
+            executor = self._explain_executor
+        try:
+            executor.submit(self._run_explain, query, params, replica)
+        except RuntimeError:
+            # close()로 실행기가 종료된 뒤에 끝난 쿼리
+            with self._explain_lock:
+                self._explain_pending -= 1
+    
+    def _run_explain(self, query: str, params, replica=None):
+        """백그라운드 EXPLAIN 작업 (완료 후 대기 수 감소)"""
+        try:
+            self._capture_explain(query, params, replica)
+        finally:
+            with self._explain_lock:
+                self._explain_pending -= 1
+    
+    def _capture_explain(self, query: str, params, replica=None):
+        """샘플링된 쿼리의 EXPLAIN (ANALYZE, BUFFERS) 수집 (원래 쿼리를 실행한 대상에서)"""
+        try:
+            if replica is not None:
+                plan = self._explain_on_replica(replica, query, params)
+            else:
+                with self.get_connection(INTERACTIVE) as conn:
+                    plan = self._explain(conn, query, params)
+            if plan:
+                self.metrics.record_explain(query, list(plan.values())[0])
+        except Exception as e:
+            logger.warning(f"EXPLAIN 수집 실패: {e}")
+    
+    def _explain_on_replica(self, replica, query: str, params):
+        """복제본 연결을 빌려 EXPLAIN 실행"""
+        conn = replica.ensure_pool().getconn()
+        broken = False
+        try:
+            self._apply_budget(conn, INTERACTIVE)
+            return self._explain(conn, query, params)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            replica.pool.putconn(conn, close=broken or bool(conn.closed))
+    
+    def _explain(self, conn, query: str, params):
+        """계측 대상에서 제외하기 위해 커서를 직접 사용하고 결과는 롤백"""
+        cursor = self.new_cursor(conn)
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            if not conn.closed:
+                conn.rollback()
+    
+    def get_pool_status(self) -> Dict[str, Any]:
+        """연결 풀 사용 현황"""
+        pool = self.connection_pool
+        if not pool:
+            return {"pooled": False, "in_use": 0, "idle": 0, "max": 0}
+        return {
+            "pooled": True,
+            "in_use": len(pool._used),
+            "idle": len(pool._pool),
+            "max": pool.maxconn
+        }
+    
+    def get_metrics_snapshot(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """풀/쿼리 계측 스냅샷 (디버그 사이드바, 메트릭 엔드포인트용)"""
+        snapshot = self.metrics.snapshot(self.get_pool_status(), top=top)
+        if self.replicas.enabled:
+            snapshot["replication"] = self.replicas.status()
+        snapshot["query_budgets"] = {**self.budgets, "cancelled": self.watchdog.cancelled}
+        return snapshot
+    
+    def get_metrics_text(self) -> str:
+        """Prometheus 텍스트 포맷 계측값"""
+        return to_prometheus(self.get_metrics_snapshot())
+    
     def table_exists(self, table_name: str) -> bool:
         """테이블 존재 여부 확인"""
         try:
@@ -126,115 +724,173 @@ class Database:
             logger.error(f"테이블 존재 확인 오류: {e}")
             return False
     
-    def create_tables_if_not_exist(self):
-        """필요한 테이블들이 없으면 생성"""
-        try:
-            # 사용자 테이블
-            if not self.table_exists('claude_integration_users'):
-                self._create_users_table()
-            
-            # 채팅 메시지 테이블
-            if not self.table_exists('claude_integration_chat_messages'):
-                self._create_chat_messages_table()
-            
-            # 문법 검사 테이블
-            if not self.table_exists('claude_integration_grammar_checks'):
-                self._create_grammar_checks_table()
-            
-            # 어휘 분석 테이블
-            if not self.table_exists('claude_integration_vocabulary_checks'):
-                self._create_vocabulary_checks_table()
-            
-            # 학습 활동 테이블
-            if not self.table_exists('claude_integration_learning_activities'):
-                self._create_learning_activities_table()
-            
-            logger.info("✅ 필요한 테이블 생성 완료")
-            
+    def create_tables_if_not_exist(self, allow_offline: bool = False) -> List[int]:
+        """대기 중인 스키마 마이그레이션 적용 (테이블/인덱스/트리거 생성)
+
+        스키마 버전이 최신이면 확인 쿼리만 실행하고, 프로세스당 한 번만 수행합니다.
+        기존 데이터를 잠그고 다시 쓰는 오프라인 마이그레이션은 allow_offline=True
+        (db_tools migrate)일 때만 적용합니다 (대상 테이블이 비어 있으면 항상 적용).
+        """
+        if self._schema_ready:
+            return []
+        try:
+            runner = MigrationRunner(self, lock_timeout=settings.DB_SCHEMA_LOCK_TIMEOUT_SECONDS)
+            applied = runner.run(allow_offline=allow_offline)
+            if applied:
+                logger.info(f"✅ 스키마 마이그레이션 적용 완료: {applied}")
+            else:
+                logger.info(f"✅ 스키마가 최신 상태입니다 (버전 {runner.schema_version})")
+            self.ensure_partitions()
+            self._schema_ready = True
+            return applied
         except Exception as e:
             logger.error(f"❌ 테이블 생성 중 오류: {e}")
             raise
     
-    def _create_users_table(self):
-        """사용자 테이블 생성"""
-        query = """
-        CREATE TABLE claude_integration_users (
-            id SERIAL PRIMARY KEY,
-            username VARCHAR(50) UNIQUE NOT NULL,
-            email VARCHAR(100) UNIQUE NOT NULL,
-            password_hash VARCHAR(255) NOT NULL,
-            full_name VARCHAR(100) NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_active BOOLEAN DEFAULT TRUE,
-            last_login TIMESTAMP
-        );
-        """
-        self.execute_query(query)
-    
-    def _create_chat_messages_table(self):
-        """채팅 메시지 테이블 생성"""
-        query = """
-        CREATE TABLE claude_integration_chat_messages (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
-            user_message TEXT NOT NULL,
-            ai_response TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            message_type VARCHAR(20) DEFAULT 'chat'
-        );
-        """
-        self.execute_query(query)
-    
-    def _create_grammar_checks_table(self):
-        """문법 검사 테이블 생성"""
-        query = """
-        CREATE TABLE claude_integration_grammar_checks (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
-            original_text TEXT NOT NULL,
-            corrected_text TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
+    def ensure_partitions(self, lock_timeout_ms: Optional[int] = None) -> List[str]:
+        """학습 기록 테이블의 향후 월 파티션 사전 생성 (DEFAULT 파티션에 들어간 행도 정리)"""
+        created = PartitionManager(self).ensure_future_partitions(
+            settings.LEARNING_PARTITION_MONTHS_AHEAD, lock_timeout_ms=lock_timeout_ms
+        )
+        self._partitions_checked_at = time.monotonic()
+        return created
+    
+    def ensure_partitions_if_due(self):
+        """마지막 점검 후 LEARNING_PARTITION_CHECK_INTERVAL_SECONDS가 지났으면 파티션 점검
+
+        쓰기 경로에서 호출하므로 오래 실행되는 프로세스도 월이 바뀌기 전에 파티션을 만듭니다.
+        한 스레드만 점검하고, 테이블 잠금은 잠깐만 기다리며, 실패해도 다음 주기에 다시 시도합니다.
         """
-        self.execute_query(query)
-    
-    def _create_vocabulary_checks_table(self):
-        """어휘 분석 테이블 생성"""
-        query = """
-        CREATE TABLE claude_integration_vocabulary_checks (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
-            original_text TEXT NOT NULL,
-            analysis_result TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
+        interval = settings.LEARNING_PARTITION_CHECK_INTERVAL_SECONDS
+        checked_at = self._partitions_checked_at
+        if interval <= 0 or (checked_at is not None and time.monotonic() - checked_at < interval):
+            return
+        if not self._partition_check_lock.acquire(blocking=False):
+            return
+        try:
+            self.ensure_partitions(lock_timeout_ms=settings.LEARNING_PARTITION_LOCK_TIMEOUT_MS)
+        except Exception as e:
+            self._partitions_checked_at = time.monotonic()
+            logger.warning(f"파티션 점검 실패 (다음 주기에 재시도): {e}")
+        finally:
+            self._partition_check_lock.release()
+    
+    def archive_expired_partitions(self, retention_months: Optional[int] = None,
+                                   archive_dir: Optional[str] = None) -> List[Dict[str, str]]:
+        """보존 기간이 지난 월 파티션을 분리/압축 보관 후 삭제
+
+        DEFAULT 파티션에 남은 행을 먼저 월 파티션으로 옮겨 함께 보관되게 합니다.
         """
-        self.execute_query(query)
-    
-    def _create_learning_activities_table(self):
-        """학습 활동 테이블 생성"""
-        query = """
-        CREATE TABLE claude_integration_learning_activities (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
-            activity_type VARCHAR(50) NOT NULL,
-            description TEXT NOT NULL,
-            metadata JSONB,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
+        try:
+            self.ensure_partitions()
+            archived = PartitionManager(self).archive_expired(
+                settings.LEARNING_RETENTION_MONTHS if retention_months is None else retention_months,
+                archive_dir or settings.LEARNING_ARCHIVE_DIR
+            )
+            logger.info(f"✅ 파티션 아카이브 완료: {len(archived)}개")
+            return archived
+        except Exception as e:
+            logger.error(f"❌ 파티션 아카이브 실패: {e}")
+            raise
+    
+    def get_migration_status(self) -> List[Dict[str, Any]]:
+        """스키마 마이그레이션 적용 현황"""
+        return MigrationRunner(self).status()
+    
+    def rebuild_user_learning_counters(self, user_id: Optional[int] = None) -> int:
+        """학습 카운터를 원본 테이블에서 다시 계산 (백필/재구축)"""
+        try:
+            with self.get_cursor() as cursor:
+                # 재계산 중 트리거 증분이 덮어써지지 않도록 쓰기를 잠시 대기시킴
+                cursor.execute(LOCK_COUNTERS_SQL)
+                cursor.execute(REBUILD_COUNTERS_SQL, {'user_id': user_id})
+                rebuilt = cursor.rowcount
+            logger.info(f"✅ 학습 카운터 재구축 완료: {rebuilt}명")
+            return rebuilt
+        except Exception as e:
+            logger.error(f"❌ 학습 카운터 재구축 실패: {e}")
+            raise
+    
+    def rebuild_daily_activity_rollup(self, user_id: Optional[int] = None) -> int:
+        """일별 활동 집계를 학습 활동 기록에서 다시 계산"""
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(LOCK_DAILY_ROLLUP_SQL)
+                cursor.execute(REBUILD_DAILY_ROLLUP_SQL, {'user_id': user_id})
+                rebuilt = cursor.rowcount
+            logger.info(f"✅ 일별 활동 집계 재구축 완료: {rebuilt}행")
+            return rebuilt
+        except Exception as e:
+            logger.error(f"❌ 일별 활동 집계 재구축 실패: {e}")
+            raise
+    
+    def collect_content_blobs(self, grace_minutes: int = 60) -> Dict[str, int]:
+        """참조 수를 재계산하고 참조되지 않는 본문 블롭 삭제
+
+        grace_minutes보다 최근에 만들어진 블롭은 남겨 둡니다.
         """
-        self.execute_query(query)
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(LOCK_BLOBS_SQL)
+                cursor.execute(RECOUNT_BLOB_REFS_SQL)
+                recounted = cursor.rowcount
+                cursor.execute(COLLECT_BLOBS_SQL, {'grace': f"{int(grace_minutes)} minutes"})
+                deleted = cursor.rowcount
+            logger.info(f"✅ 본문 블롭 정리 완료: 참조 수 보정 {recounted}건, 삭제 {deleted}건")
+            return {'recounted': recounted, 'deleted': deleted}
+        except Exception as e:
+            logger.error(f"❌ 본문 블롭 정리 실패: {e}")
+            raise
+    
+    def backfill_learning_activities(self, user_id: Optional[int] = None) -> int:
+        """학습 활동 기록이 없는 사용자의 활동을 채팅/문법/어휘 기록에서 생성"""
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(BACKFILL_ACTIVITIES_SQL, {'user_id': user_id})
+                backfilled = cursor.rowcount
+            logger.info(f"✅ 학습 활동 백필 완료: {backfilled}건")
+            return backfilled
+        except Exception as e:
+            logger.error(f"❌ 학습 활동 백필 실패: {e}")
+            raise
     
     def close(self):
         """데이터베이스 연결 종료"""
+        if self._explain_executor is not None:
+            self._explain_executor.shutdown(wait=True)
+            self._explain_executor = None
         if self.connection_pool:
             self.connection_pool.closeall()
             logger.info("✅ 데이터베이스 연결 풀 종료")
+        self.connection_pool = None
+        self._pool_pid = None
+        self.replicas.close()
 
-# 전역 데이터베이스 인스턴스
-db = Database()
+# 전역 데이터베이스 인스턴스 (처음 사용할 때 생성)
+_db: Optional[Database] = None
+_db_lock = threading.Lock()
+# fork 전에 만들어진 연결 (자식 프로세스에서 닫히지 않도록 참조 유지)
+_inherited_pools: List[Any] = []
 
 def get_db() -> Database:
-    """데이터베이스 인스턴스 반환"""
-    return db
+    """데이터베이스 인스턴스 반환 (DATABASE_BACKEND 설정에 따라 PostgreSQL 또는 SQLite)"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                if settings.DATABASE_BACKEND == "sqlite":
+                    from .sqlite_backend import SqliteDatabase
+                    _db = SqliteDatabase()
+                else:
+                    _db = Database()
+    return _db
+
+def _reset_db_after_fork():
+    """fork된 자식 프로세스에서 잠금과 연결 풀 초기화"""
+    global _db_lock
+    _db_lock = threading.Lock()
+    if _db is not None:
+        _db.reset_after_fork()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_db_after_fork)
@@ -0,0 +1,222 @@
+"""
+데이터베이스 연결 풀 및 쿼리 계측
+"""
+
+import re
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+# 지연 시간 히스토그램 버킷 상한 (밀리초)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_COMMENT_RE = re.compile(r"--[^\n]*")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint_query(query: str) -> str:
+    """쿼리 지문 생성 (리터럴/파라미터/공백 정규화)"""
+    fingerprint = _COMMENT_RE.sub(" ", query)
+    fingerprint = _STRING_RE.sub("?", fingerprint)
+    fingerprint = _PARAM_RE.sub("?", fingerprint)
+    fingerprint = _NUMBER_RE.sub("?", fingerprint)
+    fingerprint = _IN_LIST_RE.sub("(?)", fingerprint)
+    return _SPACE_RE.sub(" ", fingerprint).strip()
+
+
+class QueryStats:
+    """쿼리 지문별 누적 통계"""
+
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "rows", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        # 마지막 칸은 +Inf 버킷
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def observe(self, elapsed_ms: float, rows: int, error: bool):
+        """실행 결과 반영"""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        if error:
+            self.errors += 1
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """스냅샷용 딕셔너리 변환"""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "histogram": {
+                **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                "le_inf": self.buckets[-1],
+            },
+        }
+
+
+class DatabaseMetrics:
+    """연결 풀/쿼리 계측 수집기 (스레드 안전)"""
+
+    def __init__(self, enabled: bool = True, slow_query_ms: float = 200.0,
+                 slow_log_size: int = 100, explain_sample_rate: float = 0.0,
+                 explain_log_size: int = 20):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.explain_sample_rate = explain_sample_rate
+        self._lock = threading.Lock()
+        self._slow_queries = deque(maxlen=slow_log_size)
+        self._explains = deque(maxlen=explain_log_size)
+        self._queries: Dict[str, QueryStats] = {}
+        self._checkouts = 0
+        self._checkout_failures = 0
+        self._checkout_wait_total_ms = 0.0
+        self._checkout_wait_max_ms = 0.0
+        self._started_at = time.time()
+
+    def record_checkout(self, wait_ms: float, failed: bool = False):
+        """연결 획득 대기 시간 기록"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if failed:
+                self._checkout_failures += 1
+                return
+            self._checkouts += 1
+            self._checkout_wait_total_ms += wait_ms
+            self._checkout_wait_max_ms = max(self._checkout_wait_max_ms, wait_ms)
+
+    def record_query(self, query: str, elapsed_ms: float, rows: int = 0,
+                     error: bool = False) -> bool:
+        """쿼리 실행 기록, 슬로우 쿼리 여부 반환"""
+        if not self.enabled:
+            return False
+        fingerprint = fingerprint_query(query)
+        is_slow = elapsed_ms >= self.slow_query_ms
+        with self._lock:
+            stats = self._queries.get(fingerprint)
+            if stats is None:
+                stats = self._queries[fingerprint] = QueryStats()
+            stats.observe(elapsed_ms, rows, error)
+            if is_slow:
+                self._slow_queries.append({
+                    "fingerprint": fingerprint,
+                    "elapsed_ms": round(elapsed_ms, 3),
+                    "rows": rows,
+                    "error": error,
+                    "at": time.time(),
+                })
+        return is_slow
+
+    def should_explain(self, query: str) -> bool:
+        """EXPLAIN 샘플링 대상 여부 (조회 쿼리만)"""
+        if not self.enabled or self.explain_sample_rate <= 0:
+            return False
+        head = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+        if head != "SELECT":
+            return False
+        return random.random() < self.explain_sample_rate
+
+    def record_explain(self, query: str, plan: Any):
+        """샘플링된 실행 계획 기록"""
+        with self._lock:
+            self._explains.append({
+                "fingerprint": fingerprint_query(query),
+                "plan": plan,
+                "at": time.time(),
+            })
+
+    def snapshot(self, pool_status: Optional[Dict[str, Any]] = None,
+                 top: Optional[int] = None) -> Dict[str, Any]:
+        """현재 계측값 스냅샷 반환"""
+        with self._lock:
+            queries = sorted(
+                ((fp, stats.to_dict()) for fp, stats in self._queries.items()),
+                key=lambda item: item[1]["total_ms"],
+                reverse=True,
+            )
+            if top is not None:
+                queries = queries[:top]
+            checkouts = self._checkouts
+            return {
+                "enabled": self.enabled,
+                "uptime_seconds": round(time.time() - self._started_at, 1),
+                "pool": {
+                    **(pool_status or {}),
+                    "checkouts": checkouts,
+                    "checkout_failures": self._checkout_failures,
+                    "checkout_wait_avg_ms": round(self._checkout_wait_total_ms / checkouts, 3) if checkouts else 0.0,
+                    "checkout_wait_max_ms": round(self._checkout_wait_max_ms, 3),
+                },
+                "slow_query_threshold_ms": self.slow_query_ms,
+                "queries": [{"fingerprint": fp, **stats} for fp, stats in queries],
+                "slow_queries": list(self._slow_queries),
+                "explains": list(self._explains),
+            }
+
+    def reset(self):
+        """계측값 초기화"""
+        with self._lock:
+            self._queries.clear()
+            self._slow_queries.clear()
+            self._explains.clear()
+            self._checkouts = 0
+            self._checkout_failures = 0
+            self._checkout_wait_total_ms = 0.0
+            self._checkout_wait_max_ms = 0.0
+            self._started_at = time.time()
+
+
+def to_prometheus(snapshot: Dict[str, Any], prefix: str = "wordquest_db") -> str:
+    """스냅샷을 Prometheus 텍스트 포맷으로 변환 (메트릭 엔드포인트용)"""
+    lines: List[str] = []
+    pool = snapshot.get("pool", {})
+
+    for key in ("in_use", "idle", "max"):
+        if key in pool:
+            lines.append(f"# TYPE {prefix}_pool_{key} gauge")
+            lines.append(f"{prefix}_pool_{key} {pool[key]}")
+    lines.append(f"# TYPE {prefix}_pool_checkouts_total counter")
+    lines.append(f"{prefix}_pool_checkouts_total {pool.get('checkouts', 0)}")
+    lines.append(f"# TYPE {prefix}_pool_checkout_failures_total counter")
+    lines.append(f"{prefix}_pool_checkout_failures_total {pool.get('checkout_failures', 0)}")
+    lines.append(f"# TYPE {prefix}_pool_checkout_wait_ms_max gauge")
+    lines.append(f"{prefix}_pool_checkout_wait_ms_max {pool.get('checkout_wait_max_ms', 0.0)}")
+
+    lines.append(f"# TYPE {prefix}_query_latency_ms histogram")
+    for query in snapshot.get("queries", []):
+        label = query["fingerprint"][:120].replace("\\", "\\\\").replace('"', '\\"')
+        cumulative = 0
+        for bound in LATENCY_BUCKETS_MS:
+            cumulative += query["histogram"][f"le_{bound}"]
+            lines.append(f'{prefix}_query_latency_ms_bucket{{query="{label}",le="{bound}"}} {cumulative}')
+        cumulative += query["histogram"]["le_inf"]
+        lines.append(f'{prefix}_query_latency_ms_bucket{{query="{label}",le="+Inf"}} {cumulative}')
+        lines.append(f'{prefix}_query_latency_ms_sum{{query="{label}"}} {query["total_ms"]}')
+        lines.append(f'{prefix}_query_latency_ms_count{{query="{label}"}} {query["count"]}')
+        lines.append(f'{prefix}_query_rows_total{{query="{label}"}} {query["rows"]}')
+        lines.append(f'{prefix}_query_errors_total{{query="{label}"}} {query["errors"]}')
+
+    lines.append(f"# TYPE {prefix}_slow_queries_logged gauge")
+    lines.append(f"{prefix}_slow_queries_logged {len(snapshot.get('slow_queries', []))}")
+    return "\n".join(lines) + "\n"
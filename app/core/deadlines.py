@@ -0,0 +1,106 @@
+"""
+쿼리 시간 예산과 클라이언트 측 취소 (connection.cancel)
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 예산 이름 (대화형: 화면 요청, 배치: 내보내기/가져오기/백그라운드 저장)
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+class QueryWatchdog:
+    """마감 시각이 지난 연결의 실행 중인 쿼리를 취소하는 감시 스레드
+
+    호출마다 타이머 스레드를 만들지 않도록 스레드 하나가 마감 시각 힙을 관리합니다.
+    서버의 statement_timeout은 문장 단위이므로, 여러 문장에 걸친 호출 전체의 마감이나
+    네트워크 지연처럼 서버가 모르는 경우를 이 감시자가 처리합니다.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._active: Dict[int, object] = {}
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.cancelled = 0
+
+    def watch(self, conn, deadline: float) -> int:
+        """연결을 마감 시각(time.monotonic 기준)까지 감시, 해제용 토큰 반환"""
+        token = next(self._seq)
+        with self._condition:
+            self._ensure_thread()
+            self._active[token] = conn
+            heapq.heappush(self._heap, (deadline, token))
+            self._condition.notify()
+        return token
+
+    def release(self, token: int):
+        """감시 해제 (호출이 마감 전에 끝남)"""
+        with self._condition:
+            self._active.pop(token, None)
+
+    def _ensure_thread(self):
+        """감시 스레드 시작 (fork된 자식 프로세스에서는 새로 시작)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._heap = []
+        self._active = {}
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="query-watchdog", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._heap and self._heap[0][1] not in self._active:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                deadline, token = self._heap[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+                # 취소 요청을 보낼 때까지 잠금을 유지해, release() 후 연결이 다른 요청에
+                # 재사용된 뒤에 취소가 도착하지 않도록 함
+                self._cancel(self._active.pop(token))
+
+    def _cancel(self, conn):
+        """서버에 취소 요청 (쿼리가 없으면 서버에서 무시됨)"""
+        try:
+            if not conn.closed:
+                conn.cancel()
+                self.cancelled += 1
+                logger.warning("⏱️ 쿼리 시간 예산 초과로 실행 중인 쿼리를 취소했습니다")
+        except Exception as e:
+            logger.warning(f"쿼리 취소 실패: {e}")
+
+
+_watchdog = QueryWatchdog()
+
+
+def get_watchdog() -> QueryWatchdog:
+    """쿼리 감시자 인스턴스 반환"""
+    return _watchdog
+
+
+def _reset_watchdog_after_fork():
+    """fork된 자식 프로세스에서 잠금 초기화 (감시 스레드는 처음 사용할 때 다시 시작)"""
+    _watchdog._condition = threading.Condition()
+    _watchdog._thread = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_watchdog_after_fork)
@@ -0,0 +1,736 @@
+"""
+버전 기반 스키마 마이그레이션
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import psycopg2
+
+from .content_store import BLOBS_TABLE, BLOB_COLUMNS
+from .partitions import (
+    PARTITIONED_TABLES, add_months, create_month_partitions, is_partitioned, month_start
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "claude_integration_schema_migrations"
+
+# 스키마 부트스트랩 advisory lock 키 (여러 노드가 동시에 시작해도 한 노드만 마이그레이션)
+SCHEMA_LOCK_ID = 0x5751_0001
+
+# 학습 카운터 트리거 대상 테이블과 카운터 종류
+LEARNING_COUNTER_SOURCES = {
+    'claude_integration_chat_messages': 'chat',
+    'claude_integration_grammar_checks': 'grammar_check',
+    'claude_integration_vocabulary_checks': 'vocabulary_check',
+    'claude_integration_learning_activities': 'activity',
+}
+
+# 사용자별 최신순 조회 (WHERE user_id = ? ORDER BY created_at DESC) 대상 테이블
+USER_HISTORY_TABLES = (
+    'claude_integration_chat_messages',
+    'claude_integration_grammar_checks',
+    'claude_integration_vocabulary_checks',
+    'claude_integration_learning_activities',
+)
+
+REBUILD_COUNTERS_SQL = """
+INSERT INTO claude_integration_user_learning_counters AS c
+    (user_id, total_chats, grammar_checks, vocabulary_checks, total_activities,
+     first_activity_at, last_activity_at, updated_at)
+SELECT
+    u.id,
+    (SELECT COUNT(*) FROM claude_integration_chat_messages WHERE user_id = u.id),
+    (SELECT COUNT(*) FROM claude_integration_grammar_checks WHERE user_id = u.id),
+    (SELECT COUNT(*) FROM claude_integration_vocabulary_checks WHERE user_id = u.id),
+    a.total_activities,
+    a.first_activity_at,
+    a.last_activity_at,
+    CURRENT_TIMESTAMP
+FROM claude_integration_users u
+CROSS JOIN LATERAL (
+    SELECT COUNT(*) AS total_activities,
+           MIN(created_at) AS first_activity_at,
+           MAX(created_at) AS last_activity_at
+    FROM claude_integration_learning_activities
+    WHERE user_id = u.id
+) a
+WHERE (%(user_id)s::INTEGER IS NULL OR u.id = %(user_id)s::INTEGER)
+ON CONFLICT (user_id) DO UPDATE SET
+    total_chats = EXCLUDED.total_chats,
+    grammar_checks = EXCLUDED.grammar_checks,
+    vocabulary_checks = EXCLUDED.vocabulary_checks,
+    total_activities = EXCLUDED.total_activities,
+    first_activity_at = EXCLUDED.first_activity_at,
+    last_activity_at = EXCLUDED.last_activity_at,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+# 학습 활동 기록이 없는 사용자의 활동을 원본 테이블에서 생성 (백필)
+BACKFILL_ACTIVITIES_SQL = """
+INSERT INTO claude_integration_learning_activities
+    (user_id, activity_type, description, metadata, created_at)
+SELECT src.user_id, src.activity_type, src.description, src.metadata, src.created_at
+FROM (
+    SELECT user_id, 'chat' AS activity_type,
+           'AI와의 영어 학습 대화: ' || LEFT(user_message, 50) || '...' AS description,
+           jsonb_build_object('source', 'chat_messages', 'backfilled', TRUE) AS metadata,
+           created_at
+    FROM claude_integration_chat_messages
+    UNION ALL
+    SELECT user_id, 'grammar_check',
+           '문법 검사 완료: ' || LEFT(original_text, 50) || '...',
+           jsonb_build_object('source', 'grammar_checks', 'backfilled', TRUE),
+           created_at
+    FROM claude_integration_grammar_checks
+    UNION ALL
+    SELECT user_id, 'vocabulary_check',
+           '어휘 분석 완료: ' || LEFT(original_text, 50) || '...',
+           jsonb_build_object('source', 'vocabulary_checks', 'backfilled', TRUE),
+           created_at
+    FROM claude_integration_vocabulary_checks
+) src
+WHERE (%(user_id)s::INTEGER IS NULL OR src.user_id = %(user_id)s::INTEGER)
+  AND NOT EXISTS (
+      SELECT 1 FROM claude_integration_learning_activities a
+      WHERE a.user_id = src.user_id
+  )
+"""
+
+# 삭제된 기록의 집계가 남지 않도록 대상 사용자 행을 지우고 다시 계산
+REBUILD_DAILY_ROLLUP_SQL = """
+DELETE FROM claude_integration_daily_activity_rollup
+WHERE (%(user_id)s::INTEGER IS NULL OR user_id = %(user_id)s::INTEGER);
+
+INSERT INTO claude_integration_daily_activity_rollup
+    (user_id, day, activity_type, activity_count)
+SELECT user_id, created_at::DATE, activity_type, COUNT(*)
+FROM claude_integration_learning_activities
+WHERE user_id IS NOT NULL AND created_at IS NOT NULL
+  AND (%(user_id)s::INTEGER IS NULL OR user_id = %(user_id)s::INTEGER)
+GROUP BY user_id, created_at::DATE, activity_type
+"""
+
+LOCK_DAILY_ROLLUP_SQL = "LOCK TABLE claude_integration_daily_activity_rollup IN SHARE ROW EXCLUSIVE MODE"
+
+# 블롭 참조 수를 학습 테이블 기준으로 다시 계산 (파티션 DROP 등 트리거를 거치지 않은 삭제 보정)
+RECOUNT_BLOB_REFS_SQL = f"""
+WITH refs AS (
+    SELECT hash, COUNT(*) AS refs
+    FROM (
+        {' UNION ALL '.join(
+            f"SELECT {hash_column} AS hash FROM {table_name} WHERE {hash_column} IS NOT NULL"
+            for table_name, columns in BLOB_COLUMNS.items()
+            for hash_column in columns.values()
+        )}
+    ) referenced
+    GROUP BY hash
+)
+UPDATE {BLOBS_TABLE} b
+SET ref_count = COALESCE(r.refs, 0)
+FROM {BLOBS_TABLE} b2
+LEFT JOIN refs r ON r.hash = b2.hash
+WHERE b.hash = b2.hash AND b.ref_count IS DISTINCT FROM COALESCE(r.refs, 0)
+"""
+
+# 쓰기 트랜잭션(블롭 INSERT)이 끝날 때까지 대기시켜 참조 증가 전 블롭이 삭제되지 않게 함
+LOCK_BLOBS_SQL = f"LOCK TABLE {BLOBS_TABLE} IN SHARE ROW EXCLUSIVE MODE"
+
+COLLECT_BLOBS_SQL = f"""
+DELETE FROM {BLOBS_TABLE}
+WHERE ref_count <= 0 AND created_at < CURRENT_TIMESTAMP - %(grace)s::INTERVAL
+"""
+
+LOCK_COUNTERS_SQL = "LOCK TABLE claude_integration_user_learning_counters IN SHARE ROW EXCLUSIVE MODE"
+
+Step = Union[str, Callable]
+
+
+class Migration:
+    """스키마 마이그레이션 단위
+
+    transactional=False 인 마이그레이션은 autocommit 모드로 실행됩니다
+    (CREATE INDEX CONCURRENTLY 등 트랜잭션 블록 안에서 실행할 수 없는 DDL).
+    offline_tables에 지정한 테이블을 잠그고 다시 쓰는 마이그레이션은 그 테이블이 비어 있을
+    때만 앱 시작 시 적용하고, 데이터가 있으면 db_tools migrate로 적용해야 합니다.
+    """
+
+    def __init__(self, version: int, name: str, steps: List[Step], transactional: bool = True,
+                 offline_tables: Tuple[str, ...] = ()):
+        self.version = version
+        self.name = name
+        self.steps = steps
+        self.transactional = transactional
+        self.offline_tables = offline_tables
+
+    def apply(self, cursor):
+        """마이그레이션 단계 실행 (SQL 문자열 또는 cursor를 받는 함수)"""
+        for step in self.steps:
+            if callable(step):
+                step(cursor)
+            else:
+                cursor.execute(step)
+
+
+def create_index_concurrently(index_name: str, table_name: str, columns: str) -> Callable:
+    """쓰기 잠금 없이 인덱스를 생성하는 단계 (실패로 남은 INVALID 인덱스는 재생성)"""
+    def step(cursor):
+        cursor.execute("""
+            SELECT i.indisvalid AS is_valid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s
+        """, (index_name,))
+        existing = cursor.fetchone()
+        if existing and not existing['is_valid']:
+            logger.warning(f"INVALID 인덱스 재생성: {index_name}")
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+        cursor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({columns})"
+        )
+    return step
+
+
+def _create_learning_counter_triggers(cursor):
+    """학습 기록 INSERT 시 카운터를 증분 갱신하는 트리거 생성"""
+    for table_name, counter_kind in LEARNING_COUNTER_SOURCES.items():
+        trigger_name = f"{table_name}_counters_trg"
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}")
+        cursor.execute(f"""
+            CREATE TRIGGER {trigger_name}
+            AFTER INSERT ON {table_name}
+            FOR EACH ROW EXECUTE FUNCTION claude_integration_bump_learning_counters('{counter_kind}')
+        """)
+
+
+def _backfill_learning_counters(cursor):
+    """학습 카운터 백필"""
+    cursor.execute(LOCK_COUNTERS_SQL)
+    cursor.execute(REBUILD_COUNTERS_SQL, {'user_id': None})
+
+
+def _create_daily_rollup_trigger(cursor):
+    """학습 활동 INSERT 시 일별 집계를 갱신하는 트리거 생성"""
+    cursor.execute(
+        "DROP TRIGGER IF EXISTS claude_integration_learning_activities_rollup_trg "
+        "ON claude_integration_learning_activities"
+    )
+    cursor.execute("""
+        CREATE TRIGGER claude_integration_learning_activities_rollup_trg
+        AFTER INSERT ON claude_integration_learning_activities
+        FOR EACH ROW EXECUTE FUNCTION claude_integration_bump_daily_activity_rollup()
+    """)
+
+
+def partition_by_month(table_name: str, months_ahead: int = 3) -> Callable:
+    """기존 테이블을 created_at 월 단위 RANGE 파티션 테이블로 전환하는 단계
+
+    새 파티션 테이블에 기존 행을 옮긴 뒤 이름을 바꾸고, id 시퀀스와
+    사용자별 최신순 인덱스, 카운터/집계 트리거를 다시 연결합니다.
+    """
+    def step(cursor):
+        if is_partitioned(cursor, table_name):
+            return
+        staging = f"{table_name}__partitioned"
+        cursor.execute(f"LOCK TABLE {table_name} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id') AS seq", (table_name,))
+        sequence = cursor.fetchone()['seq']
+
+        # 파티션 키는 기본 키에 포함되어야 하므로 (id, created_at)
+        cursor.execute(f"UPDATE {table_name} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+        cursor.execute(f"""
+            CREATE TABLE {staging} (
+                LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+            ) PARTITION BY RANGE (created_at)
+        """)
+        cursor.execute(f"ALTER TABLE {staging} ALTER COLUMN created_at SET NOT NULL")
+        cursor.execute(f"ALTER TABLE {staging} ADD PRIMARY KEY (id, created_at)")
+        cursor.execute(f"""
+            ALTER TABLE {staging} ADD FOREIGN KEY (user_id)
+            REFERENCES claude_integration_users(id) ON DELETE CASCADE
+        """)
+
+        cursor.execute(f"SELECT MIN(created_at) AS first_at FROM {table_name}")
+        first_at = cursor.fetchone()['first_at']
+        this_month = month_start(datetime.utcnow().date())
+        first_month = month_start(first_at.date()) if first_at else this_month
+        create_month_partitions(
+            cursor, table_name, first_month, add_months(this_month, months_ahead), parent=staging
+        )
+        cursor.execute(f"CREATE TABLE {table_name}_default PARTITION OF {staging} DEFAULT")
+
+        # 트리거가 없는 새 테이블로 옮기므로 카운터/집계는 중복 증가하지 않음
+        cursor.execute(f"INSERT INTO {staging} SELECT * FROM {table_name}")
+        if sequence:
+            cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {staging}.id")
+        cursor.execute(f"DROP TABLE {table_name}")
+        cursor.execute(f"ALTER TABLE {staging} RENAME TO {table_name}")
+        cursor.execute(f"ALTER INDEX {staging}_pkey RENAME TO {table_name}_pkey")
+
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS {table_name}_user_created_idx
+            ON {table_name} (user_id, created_at DESC, id DESC)
+        """)
+    return step
+
+
+def _set_blob_compression(cursor):
+    """본문 컬럼 TOAST 압축을 lz4로 설정 (PostgreSQL 14+, lz4 지원 빌드에서만)"""
+    cursor.execute("SHOW server_version_num")
+    if int(cursor.fetchone()['server_version_num']) < 140000:
+        return
+    cursor.execute("SAVEPOINT blob_compression")
+    try:
+        cursor.execute(f"ALTER TABLE {BLOBS_TABLE} ALTER COLUMN content SET COMPRESSION lz4")
+        cursor.execute("RELEASE SAVEPOINT blob_compression")
+    except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT blob_compression")
+        logger.warning(f"lz4 압축을 사용할 수 없어 기본(pglz) 압축을 사용합니다: {e}")
+
+
+def _move_text_to_blobs(cursor):
+    """기존 본문을 블롭 테이블로 옮기고 해시로 대체"""
+    for table_name, columns in BLOB_COLUMNS.items():
+        for column, hash_column in columns.items():
+            cursor.execute(f"""
+                INSERT INTO {BLOBS_TABLE} (hash, content, byte_size)
+                SELECT sha256(convert_to({column}, 'UTF8')), {column}, octet_length({column})
+                FROM {table_name}
+                WHERE {column} IS NOT NULL
+                ON CONFLICT (hash) DO NOTHING
+            """)
+            cursor.execute(f"""
+                UPDATE {table_name}
+                SET {hash_column} = sha256(convert_to({column}, 'UTF8')), {column} = NULL
+                WHERE {column} IS NOT NULL
+            """)
+
+
+def _create_blob_ref_triggers(cursor):
+    """학습 기록 INSERT/DELETE 시 블롭 참조 수를 갱신하는 트리거 생성"""
+    for table_name, columns in BLOB_COLUMNS.items():
+        for hash_column in columns.values():
+            trigger_name = f"{table_name}_{hash_column}_ref_trg"
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}")
+            cursor.execute(f"""
+                CREATE TRIGGER {trigger_name}
+                AFTER INSERT OR DELETE ON {table_name}
+                FOR EACH ROW EXECUTE FUNCTION claude_integration_track_blob_refs('{hash_column}')
+            """)
+
+
+def _recount_blob_refs(cursor):
+    """블롭 참조 수 재계산"""
+    cursor.execute(RECOUNT_BLOB_REFS_SQL)
+
+
+def _backfill_daily_activity_rollup(cursor):
+    """일별 활동 집계 백필"""
+    cursor.execute(LOCK_DAILY_ROLLUP_SQL)
+    cursor.execute(REBUILD_DAILY_ROLLUP_SQL, {'user_id': None})
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create_learning_tables", [
+        """
+        CREATE TABLE IF NOT EXISTS claude_integration_users (
+            id SERIAL PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            full_name VARCHAR(100) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT TRUE,
+            last_login TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS claude_integration_chat_messages (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+            user_message TEXT NOT NULL,
+            ai_response TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            message_type VARCHAR(20) DEFAULT 'chat'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS claude_integration_grammar_checks (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+            original_text TEXT NOT NULL,
+            corrected_text TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS claude_integration_vocabulary_checks (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+            original_text TEXT NOT NULL,
+            analysis_result TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS claude_integration_learning_activities (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+            activity_type VARCHAR(50) NOT NULL,
+            description TEXT NOT NULL,
+            metadata JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    Migration(2, "user_learning_counters", [
+        """
+        CREATE TABLE IF NOT EXISTS claude_integration_user_learning_counters (
+            user_id INTEGER PRIMARY KEY REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+            total_chats BIGINT NOT NULL DEFAULT 0,
+            grammar_checks BIGINT NOT NULL DEFAULT 0,
+            vocabulary_checks BIGINT NOT NULL DEFAULT 0,
+            total_activities BIGINT NOT NULL DEFAULT 0,
+            first_activity_at TIMESTAMP,
+            last_activity_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE OR REPLACE FUNCTION claude_integration_bump_learning_counters()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            counter_kind TEXT := TG_ARGV[0];
+        BEGIN
+            IF NEW.user_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            INSERT INTO claude_integration_user_learning_counters AS c
+                (user_id, total_chats, grammar_checks, vocabulary_checks, total_activities,
+                 first_activity_at, last_activity_at, updated_at)
+            VALUES (
+                NEW.user_id,
+                CASE WHEN counter_kind = 'chat' THEN 1 ELSE 0 END,
+                CASE WHEN counter_kind = 'grammar_check' THEN 1 ELSE 0 END,
+                CASE WHEN counter_kind = 'vocabulary_check' THEN 1 ELSE 0 END,
+                CASE WHEN counter_kind = 'activity' THEN 1 ELSE 0 END,
+                CASE WHEN counter_kind = 'activity' THEN NEW.created_at END,
+                CASE WHEN counter_kind = 'activity' THEN NEW.created_at END,
+                CURRENT_TIMESTAMP
+            )
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_chats = c.total_chats + EXCLUDED.total_chats,
+                grammar_checks = c.grammar_checks + EXCLUDED.grammar_checks,
+                vocabulary_checks = c.vocabulary_checks + EXCLUDED.vocabulary_checks,
+                total_activities = c.total_activities + EXCLUDED.total_activities,
+                first_activity_at = LEAST(c.first_activity_at, EXCLUDED.first_activity_at),
+                last_activity_at = GREATEST(c.last_activity_at, EXCLUDED.last_activity_at),
+                updated_at = CURRENT_TIMESTAMP;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        _create_learning_counter_triggers,
+        _backfill_learning_counters,
+    ]),
+    Migration(3, "user_history_indexes", [
+        # created_at 동률 시 id로 정렬 순서를 고정 (키셋 페이지네이션 대비)
+        create_index_concurrently(
+            f"{table_name}_user_created_idx", table_name, "user_id, created_at DESC, id DESC"
+        )
+        for table_name in USER_HISTORY_TABLES
+    ], transactional=False),
+    Migration(4, "daily_activity_rollup", [
+        """
+        CREATE TABLE IF NOT EXISTS claude_integration_daily_activity_rollup (
+            user_id INTEGER NOT NULL REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+            day DATE NOT NULL,
+            activity_type VARCHAR(50) NOT NULL,
+            activity_count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day, activity_type)
+        )
+        """,
+        """
+        CREATE OR REPLACE FUNCTION claude_integration_bump_daily_activity_rollup()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF NEW.user_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            INSERT INTO claude_integration_daily_activity_rollup AS r
+                (user_id, day, activity_type, activity_count)
+            VALUES (NEW.user_id, COALESCE(NEW.created_at, CURRENT_TIMESTAMP)::DATE, NEW.activity_type, 1)
+            ON CONFLICT (user_id, day, activity_type) DO UPDATE SET
+                activity_count = r.activity_count + 1;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        _create_daily_rollup_trigger,
+        _backfill_daily_activity_rollup,
+    ]),
+    Migration(5, "partition_learning_tables", [
+        *[partition_by_month(table_name) for table_name in PARTITIONED_TABLES],
+        _create_learning_counter_triggers,
+        _create_daily_rollup_trigger,
+    ], offline_tables=PARTITIONED_TABLES),
+    # 생성 컬럼 추가는 테이블 전체를 ACCESS EXCLUSIVE 잠금으로 다시 씀
+    Migration(6, "full_text_search", [
+        # 영어는 형태소(어간) 검색, 한국어 등은 simple 설정으로 원형 토큰 검색
+        """
+        ALTER TABLE claude_integration_chat_messages
+        ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(user_message, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(ai_response, '')), 'B') ||
+            setweight(to_tsvector('simple', COALESCE(user_message, '')), 'C') ||
+            setweight(to_tsvector('simple', COALESCE(ai_response, '')), 'D')
+        ) STORED
+        """,
+        """
+        ALTER TABLE claude_integration_grammar_checks
+        ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(original_text, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(corrected_text, '')), 'B') ||
+            setweight(to_tsvector('simple', COALESCE(original_text, '')), 'C') ||
+            setweight(to_tsvector('simple', COALESCE(corrected_text, '')), 'D')
+        ) STORED
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS claude_integration_chat_messages_search_idx
+        ON claude_integration_chat_messages USING GIN (search_vector)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS claude_integration_grammar_checks_search_idx
+        ON claude_integration_grammar_checks USING GIN (search_vector)
+        """,
+    ], offline_tables=('claude_integration_chat_messages', 'claude_integration_grammar_checks')),
+    Migration(7, "content_addressed_blobs", [
+        f"""
+        CREATE TABLE IF NOT EXISTS {BLOBS_TABLE} (
+            hash BYTEA PRIMARY KEY,
+            content TEXT NOT NULL,
+            byte_size INTEGER NOT NULL,
+            ref_count BIGINT NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            search_vector TSVECTOR GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', content), 'B') ||
+                setweight(to_tsvector('simple', content), 'D')
+            ) STORED
+        )
+        """,
+        _set_blob_compression,
+        f"""
+        CREATE INDEX IF NOT EXISTS {BLOBS_TABLE}_search_idx
+        ON {BLOBS_TABLE} USING GIN (search_vector)
+        """,
+        *[
+            statement
+            for table_name, columns in BLOB_COLUMNS.items()
+            for column, hash_column in columns.items()
+            for statement in (
+                f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {hash_column} BYTEA",
+                f"ALTER TABLE {table_name} ALTER COLUMN {column} DROP NOT NULL",
+                # 참조 재계산과 검색 시 블롭 → 사용자 기록 조회용
+                f"CREATE INDEX IF NOT EXISTS {table_name}_{hash_column}_idx "
+                f"ON {table_name} ({hash_column}, user_id)",
+            )
+        ],
+        _move_text_to_blobs,
+        f"""
+        CREATE OR REPLACE FUNCTION claude_integration_track_blob_refs()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            hash_column TEXT := TG_ARGV[0];
+            blob_hash BYTEA;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                EXECUTE format('SELECT ($1).%I', hash_column) USING NEW INTO blob_hash;
+                IF blob_hash IS NOT NULL THEN
+                    UPDATE {BLOBS_TABLE} SET ref_count = ref_count + 1 WHERE hash = blob_hash;
+                END IF;
+            ELSIF TG_OP = 'DELETE' THEN
+                EXECUTE format('SELECT ($1).%I', hash_column) USING OLD INTO blob_hash;
+                IF blob_hash IS NOT NULL THEN
+                    UPDATE {BLOBS_TABLE} SET ref_count = ref_count - 1 WHERE hash = blob_hash;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        _create_blob_ref_triggers,
+        _recount_blob_refs,
+    ], offline_tables=tuple(BLOB_COLUMNS)),
+]
+
+
+class MigrationRunner:
+    """마이그레이션 실행기 (적용 이력은 MIGRATIONS_TABLE에 기록)"""
+
+    def __init__(self, db, migrations: List[Migration] = None, lock_timeout: float = 300.0):
+        self.db = db
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+        self.lock_timeout = lock_timeout
+
+    @property
+    def schema_version(self) -> int:
+        """코드가 기대하는 스키마 버전 (마지막 마이그레이션 버전)"""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def _recorded_versions(self, cursor) -> Optional[List[int]]:
+        """기록된 마이그레이션 버전 목록 (이력 테이블이 없으면 None)"""
+        try:
+            cursor.execute(
+                f"SELECT COALESCE(array_agg(version ORDER BY version), '{{}}') AS versions FROM {MIGRATIONS_TABLE}"
+            )
+        except psycopg2.errors.UndefinedTable:
+            cursor.connection.rollback()
+            return None
+        return list(cursor.fetchone()['versions'])
+
+    def is_current(self, cursor) -> bool:
+        """모든 마이그레이션이 적용되었는지 한 번의 쿼리로 확인"""
+        return self._recorded_versions(cursor) == [migration.version for migration in self.migrations]
+
+    def _acquire_lock(self, cursor):
+        """스키마 advisory lock 획득 (다른 노드가 마이그레이션 중이면 대기)
+
+        대기 중에 트랜잭션/스냅샷을 잡고 있으면 다른 노드의 CREATE INDEX CONCURRENTLY가
+        끝나지 않으므로, 자동 커밋 상태에서 pg_try_advisory_lock을 반복 시도합니다.
+        """
+        deadline = time.monotonic() + self.lock_timeout
+        waiting = False
+        while True:
+            cursor.execute("SELECT pg_try_advisory_lock(%s) AS locked", (SCHEMA_LOCK_ID,))
+            if cursor.fetchone()['locked']:
+                return
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"스키마 잠금 대기 시간 초과 ({self.lock_timeout}s)")
+            if not waiting:
+                logger.info("⏳ 다른 프로세스가 스키마 마이그레이션 중입니다. 대기합니다...")
+                waiting = True
+            time.sleep(0.5)
+
+    def _release_lock(self, cursor):
+        """스키마 advisory lock 해제"""
+        cursor.execute("SELECT pg_advisory_unlock(%s)", (SCHEMA_LOCK_ID,))
+
+    def _ensure_history_table(self, cursor):
+        """마이그레이션 이력 테이블 생성"""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                duration_ms INTEGER
+            )
+        """)
+
+    def _applied_versions(self, cursor) -> Dict[int, Dict]:
+        """적용된 마이그레이션 목록"""
+        cursor.execute(f"SELECT version, name, applied_at, duration_ms FROM {MIGRATIONS_TABLE}")
+        return {row['version']: dict(row) for row in cursor.fetchall()}
+
+    def status(self) -> List[Dict]:
+        """마이그레이션별 적용 상태"""
+        with self.db.get_cursor() as cursor:
+            self._ensure_history_table(cursor)
+            applied = self._applied_versions(cursor)
+        return [
+            {
+                'version': migration.version,
+                'name': migration.name,
+                'applied': migration.version in applied,
+                'applied_at': applied.get(migration.version, {}).get('applied_at'),
+            }
+            for migration in self.migrations
+        ]
+
+    def run(self, allow_offline: bool = False) -> List[int]:
+        """대기 중인 마이그레이션 적용, 적용한 버전 목록 반환
+
+        스키마가 최신이면 버전 확인 쿼리 한 번으로 끝납니다. 아니면 advisory lock을
+        잡은 뒤 적용 이력을 다시 읽어, 먼저 잠금을 잡은 노드가 적용한 버전은 건너뜁니다.
+        allow_offline=False면 데이터가 있는 테이블을 다시 쓰는 마이그레이션 앞에서 멈추고
+        오류를 발생시킵니다 (그 전까지 적용한 버전은 유지).
+        """
+        applied_now = []
+        # 테이블 전체를 다시 쓰는 마이그레이션이 있으므로 시간 예산 없이 실행
+        with self.db.get_connection(budget=None) as conn:
+            cursor = self.db.new_cursor(conn)
+            try:
+                if self.is_current(cursor):
+                    conn.commit()
+                    return applied_now
+
+                conn.rollback()
+                conn.autocommit = True
+                self._acquire_lock(cursor)
+                try:
+                    conn.autocommit = False
+                    self._ensure_history_table(cursor)
+                    conn.commit()
+                    applied = self._applied_versions(cursor)
+                    conn.commit()
+
+                    for migration in self.migrations:
+                        if migration.version in applied:
+                            continue
+                        if not allow_offline:
+                            self._check_online(cursor, migration)
+                            conn.commit()
+                        self._apply(conn, cursor, migration)
+                        applied_now.append(migration.version)
+                finally:
+                    if not conn.closed:
+                        if not conn.autocommit:
+                            conn.rollback()
+                        conn.autocommit = True
+                        self._release_lock(cursor)
+            finally:
+                cursor.close()
+                conn.autocommit = False
+        return applied_now
+
+    def _check_online(self, cursor, migration: Migration):
+        """앱 시작 중에 적용해도 되는지 확인 (오프라인 마이그레이션 대상 테이블에 행이 있으면 오류)"""
+        for table_name in migration.offline_tables:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS present", (table_name,))
+            if not cursor.fetchone()['present']:
+                continue
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table_name}) AS has_rows")
+            if cursor.fetchone()['has_rows']:
+                raise RuntimeError(
+                    f"마이그레이션 {migration.version:04d}_{migration.name}은 {table_name} 전체를 잠그고 "
+                    f"다시 씁니다. 점검 시간에 'python db_tools.py migrate'로 적용하세요."
+                )
+
+    def _apply(self, conn, cursor, migration: Migration):
+        """단일 마이그레이션 적용"""
+        logger.info(f"🔧 마이그레이션 적용: {migration.version:04d}_{migration.name}")
+        started = time.perf_counter()
+        try:
+            conn.autocommit = not migration.transactional
+            migration.apply(cursor)
+            # 트랜잭션 마이그레이션은 아직 트랜잭션이 열려 있으므로 이력 기록과 함께 커밋
+            if conn.autocommit:
+                conn.autocommit = False
+            cursor.execute(
+                f"INSERT INTO {MIGRATIONS_TABLE} (version, name, duration_ms) VALUES (%s, %s, %s)",
+                (migration.version, migration.name, int((time.perf_counter() - started) * 1000))
+            )
+            conn.commit()
+        except Exception as e:
+            if not conn.autocommit:
+                conn.rollback()
+            conn.autocommit = False
+            logger.error(f"❌ 마이그레이션 실패: {migration.version:04d}_{migration.name}: {e}")
+            raise
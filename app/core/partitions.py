@@ -0,0 +1,251 @@
+"""
+학습 기록 테이블 월 단위 파티션 관리 (사전 생성, 보존 기간, 아카이브)
+"""
+
+import gzip
+import logging
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from .content_store import blob_select
+
+logger = logging.getLogger(__name__)
+
+# created_at 기준 월 단위 RANGE 파티션 대상 테이블
+PARTITIONED_TABLES = (
+    'claude_integration_learning_activities',
+    'claude_integration_chat_messages',
+)
+
+
+def month_start(value: date) -> date:
+    """해당 월의 첫날"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """월 단위 이동 (항상 월 첫날 반환)"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    """월별 파티션 이름 (예: claude_integration_chat_messages_p202501)"""
+    return f"{table_name}_p{month.year:04d}{month.month:02d}"
+
+
+def default_partition_name(table_name: str) -> str:
+    """월 파티션 범위 밖의 행을 받는 DEFAULT 파티션 이름"""
+    return f"{table_name}_default"
+
+
+def is_partitioned(cursor, table_name: str) -> bool:
+    """테이블이 파티션 테이블인지 확인"""
+    cursor.execute("""
+        SELECT 1 AS partitioned
+        FROM pg_partitioned_table p
+        JOIN pg_class c ON c.oid = p.partrelid
+        WHERE c.relname = %s
+    """, (table_name,))
+    return cursor.fetchone() is not None
+
+
+def create_month_partitions(cursor, table_name: str, first_month: date, last_month: date,
+                            parent: str = None) -> List[str]:
+    """first_month ~ last_month 월별 파티션 생성 (이미 있으면 건너뜀)
+
+    parent를 지정하면 table_name 기준 이름의 파티션을 parent 테이블에 붙입니다
+    (테이블 전환 중 임시 이름의 부모에 최종 이름으로 생성할 때 사용).
+    """
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if create_month_partition(cursor, table_name, month, parent=parent):
+            created.append(partition_name(table_name, month))
+        month = add_months(month, 1)
+    return created
+
+
+def create_month_partition(cursor, table_name: str, month: date, parent: str = None) -> bool:
+    """월 파티션 하나 생성, 새로 만들었으면 True
+
+    DEFAULT 파티션에 이미 그 달의 행이 있으면 그냥 만들 수 없으므로
+    (기본 파티션 제약 위반) 행을 새 파티션으로 옮기면서 만듭니다.
+    """
+    name = partition_name(table_name, month)
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS present", (name,))
+    if cursor.fetchone()['present']:
+        return False
+    if parent is None and month in default_partition_months(cursor, table_name):
+        move_default_rows(cursor, table_name, month)
+        return True
+    cursor.execute(
+        f"CREATE TABLE {name} PARTITION OF {parent or table_name} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        (month, add_months(month, 1))
+    )
+    return True
+
+
+def default_partition_months(cursor, table_name: str) -> List[date]:
+    """DEFAULT 파티션에 행이 남아 있는 월 목록 (보통 비어 있음)"""
+    default = default_partition_name(table_name)
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS present", (default,))
+    if not cursor.fetchone()['present']:
+        return []
+    cursor.execute(
+        f"SELECT DISTINCT date_trunc('month', created_at)::date AS month FROM {default} ORDER BY month"
+    )
+    return [row['month'] for row in cursor.fetchall()]
+
+
+def insertable_columns(cursor, table_name: str) -> List[str]:
+    """직접 값을 넣을 수 있는 컬럼 목록 (생성 컬럼 제외)"""
+    cursor.execute("""
+        SELECT attname
+        FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = ''
+        ORDER BY attnum
+    """, (table_name,))
+    return [row['attname'] for row in cursor.fetchall()]
+
+
+def move_default_rows(cursor, table_name: str, month: date):
+    """DEFAULT 파티션의 month 행을 새 월 파티션으로 옮김 (호출한 트랜잭션 안에서)
+
+    DEFAULT 분리 → 월 파티션 생성 → 행 이동 → DEFAULT 재연결 순서로 처리합니다.
+    이미 반영된 행을 옮기는 것이므로 사용자 트리거(카운터, 일별 집계, 블롭 참조 수)를
+    끈 상태로 옮깁니다.
+    """
+    name = partition_name(table_name, month)
+    default = default_partition_name(table_name)
+    columns = ', '.join(insertable_columns(cursor, table_name))
+    cursor.execute(f"ALTER TABLE {table_name} DETACH PARTITION {default}")
+    cursor.execute(
+        f"CREATE TABLE {name} PARTITION OF {table_name} FOR VALUES FROM (%s) TO (%s)",
+        (month, add_months(month, 1))
+    )
+    cursor.execute(f"ALTER TABLE {name} DISABLE TRIGGER USER")
+    cursor.execute(f"ALTER TABLE {default} DISABLE TRIGGER USER")
+    cursor.execute(f"""
+        WITH moved AS (
+            DELETE FROM {default}
+            WHERE created_at >= %s AND created_at < %s
+            RETURNING {columns}
+        )
+        INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+    """, (month, add_months(month, 1)))
+    moved = cursor.rowcount
+    cursor.execute(f"ALTER TABLE {default} ENABLE TRIGGER USER")
+    cursor.execute(f"ALTER TABLE {name} ENABLE TRIGGER USER")
+    cursor.execute(f"ALTER TABLE {table_name} ATTACH PARTITION {default} DEFAULT")
+    logger.warning(f"📦 DEFAULT 파티션의 {month:%Y-%m} 행 {moved}건을 {name}으로 옮겼습니다")
+
+
+def archive_query(cursor, table_name: str, name: str) -> str:
+    """아카이브용 파티션 조회 쿼리 (블롭에 저장한 본문은 내용으로 채움, 생성 컬럼 제외)"""
+    columns = tuple(insertable_columns(cursor, name))
+    expressions, joins = blob_select(table_name, columns)
+    return f"SELECT {expressions} FROM {name} t {joins} ORDER BY t.created_at, t.id"
+
+
+def list_month_partitions(cursor, table_name: str) -> List[Tuple[str, date]]:
+    """월별 파티션 목록 (이름, 시작 월) - DEFAULT 파티션 제외"""
+    cursor.execute("""
+        SELECT c.relname AS name
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = %s
+        ORDER BY c.relname
+    """, (table_name,))
+    partitions = []
+    prefix = f"{table_name}_p"
+    for row in cursor.fetchall():
+        suffix = row['name'][len(prefix):]
+        if row['name'].startswith(prefix) and len(suffix) == 6 and suffix.isdigit():
+            partitions.append((row['name'], date(int(suffix[:4]), int(suffix[4:]), 1)))
+    return partitions
+
+
+class PartitionManager:
+    """파티션 사전 생성 및 보존 기간이 지난 파티션 아카이브"""
+
+    def __init__(self, db, tables: Tuple[str, ...] = PARTITIONED_TABLES):
+        self.db = db
+        self.tables = tables
+
+    def ensure_future_partitions(self, months_ahead: int = 3,
+                                 lock_timeout_ms: Optional[int] = None) -> List[str]:
+        """이번 달부터 months_ahead개월 뒤까지 파티션을 미리 생성
+
+        DEFAULT 파티션에 들어간 행이 있으면 그 달의 파티션도 만들어 옮깁니다
+        (파티션이 없던 동안 저장된 행, 범위 밖 날짜로 가져온 행).
+        필요한 파티션이 모두 있고 DEFAULT 파티션이 비어 있으면 확인 쿼리만 실행합니다.
+        lock_timeout_ms를 지정하면 테이블 잠금을 그 시간까지만 기다립니다 (요청 경로에서 호출 시).
+        """
+        this_month = month_start(datetime.utcnow().date())
+        months = [add_months(this_month, offset) for offset in range(months_ahead + 1)]
+        expected = [partition_name(table_name, month) for table_name in self.tables for month in months]
+        created = []
+        with self.db.get_cursor() as cursor:
+            if lock_timeout_ms:
+                cursor.execute("SELECT set_config('lock_timeout', %s, true)", (f"{int(lock_timeout_ms)}ms",))
+            cursor.execute(
+                "SELECT bool_and(to_regclass(name) IS NOT NULL) AS present FROM unnest(%s::TEXT[]) AS name",
+                (expected,)
+            )
+            present = cursor.fetchone()['present']
+            if present and not any(default_partition_months(cursor, table_name) for table_name in self.tables):
+                return created
+            for table_name in self.tables:
+                if not is_partitioned(cursor, table_name):
+                    continue
+                for month in sorted(set(months) | set(default_partition_months(cursor, table_name))):
+                    if create_month_partition(cursor, table_name, month):
+                        created.append(partition_name(table_name, month))
+        if created:
+            logger.info(f"✅ 파티션 생성: {created}")
+        return created
+
+    def archive_expired(self, retention_months: int, archive_dir: str) -> List[Dict[str, str]]:
+        """보존 기간이 지난 월 파티션을 분리하고 gzip CSV로 보관한 뒤 삭제
+
+        파티션별로 한 트랜잭션에서 DETACH → COPY → DROP을 수행하므로
+        아카이브 파일 기록에 실패하면 파티션은 그대로 남습니다.
+        블롭으로 옮긴 본문은 블롭 내용을 붙여 기록하므로 파티션 삭제 후 블롭이 정리되어도
+        아카이브만으로 기록을 복원할 수 있습니다.
+        """
+        if retention_months <= 0:
+            return []
+
+        cutoff = add_months(month_start(datetime.utcnow().date()), -retention_months)
+        os.makedirs(archive_dir, exist_ok=True)
+
+        with self.db.get_cursor() as cursor:
+            expired = [
+                (table_name, name)
+                for table_name in self.tables
+                if is_partitioned(cursor, table_name)
+                for name, month in list_month_partitions(cursor, table_name)
+                if month < cutoff
+            ]
+
+        archived = []
+        for table_name, name in expired:
+            path = os.path.join(archive_dir, f"{name}.csv.gz")
+            with self.db.get_cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {table_name} DETACH PARTITION {name}")
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as archive:
+                    cursor.copy_expert(
+                        f"COPY ({archive_query(cursor, table_name, name)}) "
+                        f"TO STDOUT WITH (FORMAT csv, HEADER true)",
+                        archive
+                    )
+                os.replace(tmp_path, path)
+                cursor.execute(f"DROP TABLE {name}")
+            logger.info(f"📦 파티션 아카이브 완료: {name} -> {path}")
+            archived.append({'table': table_name, 'partition': name, 'path': path})
+        return archived
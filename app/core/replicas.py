@@ -0,0 +1,194 @@
+"""
+읽기 전용 복제본(read replica) 연결 관리 및 라우팅
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# 복제 지연(초): 수신한 WAL을 모두 재생했으면 0 (프라이머리가 유휴 상태일 때 지연이 커 보이는 것 방지)
+REPLICATION_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END AS lag_seconds
+"""
+
+
+class Replica:
+    """복제본 하나의 연결 풀과 상태"""
+
+    def __init__(self, name: str, dsn: str, maxconn: int, connection_factory=None):
+        self.name = name
+        self.dsn = dsn
+        self.maxconn = maxconn
+        self.connection_factory = connection_factory
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self.last_error: Optional[str] = None
+        self._pool_lock = threading.Lock()
+
+    def ensure_pool(self):
+        """연결 풀 생성 (처음 사용할 때)"""
+        if self.pool is None:
+            with self._pool_lock:
+                if self.pool is None:
+                    # psycopg2 풀은 minconn개까지만 유휴 연결을 보관함 (0이면 반납 시마다 닫힘)
+                    self.pool = ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=self.maxconn,
+                        dsn=self.dsn,
+                        connection_factory=self.connection_factory
+                    )
+        return self.pool
+
+    def mark_down(self, error: Exception):
+        """오류 발생 시 다음 상태 확인 전까지 라우팅 대상에서 제외"""
+        self.healthy = False
+        self.last_error = str(error)
+        self.checked_at = time.monotonic()
+
+    def status(self) -> Dict[str, Any]:
+        """복제본 상태"""
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "in_use": len(self.pool._used) if self.pool else 0,
+            "idle": len(self.pool._pool) if self.pool else 0,
+            "last_error": self.last_error,
+        }
+
+    def reset_after_fork(self) -> Optional[ThreadedConnectionPool]:
+        """fork된 자식 프로세스에서 상속한 풀을 닫지 않고 떼어내 반환"""
+        inherited = self.pool
+        self.pool = None
+        self._pool_lock = threading.Lock()
+        self.healthy = False
+        self.checked_at = 0.0
+        return inherited
+
+    def close(self):
+        """연결 풀 종료"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+
+
+class ReplicaRouter:
+    """읽기 요청을 복제본으로 분산 (복제 지연/장애 시 프라이머리로 대체)
+
+    - 상태 확인 결과는 check_interval 동안 재사용합니다.
+    - 복제 지연이 max_lag를 넘거나 연결에 실패한 복제본은 제외합니다.
+    - 쓰기 직후 read_your_writes 동안 해당 사용자의 읽기는 프라이머리로 보냅니다.
+    """
+
+    def __init__(self, dsns: List[str], max_lag: float = 5.0, check_interval: float = 10.0,
+                 read_your_writes: float = 5.0, maxconn: int = 10, connection_factory=None):
+        self.replicas = [
+            Replica(f"replica{index + 1}", dsn, maxconn, connection_factory)
+            for index, dsn in enumerate(dsns)
+        ]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_your_writes = read_your_writes
+        self._recent_writes: Dict[Any, float] = {}
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"replica_reads": 0, "primary_fallbacks": 0, "read_your_writes": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def note_write(self, key: Any):
+        """쓰기 시각 기록 (이후 읽기는 잠시 프라이머리에서)"""
+        if not self.enabled or key is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[key] = now
+            # 만료된 항목 정리
+            if len(self._recent_writes) > 10000:
+                cutoff = now - self.read_your_writes
+                self._recent_writes = {k: t for k, t in self._recent_writes.items() if t >= cutoff}
+
+    def choose(self, key: Any = None) -> Optional[Replica]:
+        """읽기에 사용할 복제본 (없으면 None → 프라이머리 사용)"""
+        if not self.enabled:
+            return None
+        if key is not None:
+            written_at = self._recent_writes.get(key)
+            if written_at is not None and time.monotonic() - written_at < self.read_your_writes:
+                self._stats["read_your_writes"] += 1
+                return None
+
+        candidates = [replica for replica in self.replicas if self._is_usable(replica)]
+        if not candidates:
+            self._stats["primary_fallbacks"] += 1
+            return None
+        self._stats["replica_reads"] += 1
+        return candidates[next(self._round_robin) % len(candidates)]
+
+    def record_failure(self, replica: Replica, error: Exception):
+        """복제본 오류 기록"""
+        logger.warning(f"⚠️ 복제본 {replica.name} 오류, 프라이머리로 대체: {error}")
+        replica.mark_down(error)
+        self._stats["primary_fallbacks"] += 1
+
+    def _is_usable(self, replica: Replica) -> bool:
+        """상태 확인 주기가 지났으면 다시 확인 후 사용 가능 여부 반환"""
+        if time.monotonic() - replica.checked_at >= self.check_interval:
+            self._check(replica)
+        return replica.healthy and (replica.lag_seconds or 0) <= self.max_lag
+
+    def _check(self, replica: Replica):
+        """복제 지연 측정"""
+        replica.checked_at = time.monotonic()
+        conn = None
+        try:
+            pool = replica.ensure_pool()
+            conn = pool.getconn()
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(REPLICATION_LAG_SQL)
+                replica.lag_seconds = float(cursor.fetchone()['lag_seconds'])
+            conn.rollback()
+            replica.healthy = True
+            replica.last_error = None
+            if replica.lag_seconds > self.max_lag:
+                logger.warning(f"⚠️ 복제본 {replica.name} 지연 {replica.lag_seconds:.1f}s > {self.max_lag}s")
+        except Exception as e:
+            replica.mark_down(e)
+            if conn is not None and replica.pool:
+                replica.pool.putconn(conn, close=True)
+                conn = None
+            logger.warning(f"⚠️ 복제본 {replica.name} 상태 확인 실패: {e}")
+        finally:
+            if conn is not None:
+                replica.pool.putconn(conn)
+
+    def status(self) -> Dict[str, Any]:
+        """라우팅 통계와 복제본 상태"""
+        return {**self._stats, "replicas": [replica.status() for replica in self.replicas]}
+
+    def reset_after_fork(self) -> List[ThreadedConnectionPool]:
+        """fork된 자식 프로세스에서 상태 초기화, 상속한 풀 목록 반환"""
+        self._lock = threading.Lock()
+        self._recent_writes = {}
+        inherited = [replica.reset_after_fork() for replica in self.replicas]
+        return [pool for pool in inherited if pool is not None]
+
+    def close(self):
+        """모든 복제본 연결 종료"""
+        for replica in self.replicas:
+            replica.close()
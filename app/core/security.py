@@ -5,6 +5,7 @@
 import logging
 import hashlib
 import secrets
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import jwt
@@ -97,22 +98,26 @@ class RateLimiter:
         self.max_requests = max_requests
         self.window_seconds = window_seconds
         self.requests = {}  # 실제로는 Redis 사용 권장
+        # 여러 세션이 같은 인스턴스를 공유하므로 확인과 기록을 한 번에 처리
+        self._lock = threading.Lock()
     
     def is_allowed(self, user_id: str) -> bool:
         """사용자 요청이 허용되는지 확인"""
         now = datetime.utcnow()
-        user_requests = self.requests.get(user_id, [])
-        
-        # 윈도우 시간 이전의 요청 제거
-        user_requests = [req_time for req_time in user_requests 
-                        if (now - req_time).seconds < self.window_seconds]
-        
-        if len(user_requests) < self.max_requests:
-            user_requests.append(now)
+        with self._lock:
+            user_requests = self.requests.get(user_id, [])
+            
+            # 윈도우 시간 이전의 요청 제거
+            user_requests = [req_time for req_time in user_requests 
+                            if (now - req_time).seconds < self.window_seconds]
+            
+            if len(user_requests) < self.max_requests:
+                user_requests.append(now)
+                self.requests[user_id] = user_requests
+                return True
+            
             self.requests[user_id] = user_requests
-            return True
-        
-        return False
+            return False
     
     def get_remaining_requests(self, user_id: str) -> int:
         """남은 요청 수 반환"""
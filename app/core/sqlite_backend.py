@@ -0,0 +1,980 @@
+"""
+단일 서버 배포용 내장 SQLite 백엔드 (Database와 같은 API)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from .config import settings
+from .content_store import BLOBS_TABLE, BLOB_COLUMNS
+from .database import _PLACEHOLDER_RE, _inherited_pools
+from .db_metrics import DatabaseMetrics, to_prometheus
+from .deadlines import BATCH, INTERACTIVE
+from .migrations import LEARNING_COUNTER_SOURCES, USER_HISTORY_TABLES
+
+logger = logging.getLogger(__name__)
+
+# PRAGMA user_version으로 기록하는 스키마 버전
+SQLITE_SCHEMA_VERSION = 1
+
+# 연결마다 적용하는 PRAGMA (WAL: 읽기와 쓰기가 서로 막지 않음)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+)
+
+# 카운터 종류 -> 카운터 컬럼
+COUNTER_COLUMNS = {
+    'chat': 'total_chats',
+    'grammar_check': 'grammar_checks',
+    'vocabulary_check': 'vocabulary_checks',
+    'activity': 'total_activities',
+}
+
+# 전문 검색 (FTS5 외부 콘텐츠 테이블: 원본 테이블, 검색 컬럼)
+FTS_TABLES = {
+    'claude_integration_chat_fts': ('claude_integration_chat_messages', 'user_message'),
+    'claude_integration_grammar_fts': ('claude_integration_grammar_checks', 'original_text'),
+    f'{BLOBS_TABLE}_fts': (BLOBS_TABLE, 'content'),
+}
+
+
+def _counter_trigger(table_name: str, kind: str) -> str:
+    """학습 카운터 증가 트리거"""
+    column = COUNTER_COLUMNS[kind]
+    if kind != 'activity':
+        return f"""
+        CREATE TRIGGER IF NOT EXISTS {table_name}_counters
+        AFTER INSERT ON {table_name} WHEN NEW.user_id IS NOT NULL
+        BEGIN
+            INSERT INTO claude_integration_user_learning_counters (user_id, {column}, updated_at)
+            VALUES (NEW.user_id, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (user_id) DO UPDATE SET
+                {column} = {column} + 1,
+                updated_at = CURRENT_TIMESTAMP;
+        END
+        """
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS {table_name}_counters
+    AFTER INSERT ON {table_name} WHEN NEW.user_id IS NOT NULL
+    BEGIN
+        INSERT INTO claude_integration_user_learning_counters
+            (user_id, {column}, first_activity_at, last_activity_at, updated_at)
+        VALUES (NEW.user_id, 1, NEW.created_at, NEW.created_at, CURRENT_TIMESTAMP)
+        ON CONFLICT (user_id) DO UPDATE SET
+            {column} = {column} + 1,
+            first_activity_at = CASE
+                WHEN first_activity_at IS NULL OR excluded.first_activity_at < first_activity_at
+                THEN excluded.first_activity_at ELSE first_activity_at END,
+            last_activity_at = CASE
+                WHEN last_activity_at IS NULL OR excluded.last_activity_at > last_activity_at
+                THEN excluded.last_activity_at ELSE last_activity_at END,
+            updated_at = CURRENT_TIMESTAMP;
+    END
+    """
+
+
+def _blob_ref_triggers(table_name: str, hash_column: str) -> List[str]:
+    """본문 블롭 참조 수 트리거"""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table_name}_{hash_column}_ref
+        AFTER INSERT ON {table_name} WHEN NEW.{hash_column} IS NOT NULL
+        BEGIN
+            UPDATE {BLOBS_TABLE} SET ref_count = ref_count + 1 WHERE hash = NEW.{hash_column};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table_name}_{hash_column}_unref
+        AFTER DELETE ON {table_name} WHEN OLD.{hash_column} IS NOT NULL
+        BEGIN
+            UPDATE {BLOBS_TABLE} SET ref_count = ref_count - 1 WHERE hash = OLD.{hash_column};
+        END
+        """,
+    ]
+
+
+def _fts_statements(fts_table: str, source_table: str, column: str) -> List[str]:
+    """FTS5 색인 테이블과 동기화 트리거"""
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            {column}, content='{source_table}', content_rowid='rowid', tokenize='porter unicode61'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {source_table}
+        BEGIN
+            INSERT INTO {fts_table} (rowid, {column}) VALUES (NEW.rowid, NEW.{column});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {source_table}
+        BEGIN
+            INSERT INTO {fts_table} ({fts_table}, rowid, {column}) VALUES ('delete', OLD.rowid, OLD.{column});
+        END
+        """,
+    ]
+
+
+SQLITE_SCHEMA: List[str] = [
+    """
+    CREATE TABLE IF NOT EXISTS claude_integration_users (
+        id INTEGER PRIMARY KEY,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        full_name VARCHAR(100) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_active BOOLEAN DEFAULT TRUE,
+        last_login TIMESTAMP
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {BLOBS_TABLE} (
+        hash BLOB PRIMARY KEY,
+        content TEXT NOT NULL,
+        byte_size INTEGER NOT NULL,
+        ref_count INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS claude_integration_chat_messages (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+        user_message TEXT NOT NULL,
+        ai_response TEXT,
+        ai_response_hash BLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        message_type VARCHAR(20) DEFAULT 'chat'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS claude_integration_grammar_checks (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+        original_text TEXT NOT NULL,
+        corrected_text TEXT,
+        corrected_text_hash BLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS claude_integration_vocabulary_checks (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+        original_text TEXT NOT NULL,
+        analysis_result TEXT,
+        analysis_result_hash BLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS claude_integration_learning_activities (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+        activity_type VARCHAR(50) NOT NULL,
+        description TEXT NOT NULL,
+        metadata JSON,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS claude_integration_user_learning_counters (
+        user_id INTEGER PRIMARY KEY REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+        total_chats INTEGER NOT NULL DEFAULT 0,
+        grammar_checks INTEGER NOT NULL DEFAULT 0,
+        vocabulary_checks INTEGER NOT NULL DEFAULT 0,
+        total_activities INTEGER NOT NULL DEFAULT 0,
+        first_activity_at TIMESTAMP,
+        last_activity_at TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS claude_integration_daily_activity_rollup (
+        user_id INTEGER NOT NULL REFERENCES claude_integration_users(id) ON DELETE CASCADE,
+        day DATE NOT NULL,
+        activity_type VARCHAR(50) NOT NULL,
+        activity_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day, activity_type)
+    ) WITHOUT ROWID
+    """,
+    *[
+        f"CREATE INDEX IF NOT EXISTS {table_name}_user_created_idx "
+        f"ON {table_name} (user_id, created_at DESC, id DESC)"
+        for table_name in USER_HISTORY_TABLES
+    ],
+    *[
+        f"CREATE INDEX IF NOT EXISTS {table_name}_{hash_column}_idx ON {table_name} ({hash_column}, user_id)"
+        for table_name, columns in BLOB_COLUMNS.items()
+        for hash_column in columns.values()
+    ],
+    *[_counter_trigger(table_name, kind) for table_name, kind in LEARNING_COUNTER_SOURCES.items()],
+    """
+    CREATE TRIGGER IF NOT EXISTS claude_integration_learning_activities_rollup
+    AFTER INSERT ON claude_integration_learning_activities WHEN NEW.user_id IS NOT NULL
+    BEGIN
+        INSERT INTO claude_integration_daily_activity_rollup (user_id, day, activity_type, activity_count)
+        VALUES (NEW.user_id, date(COALESCE(NEW.created_at, CURRENT_TIMESTAMP)), NEW.activity_type, 1)
+        ON CONFLICT (user_id, day, activity_type) DO UPDATE SET
+            activity_count = activity_count + 1;
+    END
+    """,
+    *[
+        statement
+        for table_name, columns in BLOB_COLUMNS.items()
+        for hash_column in columns.values()
+        for statement in _blob_ref_triggers(table_name, hash_column)
+    ],
+    *[
+        statement
+        for fts_table, (source_table, column) in FTS_TABLES.items()
+        for statement in _fts_statements(fts_table, source_table, column)
+    ],
+]
+
+# 학습 카운터를 원본 테이블에서 다시 계산 (트리거 증분과 같은 컬럼 매핑)
+REBUILD_COUNTERS_SQL = f"""
+INSERT INTO claude_integration_user_learning_counters
+    (user_id, {', '.join(COUNTER_COLUMNS[kind] for kind in LEARNING_COUNTER_SOURCES.values())},
+     first_activity_at, last_activity_at, updated_at)
+SELECT
+    u.id,
+    {', '.join(
+        f"(SELECT COUNT(*) FROM {table_name} WHERE user_id = u.id)"
+        for table_name in LEARNING_COUNTER_SOURCES
+    )},
+    (SELECT MIN(created_at) FROM claude_integration_learning_activities WHERE user_id = u.id),
+    (SELECT MAX(created_at) FROM claude_integration_learning_activities WHERE user_id = u.id),
+    CURRENT_TIMESTAMP
+FROM claude_integration_users u
+WHERE (:user_id IS NULL OR u.id = :user_id)
+ON CONFLICT (user_id) DO UPDATE SET
+    {', '.join(f"{column} = excluded.{column}" for column in COUNTER_COLUMNS.values())},
+    first_activity_at = excluded.first_activity_at,
+    last_activity_at = excluded.last_activity_at,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+# 삭제된 기록의 집계가 남지 않도록 대상 사용자 행을 지우고 다시 계산
+DELETE_DAILY_ROLLUP_SQL = """
+DELETE FROM claude_integration_daily_activity_rollup
+WHERE (:user_id IS NULL OR user_id = :user_id)
+"""
+
+REBUILD_DAILY_ROLLUP_SQL = """
+INSERT INTO claude_integration_daily_activity_rollup (user_id, day, activity_type, activity_count)
+SELECT user_id, date(created_at), activity_type, COUNT(*)
+FROM claude_integration_learning_activities
+WHERE user_id IS NOT NULL AND created_at IS NOT NULL
+  AND (:user_id IS NULL OR user_id = :user_id)
+GROUP BY user_id, date(created_at), activity_type
+"""
+
+# 블롭 참조 수를 학습 테이블 기준으로 다시 계산 (해시 컬럼 인덱스로 블롭마다 조회)
+RECOUNT_BLOB_REFS_SQL = f"""
+UPDATE {BLOBS_TABLE} SET ref_count = r.refs
+FROM (
+    SELECT b.hash, {' + '.join(
+        f"(SELECT COUNT(*) FROM {table_name} WHERE {hash_column} = b.hash)"
+        for table_name, columns in BLOB_COLUMNS.items()
+        for hash_column in columns.values()
+    )} AS refs
+    FROM {BLOBS_TABLE} b
+) r
+WHERE {BLOBS_TABLE}.hash = r.hash AND {BLOBS_TABLE}.ref_count IS NOT r.refs
+"""
+
+COLLECT_BLOBS_SQL = f"""
+DELETE FROM {BLOBS_TABLE}
+WHERE ref_count <= 0 AND created_at < datetime('now', :grace)
+"""
+
+# 학습 활동 기록이 없는 사용자의 활동을 원본 테이블에서 생성 (백필)
+# INSERT 대상 테이블을 읽는 SELECT는 SQLite가 먼저 결과를 만들어 두므로 새로 넣은 행은 보지 않음
+BACKFILL_ACTIVITIES_SQL = """
+INSERT INTO claude_integration_learning_activities
+    (user_id, activity_type, description, metadata, created_at)
+SELECT src.user_id, src.activity_type, src.description, src.metadata, src.created_at
+FROM (
+    SELECT user_id, 'chat' AS activity_type,
+           'AI와의 영어 학습 대화: ' || substr(user_message, 1, 50) || '...' AS description,
+           json_object('source', 'chat_messages', 'backfilled', json('true')) AS metadata,
+           created_at
+    FROM claude_integration_chat_messages
+    UNION ALL
+    SELECT user_id, 'grammar_check',
+           '문법 검사 완료: ' || substr(original_text, 1, 50) || '...',
+           json_object('source', 'grammar_checks', 'backfilled', json('true')),
+           created_at
+    FROM claude_integration_grammar_checks
+    UNION ALL
+    SELECT user_id, 'vocabulary_check',
+           '어휘 분석 완료: ' || substr(original_text, 1, 50) || '...',
+           json_object('source', 'vocabulary_checks', 'backfilled', json('true')),
+           created_at
+    FROM claude_integration_vocabulary_checks
+) src
+WHERE (:user_id IS NULL OR src.user_id = :user_id)
+  AND NOT EXISTS (
+      SELECT 1 FROM claude_integration_learning_activities a
+      WHERE a.user_id = src.user_id
+  )
+"""
+
+
+def fts_query(text: str) -> str:
+    """검색어를 FTS5 MATCH 식으로 변환 (단어별 따옴표, 모든 단어 포함)"""
+    return " ".join('"' + token.replace('"', '""') + '"' for token in text.split())
+
+
+class SqliteQuery(NamedTuple):
+    """준비된 문장 이름별 SQLite 전용 쿼리 (PostgreSQL 전용 문법을 쓰는 쿼리만 등록)"""
+    sql: str
+    adapt: Optional[Callable[[Any], Any]] = None
+
+
+SQLITE_QUERIES: Dict[str, SqliteQuery] = {
+    'wq_recent_activities': SqliteQuery("""
+        WITH recorded AS (
+            SELECT id, activity_type, description, COALESCE(metadata, '{}') AS metadata, created_at
+            FROM claude_integration_learning_activities
+            WHERE user_id = :user_id
+            ORDER BY created_at DESC
+            LIMIT :limit
+        )
+        SELECT id, activity_type, description,
+               metadata AS "metadata [JSON]", created_at AS "created_at [TIMESTAMP]"
+        FROM recorded
+        UNION ALL
+        SELECT id, activity_type, description, metadata, created_at
+        FROM (
+            SELECT * FROM (
+                SELECT id, 'chat' AS activity_type,
+                       'AI와의 영어 학습 대화: ' || substr(user_message, 1, 50) || '...' AS description,
+                       json_object('source', 'chat_messages') AS metadata,
+                       created_at
+                FROM claude_integration_chat_messages
+                WHERE user_id = :user_id
+                ORDER BY created_at DESC
+                LIMIT :limit
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT id, 'grammar_check',
+                       '문법 검사 완료: ' || substr(original_text, 1, 50) || '...',
+                       json_object('source', 'grammar_checks'),
+                       created_at
+                FROM claude_integration_grammar_checks
+                WHERE user_id = :user_id
+                ORDER BY created_at DESC
+                LIMIT :limit
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT id, 'vocabulary_check',
+                       '어휘 분석 완료: ' || substr(original_text, 1, 50) || '...',
+                       json_object('source', 'vocabulary_checks'),
+                       created_at
+                FROM claude_integration_vocabulary_checks
+                WHERE user_id = :user_id
+                ORDER BY created_at DESC
+                LIMIT :limit
+            )
+        )
+        WHERE NOT EXISTS (SELECT 1 FROM recorded)
+        ORDER BY 5 DESC
+        LIMIT :limit
+    """),
+    'wq_activity_series': SqliteQuery("""
+        WITH RECURSIVE days(day) AS (
+            SELECT date(:start_date)
+            UNION ALL
+            SELECT date(day, '+1 day') FROM days WHERE day < date(:end_date)
+        )
+        SELECT days.day AS "activity_date [DATE]", COALESCE(SUM(r.activity_count), 0) AS activity_count
+        FROM days
+        LEFT JOIN claude_integration_daily_activity_rollup r
+            ON r.user_id = :user_id
+            AND r.day = days.day
+            AND (:activity_type IS NULL OR r.activity_type = :activity_type)
+        GROUP BY days.day
+        ORDER BY days.day
+    """),
+    # CROSS JOIN은 SQLite에서 조인 순서를 고정함 (FTS 일치 행을 먼저 찾고 사용자 기록과 조인,
+    # 사용자 기록마다 MATCH를 다시 실행하는 계획 방지)
+    'wq_search_history': SqliteQuery(f"""
+        WITH chat_hits AS (
+            SELECT c.id, -bm25(claude_integration_chat_fts) AS rank
+            FROM claude_integration_chat_fts
+            CROSS JOIN claude_integration_chat_messages c ON c.id = claude_integration_chat_fts.rowid
+            WHERE claude_integration_chat_fts MATCH :query AND c.user_id = :user_id
+            UNION ALL
+            SELECT c.id, -bm25({BLOBS_TABLE}_fts)
+            FROM {BLOBS_TABLE}_fts
+            CROSS JOIN {BLOBS_TABLE} b ON b.rowid = {BLOBS_TABLE}_fts.rowid
+            CROSS JOIN claude_integration_chat_messages c ON c.ai_response_hash = b.hash
+            WHERE {BLOBS_TABLE}_fts MATCH :query AND c.user_id = :user_id
+        ),
+        grammar_hits AS (
+            SELECT g.id, -bm25(claude_integration_grammar_fts) AS rank
+            FROM claude_integration_grammar_fts
+            CROSS JOIN claude_integration_grammar_checks g ON g.id = claude_integration_grammar_fts.rowid
+            WHERE claude_integration_grammar_fts MATCH :query AND g.user_id = :user_id
+            UNION ALL
+            SELECT g.id, -bm25({BLOBS_TABLE}_fts)
+            FROM {BLOBS_TABLE}_fts
+            CROSS JOIN {BLOBS_TABLE} b ON b.rowid = {BLOBS_TABLE}_fts.rowid
+            CROSS JOIN claude_integration_grammar_checks g ON g.corrected_text_hash = b.hash
+            WHERE {BLOBS_TABLE}_fts MATCH :query AND g.user_id = :user_id
+        ),
+        hits AS (
+            SELECT 'chat' AS record_type, c.id, c.created_at, c.user_message AS title,
+                   COALESCE(c.ai_response, b.content) AS body, b.rowid AS blob_rowid, h.rank
+            FROM (SELECT id, SUM(rank) AS rank FROM chat_hits GROUP BY id) h
+            JOIN claude_integration_chat_messages c ON c.id = h.id
+            LEFT JOIN {BLOBS_TABLE} b ON b.hash = c.ai_response_hash
+            UNION ALL
+            SELECT 'grammar_check', g.id, g.created_at, g.original_text,
+                   COALESCE(g.corrected_text, b.content), b.rowid, h.rank
+            FROM (SELECT id, SUM(rank) AS rank FROM grammar_hits GROUP BY id) h
+            JOIN claude_integration_grammar_checks g ON g.id = h.id
+            LEFT JOIN {BLOBS_TABLE} b ON b.hash = g.corrected_text_hash
+        ),
+        ranked AS (
+            SELECT * FROM hits
+            ORDER BY rank DESC, created_at DESC, id DESC
+            LIMIT :limit OFFSET :offset
+        )
+        -- 하이라이트는 본문이 일치한 경우 FTS5 snippet, 아니면 본문 앞부분
+        SELECT r.record_type, r.id, r.created_at AS "created_at [TIMESTAMP]", r.title, r.rank,
+               COALESCE(
+                   (SELECT snippet({BLOBS_TABLE}_fts, 0, '**', '**', '...', 30)
+                    FROM {BLOBS_TABLE}_fts
+                    WHERE {BLOBS_TABLE}_fts MATCH :query AND {BLOBS_TABLE}_fts.rowid = r.blob_rowid),
+                   substr(r.body, 1, 200)
+               ) AS snippet
+        FROM ranked r
+        ORDER BY r.rank DESC, r.created_at DESC, r.id DESC
+    """, adapt=lambda params: {**params, 'query': fts_query(params['query'])}),
+}
+
+
+def _to_sqlite_placeholders(query: str) -> str:
+    """psycopg2 플레이스홀더(%s, %(name)s)를 SQLite(?, :name)로 변환"""
+    def replace(match):
+        if match.group(0) == "%%":
+            return "%"
+        if match.group(1):
+            return f":{match.group(1)}"
+        return "?"
+    return _PLACEHOLDER_RE.sub(replace, query)
+
+
+def _register_types():
+    """날짜시간/JSON 변환기 등록 (선언 타입 TIMESTAMP/DATE/JSON, 컬럼 별칭 [타입])"""
+    sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+    sqlite3.register_adapter(date, lambda value: value.isoformat())
+    sqlite3.register_adapter(dict, lambda value: json.dumps(value, ensure_ascii=False))
+    sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+    sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()[:10]))
+    sqlite3.register_converter("JSON", lambda value: json.loads(value))
+
+
+_register_types()
+
+
+class SqliteTransaction:
+    """SQLite 연결에서 여러 문장을 실행하는 작업 단위 (Transaction과 같은 메서드)"""
+
+    def __init__(self, db: "SqliteDatabase", conn: sqlite3.Connection):
+        self.db = db
+        self.connection = conn
+        self.cursor = conn.cursor()
+        self.deadline: Optional[float] = None
+        self._savepoint_seq = 0
+
+    def execute(self, query: str, params=None, fetch: Optional[bool] = None,
+                row_type=None) -> List[Any]:
+        """문장 실행 및 결과 반환 (Transaction.execute와 같은 규칙)"""
+        return self._run(self.db.translate(query), params, fetch, query, row_type)
+
+    def execute_prepared(self, name: str, query: str, params=None,
+                         fetch: Optional[bool] = None, row_type=None) -> List[Any]:
+        """이름으로 등록된 SQLite 전용 쿼리가 있으면 그것으로 실행
+
+        SQLite는 연결별 문장 캐시로 컴파일 결과를 재사용하므로 PREPARE가 필요 없습니다.
+        """
+        override = SQLITE_QUERIES.get(name)
+        if override is None:
+            return self.execute(query, params, fetch=fetch, row_type=row_type)
+        if override.adapt is not None:
+            params = override.adapt(params)
+        return self._run(override.sql, params, fetch, query, row_type)
+
+    def _run(self, sql: str, args, fetch: Optional[bool], label: str, row_type=None) -> List[Any]:
+        """문장 실행, 결과 변환 및 계측"""
+        started = time.perf_counter()
+        rows = 0
+        error = False
+        try:
+            self.cursor.execute(sql, args if args is not None else ())
+            description = self.cursor.description
+            if fetch is None:
+                fetch = description is not None
+            if fetch:
+                result = self.cursor.fetchall() if description is not None else []
+                if row_type is not None:
+                    result = list(map(row_type._make, result))
+                else:
+                    names = [column[0] for column in description or ()]
+                    result = [dict(zip(names, row)) for row in result]
+                rows = len(result)
+            else:
+                rows = self.cursor.rowcount
+                result = [{"affected_rows": self.cursor.rowcount}]
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.db._observe_query(label, started, rows, error)
+
+    def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        """같은 문장을 여러 파라미터로 실행"""
+        started = time.perf_counter()
+        error = False
+        try:
+            self.cursor.executemany(self.db.translate(query), params_list)
+            return self.cursor.rowcount
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.db._observe_query(query, started, len(params_list), error)
+
+    def execute_values(self, query: str, rows: List[tuple]) -> int:
+        """다중 행 VALUES INSERT ("... VALUES %s") - 행별 executemany로 실행"""
+        if not rows:
+            return 0
+        head, tail = query.split("VALUES %s", 1)
+        placeholders = "(" + ", ".join(["?"] * len(rows[0])) + ")"
+        sql = f"{self.db.translate(head)}VALUES {placeholders}{self.db.translate(tail)}"
+        started = time.perf_counter()
+        error = False
+        try:
+            self.cursor.executemany(sql, rows)
+            return len(rows)
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.db._observe_query(query, started, 0 if error else len(rows), error)
+
+    def execute_pipelined(self, statements: List[tuple]) -> int:
+        """여러 문장 실행 (내장 DB이므로 왕복 비용이 없어 순서대로 실행)"""
+        for query, params in statements:
+            self._run(self.db.translate(query), params, False, query)
+        return len(statements)
+
+    @contextmanager
+    def savepoint(self, name: Optional[str] = None):
+        """세이브포인트 (블록 내 예외 시 해당 지점까지만 롤백하고 예외 전파)"""
+        self._savepoint_seq += 1
+        name = name or f"sp_{self._savepoint_seq}"
+        self.cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except Exception:
+            self.cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        else:
+            self.cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+    def close(self):
+        """커서 종료"""
+        self.cursor.close()
+
+
+class SqliteDatabase:
+    """내장 SQLite 데이터베이스 (Database와 같은 공개 API)
+
+    - 스레드마다 연결 하나를 열어 재사용합니다 (fork된 자식은 새로 엽니다).
+    - WAL 모드로 읽기와 쓰기가 서로 막지 않으며, 쓰기 트랜잭션은 BEGIN IMMEDIATE로
+      시작해 잠금 승격 교착을 피합니다.
+    - PostgreSQL 전용 문법을 쓰는 준비된 문장은 SQLITE_QUERIES의 쿼리로 대체합니다.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.SQLITE_PATH
+        self.metrics = DatabaseMetrics(
+            enabled=settings.DB_METRICS_ENABLED,
+            slow_query_ms=settings.DB_SLOW_QUERY_MS,
+            slow_log_size=settings.DB_SLOW_QUERY_LOG_SIZE,
+            explain_sample_rate=0.0
+        )
+        self.budgets = {
+            INTERACTIVE: settings.DB_INTERACTIVE_TIMEOUT_MS,
+            BATCH: settings.DB_BATCH_TIMEOUT_MS,
+        }
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._translated: Dict[str, str] = {}
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """새 연결 (PRAGMA 적용)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,  # BEGIN/COMMIT을 직접 관리
+            check_same_thread=False,
+            cached_statements=256,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+        )
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 (fork된 자식 프로세스면 부모 연결을 버리고 새로 엶)"""
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def reset_after_fork(self):
+        """fork된 자식 프로세스에서 부모의 연결 폐기
+
+        상속한 연결은 닫지 않고(닫으면 부모가 쓰는 WAL/잠금 상태에 영향) 참조만 보관합니다.
+        """
+        _inherited_pools.extend(self._connections)
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    def translate(self, query: str) -> str:
+        """psycopg2 플레이스홀더를 SQLite 형식으로 변환 (쿼리별 캐시)"""
+        translated = self._translated.get(query)
+        if translated is None:
+            translated = _to_sqlite_placeholders(query)
+            self._translated[query] = translated
+        return translated
+
+    @contextmanager
+    def get_connection(self, budget=BATCH):
+        """데이터베이스 연결 컨텍스트 매니저 (스레드별 연결)
+
+        시간 예산을 넘기면 진행 핸들러가 실행 중인 문장을 중단합니다 (None이면 제한 없음).
+        """
+        started = time.perf_counter()
+        conn = self._thread_connection()
+        self.metrics.record_checkout((time.perf_counter() - started) * 1000)
+        timeout_ms = self.timeout_ms(budget)
+        if not timeout_ms:
+            yield conn
+            return
+        deadline = time.monotonic() + timeout_ms / 1000
+        conn.set_progress_handler(lambda: time.monotonic() >= deadline, 1000)
+        try:
+            yield conn
+        finally:
+            conn.set_progress_handler(None, 0)
+
+    @contextmanager
+    def get_cursor(self, commit: bool = True, budget=BATCH):
+        """데이터베이스 커서 컨텍스트 매니저 (행은 이름으로 접근 가능)"""
+        with self.get_connection(budget) as conn:
+            cursor = self.new_cursor(conn)
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                conn.execute("COMMIT" if commit else "ROLLBACK")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                cursor.close()
+
+    def new_cursor(self, conn):
+        """이름으로 접근 가능한 행을 반환하는 커서 생성"""
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
+
+    def test_connection(self) -> bool:
+        """데이터베이스 연결 테스트"""
+        try:
+            with self.get_connection() as conn:
+                version = conn.execute("SELECT sqlite_version()").fetchone()[0]
+            logger.info(f"✅ SQLite 데이터베이스 연결 성공: {self.path} (SQLite {version})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ SQLite 데이터베이스 연결 테스트 실패: {e}")
+            return False
+
+    def timeout_ms(self, budget) -> int:
+        """시간 예산을 밀리초로 변환 (0이면 제한 없음)"""
+        if budget is None:
+            return 0
+        if isinstance(budget, (int, float)):
+            return max(int(budget), 0)
+        if budget not in self.budgets:
+            raise ValueError(f"알 수 없는 쿼리 시간 예산: {budget}")
+        return self.budgets[budget]
+
+    @contextmanager
+    def transaction(self, budget=INTERACTIVE, read_only: bool = False):
+        """작업 단위 트랜잭션 (정상 종료 시 커밋, 예외 시 롤백)
+
+        시간 예산을 넘기면 진행 핸들러가 실행 중인 문장을 중단합니다.
+        """
+        with self.get_connection(budget) as conn:
+            tx = SqliteTransaction(self, conn)
+            timeout_ms = self.timeout_ms(budget)
+            if timeout_ms:
+                tx.deadline = time.monotonic() + timeout_ms / 1000
+            conn.execute("BEGIN" if read_only else "BEGIN IMMEDIATE")
+            try:
+                yield tx
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                tx.close()
+
+    def note_write(self, user_id):
+        """쓰기 기록 (복제본이 없으므로 아무것도 하지 않음)"""
+
+    def execute_query(self, query: str, params=None, fetch: Optional[bool] = None,
+                      read_only: bool = False, user_id: Optional[int] = None, row_type=None,
+                      budget=INTERACTIVE) -> List[Any]:
+        """쿼리 실행 및 결과 반환 (Database.execute_query와 같은 규칙)"""
+        try:
+            with self.transaction(budget, read_only=read_only) as tx:
+                return tx.execute(query, params, fetch=fetch, row_type=row_type)
+        except Exception as e:
+            logger.error(f"쿼리 실행 오류: {e}")
+            raise
+
+    def execute_prepared(self, name: str, query: str, params=None, fetch: Optional[bool] = None,
+                         read_only: bool = False, user_id: Optional[int] = None, row_type=None,
+                         budget=INTERACTIVE) -> List[Any]:
+        """자주 쓰는 고정 쿼리 실행 (SQLite 전용 쿼리가 등록되어 있으면 그것을 사용)"""
+        try:
+            with self.transaction(budget, read_only=read_only) as tx:
+                return tx.execute_prepared(name, query, params, fetch=fetch, row_type=row_type)
+        except Exception as e:
+            logger.error(f"준비된 문장 실행 오류 ({name}): {e}")
+            raise
+
+    def stream_query(self, query: str, params=None, itersize: int = 2000,
+                     row_type=None, budget=BATCH) -> Iterator[Any]:
+        """결과를 itersize행씩 읽는 제너레이터 (전용 연결의 읽기 스냅샷에서 실행)"""
+        started = time.perf_counter()
+        rows = 0
+        error = False
+        conn = self._connect()
+        try:
+            cursor = conn.execute("BEGIN")
+            cursor = conn.execute(self.translate(query), params if params is not None else ())
+            names = [column[0] for column in cursor.description]
+            while True:
+                batch = cursor.fetchmany(itersize)
+                if not batch:
+                    break
+                for row in batch:
+                    rows += 1
+                    yield row_type._make(row) if row_type is not None else dict(zip(names, row))
+        except Exception:
+            error = True
+            raise
+        finally:
+            conn.close()
+            self.metrics.record_query(query, (time.perf_counter() - started) * 1000, rows, error)
+
+    def execute_many(self, query: str, params_list: List[tuple], budget=BATCH) -> int:
+        """여러 쿼리 실행"""
+        try:
+            with self.transaction(budget) as tx:
+                return tx.execute_many(query, params_list)
+        except Exception as e:
+            logger.error(f"여러 쿼리 실행 오류: {e}")
+            raise
+
+    def execute_values_batch(self, statements: List[tuple], budget=BATCH) -> int:
+        """여러 다중 행 INSERT를 한 트랜잭션에서 실행"""
+        try:
+            with self.transaction(budget) as tx:
+                return sum(tx.execute_values(query, rows) for query, rows in statements)
+        except Exception as e:
+            logger.error(f"일괄 INSERT 실행 오류: {e}")
+            raise
+
+    def _observe_query(self, query: str, started: float, rows: int, error: bool):
+        """쿼리 계측 기록"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self.metrics.record_query(query, elapsed_ms, max(rows, 0), error):
+            logger.warning(f"🐢 슬로우 쿼리 ({elapsed_ms:.1f}ms): {' '.join(query.split())[:200]}")
+
+    def get_pool_status(self) -> Dict[str, Any]:
+        """연결 사용 현황 (스레드별 연결 수)"""
+        return {"pooled": False, "in_use": 0, "idle": len(self._connections), "max": 0}
+
+    def get_metrics_snapshot(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """계측 스냅샷"""
+        snapshot = self.metrics.snapshot(self.get_pool_status(), top=top)
+        snapshot["backend"] = {"name": self.backend, "path": self.path}
+        return snapshot
+
+    def get_metrics_text(self) -> str:
+        """Prometheus 텍스트 포맷 계측값"""
+        return to_prometheus(self.get_metrics_snapshot())
+
+    def table_exists(self, table_name: str) -> bool:
+        """테이블 존재 여부"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+            ).fetchone()
+        return row is not None
+
+    def create_tables_if_not_exist(self, allow_offline: bool = False) -> List[int]:
+        """스키마 생성 (PRAGMA user_version이 최신이면 확인 쿼리 한 번으로 끝남)"""
+        if self._schema_ready:
+            return []
+        with self.get_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            applied = []
+            if version < SQLITE_SCHEMA_VERSION:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # 잠금을 잡은 뒤 다시 확인 (다른 프로세스가 먼저 생성했을 수 있음)
+                    if conn.execute("PRAGMA user_version").fetchone()[0] < SQLITE_SCHEMA_VERSION:
+                        for statement in SQLITE_SCHEMA:
+                            conn.execute(statement)
+                        conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+                        applied.append(SQLITE_SCHEMA_VERSION)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    logger.error("❌ SQLite 스키마 생성 실패")
+                    raise
+        if applied:
+            logger.info(f"✅ SQLite 스키마 생성 완료: {self.path}")
+        else:
+            logger.info(f"✅ SQLite 스키마가 최신 상태입니다 (버전 {SQLITE_SCHEMA_VERSION})")
+        self._schema_ready = True
+        return applied
+
+    def ensure_partitions(self, lock_timeout_ms: Optional[int] = None) -> List[str]:
+        """SQLite는 파티션이 없으므로 생성할 것이 없음"""
+        return []
+
+    def ensure_partitions_if_due(self):
+        """SQLite는 파티션이 없으므로 점검할 것이 없음"""
+
+    def rebuild_user_learning_counters(self, user_id: Optional[int] = None) -> int:
+        """학습 카운터를 원본 테이블에서 다시 계산 (백필/재구축)
+
+        BEGIN IMMEDIATE로 쓰기 잠금을 잡으므로 재계산 중 트리거 증분이 끼어들지 않습니다.
+        """
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(REBUILD_COUNTERS_SQL, {'user_id': user_id})
+                rebuilt = cursor.rowcount
+            logger.info(f"✅ 학습 카운터 재구축 완료: {rebuilt}명")
+            return rebuilt
+        except Exception as e:
+            logger.error(f"❌ 학습 카운터 재구축 실패: {e}")
+            raise
+
+    def rebuild_daily_activity_rollup(self, user_id: Optional[int] = None) -> int:
+        """일별 활동 집계를 학습 활동 기록에서 다시 계산"""
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(DELETE_DAILY_ROLLUP_SQL, {'user_id': user_id})
+                cursor.execute(REBUILD_DAILY_ROLLUP_SQL, {'user_id': user_id})
+                rebuilt = cursor.rowcount
+            logger.info(f"✅ 일별 활동 집계 재구축 완료: {rebuilt}행")
+            return rebuilt
+        except Exception as e:
+            logger.error(f"❌ 일별 활동 집계 재구축 실패: {e}")
+            raise
+
+    def collect_content_blobs(self, grace_minutes: int = 60) -> Dict[str, int]:
+        """참조 수를 재계산하고 참조되지 않는 본문 블롭 삭제
+
+        grace_minutes보다 최근에 만들어진 블롭은 남겨 둡니다.
+        """
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(RECOUNT_BLOB_REFS_SQL)
+                recounted = cursor.rowcount
+                cursor.execute(COLLECT_BLOBS_SQL, {'grace': f"-{int(grace_minutes)} minutes"})
+                deleted = cursor.rowcount
+            logger.info(f"✅ 본문 블롭 정리 완료: 참조 수 보정 {recounted}건, 삭제 {deleted}건")
+            return {'recounted': recounted, 'deleted': deleted}
+        except Exception as e:
+            logger.error(f"❌ 본문 블롭 정리 실패: {e}")
+            raise
+
+    def backfill_learning_activities(self, user_id: Optional[int] = None) -> int:
+        """학습 활동 기록이 없는 사용자의 활동을 채팅/문법/어휘 기록에서 생성"""
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(BACKFILL_ACTIVITIES_SQL, {'user_id': user_id})
+                backfilled = cursor.rowcount
+            logger.info(f"✅ 학습 활동 백필 완료: {backfilled}건")
+            return backfilled
+        except Exception as e:
+            logger.error(f"❌ 학습 활동 백필 실패: {e}")
+            raise
+
+    def get_migration_status(self) -> List[Dict[str, Any]]:
+        """스키마 적용 현황"""
+        with self.get_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        return [{
+            'version': SQLITE_SCHEMA_VERSION,
+            'name': 'sqlite_schema',
+            'applied': version >= SQLITE_SCHEMA_VERSION,
+            'applied_at': None,
+        }]
+
+    def close(self):
+        """현재 프로세스에서 연 연결 종료"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+        logger.info("✅ SQLite 연결 종료")
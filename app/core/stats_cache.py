@@ -0,0 +1,227 @@
+"""
+사용자별 학습 통계 캐시 (저장 시 무효화)
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import settings
+from .write_behind import _decode_value, _encode_value
+
+# Redis 백엔드용 패키지 (선택)
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCache:
+    """사용자별 조회 결과 캐시 공통 동작
+
+    - 항목은 (사용자, 조회 키) 단위로 저장하고 TTL이 지나면 만료됩니다.
+    - 사용자마다 세대 번호를 두고 invalidate()가 세대를 올립니다. 조회 전에 읽은 세대로만
+      저장하므로, 저장과 동시에 진행 중이던 조회가 이전 값을 다시 넣어도 사용되지 않습니다.
+    - 반환값은 여러 요청이 공유할 수 있으므로 수정하지 않아야 합니다.
+    """
+
+    backend = "none"
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+
+    def get_or_load(self, user_id: int, key: str, loader: Callable[[], Any],
+                    restore: Optional[Callable[[Any], Any]] = None) -> Any:
+        """캐시된 값 반환, 없으면 loader 결과를 저장 후 반환
+
+        restore는 직렬화 백엔드에서 읽은 값을 원래 타입(레코드 등)으로 되돌리는 함수입니다.
+        """
+        try:
+            generation, value, found = self._read(user_id, key, restore)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"통계 캐시 조회 실패 (DB에서 직접 조회): {e}")
+            return loader()
+        if found:
+            self._stats["hits"] += 1
+            return value
+
+        self._stats["misses"] += 1
+        value = loader()
+        try:
+            self._write(user_id, key, generation, value)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"통계 캐시 저장 실패: {e}")
+        return value
+
+    def invalidate(self, user_id: int):
+        """사용자의 캐시 항목 전체 무효화"""
+        try:
+            self._bump(user_id)
+            self._stats["invalidations"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"통계 캐시 무효화 실패: user_id={user_id}, {e}")
+
+    def invalidate_units(self, units):
+        """write-behind로 저장된 작업 단위의 사용자 캐시 무효화"""
+        user_ids = set()
+        for unit in units:
+            for _, columns, values in unit:
+                if 'user_id' in columns:
+                    user_ids.add(values[columns.index('user_id')])
+        for user_id in user_ids:
+            self.invalidate(user_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "backend": self.backend,
+            **self._stats,
+            "hit_ratio": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+    def _read(self, user_id: int, key: str, restore) -> Tuple[Any, Any, bool]:
+        """(현재 세대, 값, 적중 여부)"""
+        return None, None, False
+
+    def _write(self, user_id: int, key: str, generation: Any, value: Any):
+        """조회 전에 읽은 세대로 값 저장"""
+
+    def _bump(self, user_id: int):
+        """사용자 세대 증가"""
+
+
+class InProcessStatsCache(StatsCache):
+    """프로세스 내 캐시 (사용자 수 상한을 넘으면 가장 오래 쓰지 않은 사용자부터 제거)"""
+
+    backend = "memory"
+
+    def __init__(self, ttl: float = 300.0, max_users: int = 10000):
+        super().__init__(ttl)
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        # user_id -> {"gen": 세대, "items": {key: (만료 시각, 세대, 값)}}
+        self._users: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+    def _entry(self, user_id: int) -> Dict[str, Any]:
+        """사용자 항목 (_lock 보유 상태에서 호출)"""
+        entry = self._users.get(user_id)
+        if entry is None:
+            entry = {"gen": 0, "items": {}}
+            self._users[user_id] = entry
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return entry
+
+    def _read(self, user_id: int, key: str, restore) -> Tuple[Any, Any, bool]:
+        with self._lock:
+            entry = self._entry(user_id)
+            item = entry["items"].get(key)
+            if item is not None and item[0] > time.monotonic() and item[1] == entry["gen"]:
+                return entry["gen"], item[2], True
+            return entry["gen"], None, False
+
+    def _write(self, user_id: int, key: str, generation: Any, value: Any):
+        with self._lock:
+            entry = self._entry(user_id)
+            if entry["gen"] == generation:
+                entry["items"][key] = (time.monotonic() + self.ttl, generation, value)
+
+    def _bump(self, user_id: int):
+        with self._lock:
+            entry = self._entry(user_id)
+            entry["gen"] += 1
+            entry["items"].clear()
+
+
+class RedisStatsCache(StatsCache):
+    """Redis 캐시 (여러 프로세스/서버가 공유, 저장한 서버와 다른 서버의 캐시도 무효화)
+
+    사용자마다 해시 하나(wq:stats:<user_id>)에 세대 필드와 조회 키별 값을 두어
+    조회/저장/무효화가 각각 왕복 한 번입니다. 값은 JSON으로 직렬화합니다.
+    """
+
+    backend = "redis"
+    GENERATION_FIELD = "_gen"
+
+    def __init__(self, url: str, ttl: float = 300.0, prefix: str = "wq:stats:"):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis 패키지가 설치되지 않았습니다. 'pip install redis'로 설치하세요.")
+        super().__init__(ttl)
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}{user_id}"
+
+    def _read(self, user_id: int, key: str, restore) -> Tuple[Any, Any, bool]:
+        generation, raw = self.client.hmget(self._key(user_id), self.GENERATION_FIELD, key)
+        generation = int(generation or 0)
+        if raw is None:
+            return generation, None, False
+        stored = json.loads(raw, object_hook=_decode_value)
+        if stored["g"] != generation:
+            return generation, None, False
+        value = stored["v"]
+        return generation, restore(value) if restore else value, True
+
+    def _write(self, user_id: int, key: str, generation: Any, value: Any):
+        raw = json.dumps({"g": generation, "v": value}, default=_encode_value, ensure_ascii=False)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(self._key(user_id), key, raw)
+        pipe.expire(self._key(user_id), max(int(self.ttl), 1))
+        pipe.execute()
+
+    def _bump(self, user_id: int):
+        # 이전 세대 값은 세대가 달라 사용되지 않고 다음 저장 때 덮어씀
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hincrby(self._key(user_id), self.GENERATION_FIELD, 1)
+        pipe.expire(self._key(user_id), max(int(self.ttl), 1) * 2)
+        pipe.execute()
+
+
+_stats_cache: Optional[StatsCache] = None
+_stats_cache_lock = threading.Lock()
+
+
+def get_stats_cache() -> StatsCache:
+    """통계 캐시 인스턴스 반환 (STATS_CACHE_BACKEND: memory | redis | none)"""
+    global _stats_cache
+    if _stats_cache is None:
+        with _stats_cache_lock:
+            if _stats_cache is None:
+                _stats_cache = _create_stats_cache()
+    return _stats_cache
+
+
+def _create_stats_cache() -> StatsCache:
+    """설정에 따라 캐시 백엔드 생성 (Redis를 쓸 수 없으면 프로세스 내 캐시 사용)"""
+    backend = settings.STATS_CACHE_BACKEND
+    ttl = settings.STATS_CACHE_TTL_SECONDS
+    if backend == "none":
+        return StatsCache(ttl)
+    if backend == "redis":
+        if settings.REDIS_URL:
+            try:
+                cache = RedisStatsCache(settings.REDIS_URL, ttl)
+                cache.client.ping()
+                logger.info("✅ 통계 캐시: Redis")
+                return cache
+            except Exception as e:
+                logger.warning(f"⚠️ Redis 통계 캐시를 사용할 수 없어 프로세스 내 캐시를 사용합니다: {e}")
+        else:
+            logger.warning("⚠️ REDIS_URL이 설정되지 않아 프로세스 내 통계 캐시를 사용합니다")
+    return InProcessStatsCache(ttl, max_users=settings.STATS_CACHE_MAX_USERS)
@@ -0,0 +1,477 @@
+"""
+학습 기록 write-behind 버퍼 (비동기 일괄 저장)
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2
+import psycopg2.pool
+
+from .config import settings
+from .content_store import insert_suffix
+from .database import get_db
+
+# 저널 파일 잠금 (Unix 전용, 없으면 다른 프로세스의 저널은 재처리하지 않음)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# (테이블명, 컬럼 목록, 값 목록)
+Record = Tuple[str, Tuple[str, ...], Tuple[Any, ...]]
+
+
+def _encode_value(value: Any) -> Any:
+    """저널 기록용 값 인코딩"""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$b": bytes(value).hex()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """저널 값 디코딩"""
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    if isinstance(value, dict) and "$b" in value:
+        return bytes.fromhex(value["$b"])
+    return value
+
+
+def _encode_unit(unit: List[Record]) -> str:
+    """작업 단위를 저널/dead-letter 한 줄로 직렬화"""
+    return json.dumps([
+        [table, list(columns), [_encode_value(v) for v in values]]
+        for table, columns, values in unit
+    ], ensure_ascii=False)
+
+
+def _decode_unit(line: str) -> List[Record]:
+    """저널 한 줄을 작업 단위로 복원"""
+    return [
+        (table, tuple(columns), tuple(_decode_value(v) for v in values))
+        for table, columns, values in json.loads(line)
+    ]
+
+
+def _is_transient(error: Exception) -> bool:
+    """재시도하면 성공할 수 있는 오류인지 여부 (연결 끊김, 연결 풀 고갈, SQLite 잠금 등)
+
+    시간 예산 초과와 데이터 오류(제약 조건 위반, 저장할 수 없는 값)는 같은 배치를
+    다시 보내도 실패하므로 배치를 나눠 원인 작업 단위를 찾습니다.
+    """
+    if isinstance(error, psycopg2.extensions.QueryCanceledError):
+        return False
+    return isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError,
+                              psycopg2.pool.PoolError, sqlite3.OperationalError))
+
+
+def _lock_file(handle, blocking: bool) -> bool:
+    """열린 저널 파일에 배타 잠금 (잠금은 파일을 연 프로세스가 종료되면 풀림)"""
+    if fcntl is None:
+        return blocking
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _same_file(handle, path: str) -> bool:
+    """잠근 파일이 아직 경로에 남아 있는지 (다른 프로세스가 재처리 후 삭제하지 않았는지)"""
+    try:
+        return os.path.samestat(os.fstat(handle.fileno()), os.stat(path))
+    except FileNotFoundError:
+        return False
+
+
+class WriteBehindBuffer:
+    """학습 기록을 큐에 쌓아 두었다가 크기/시간 기준으로 일괄 INSERT
+
+    하나의 작업 단위(예: 채팅 메시지 + 학습 활동)는 같은 플러시 트랜잭션에
+    함께 기록됩니다. 큐가 가득 차면 overflow 정책에 따라 호출 스레드에서
+    직접 저장(sync)하거나 공간이 날 때까지 대기(block)합니다.
+
+    journal_path를 지정하면 enqueue가 반환되기 전에 작업 단위를 로컬 저널에
+    기록하고 재시작 시 미처리분을 다시 저장합니다 (최소 1회 저장 보장).
+    저널 파일은 프로세스마다 따로 두고(<journal_path>.<pid>) 사용하는 동안 잠가 두며,
+    시작할 때 잠글 수 있는 저널(종료된 프로세스의 저널)만 넘겨받아 다시 저장합니다.
+
+    배치 저장이 데이터 오류로 실패하면 배치를 반씩 나눠 다시 저장하고, 혼자서도
+    실패하는 작업 단위는 dead-letter 파일(지정하지 않으면 로그)에 기록하고 건너뜁니다.
+    연결 오류처럼 일시적인 실패는 재시도 대기열(최대 max_pending건)에 두고 다시 시도하며,
+    대기열이 가득 차면 새 작업을 꺼내지 않아 큐가 차면 overflow 정책이 적용됩니다.
+    """
+
+    def __init__(self, db=None, batch_size: int = 200, flush_interval: float = 0.5,
+                 max_queue: int = 10000, overflow: str = "sync",
+                 journal_path: Optional[str] = None, journal_fsync: bool = False,
+                 dead_letter_path: Optional[str] = None, max_pending: Optional[int] = None):
+        if overflow not in ("sync", "block"):
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow}")
+        self.db = db or get_db()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.journal_path = journal_path
+        self.journal_fsync = journal_fsync
+        self.dead_letter_path = dead_letter_path
+        self.max_pending = max_pending or max(max_queue, batch_size)
+        self._queue: "queue.Queue[List[Record]]" = queue.Queue(maxsize=max_queue)
+        self._journal_lock = threading.Lock()
+        self._journal = None
+        self._stop = threading.Event()
+        self._flushed = threading.Condition()
+        self._pending: List[List[Record]] = []
+        self._write_listeners: List[Callable[[List[List[Record]]], None]] = []
+        self._stats = {"enqueued": 0, "flushed": 0, "batches": 0, "sync_writes": 0,
+                       "failures": 0, "dead_lettered": 0, "replayed": 0}
+
+        if self.journal_path:
+            self._open_journal()
+
+        self._worker = threading.Thread(target=self._run, name="write-behind-flusher", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def enqueue(self, unit: Sequence[Record]) -> bool:
+        """작업 단위 추가 (큐가 가득 차면 overflow 정책 적용)"""
+        unit = list(unit)
+        if self._stop.is_set():
+            self._write_units([unit])
+            return True
+
+        while True:
+            # 큐 추가와 저널 기록을 한 잠금 안에서 처리해 저널 비우기와 엇갈리지 않게 함
+            with self._journal_lock:
+                try:
+                    self._queue.put_nowait(unit)
+                    self._append_journal(unit)
+                    self._stats["enqueued"] += 1
+                    return True
+                except queue.Full:
+                    if self.overflow == "sync":
+                        break
+            time.sleep(0.01)
+
+        logger.warning("write-behind 큐가 가득 차 동기 저장합니다")
+        self._write_units([unit])
+        self._stats["sync_writes"] += 1
+        return True
+
+    def add_write_listener(self, listener: Callable[[List[List[Record]]], None]):
+        """저장 완료 후 호출할 함수 등록 (저장된 작업 단위 목록을 인자로 받음)"""
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """큐에 쌓인 작업이 모두 저장될 때까지 대기"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._flushed:
+            while self._queue.unfinished_tasks or self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._flushed.wait(remaining if remaining is not None else self.flush_interval)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """남은 작업을 저장하고 플러시 스레드 종료"""
+        if self._stop.is_set():
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._worker.join(timeout)
+        if self._pending:
+            logger.error(f"❌ 저장하지 못한 학습 기록 {len(self._pending)}건"
+                         f"{' (저널에 보존됨)' if self._journal else ''}")
+        self._close_journal()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """버퍼 통계"""
+        return {**self._stats, "queued": self._queue.qsize(), "pending_retry": len(self._pending)}
+
+    def _run(self):
+        """플러시 루프"""
+        while not self._stop.is_set():
+            # 재시도 대기열이 가득 차면 새 작업을 꺼내지 않음 (큐가 차면 overflow 정책 적용)
+            batch = self._collect_batch() if len(self._pending) < self.max_pending else []
+            if batch or self._pending:
+                self._flush_batch(batch)
+
+    def _collect_batch(self) -> List[List[Record]]:
+        """배치 크기 또는 플러시 주기에 도달할 때까지 작업 수집"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush_batch(self, batch: List[List[Record]]):
+        """재시도 대기 작업과 수집한 작업을 배치 크기 단위로 저장"""
+        units = self._pending + batch
+        self._pending = []
+        try:
+            for start in range(0, len(units), self.batch_size):
+                unsaved = self._write_isolating(units[start:start + self.batch_size])
+                if unsaved:
+                    self._pending = unsaved + units[start + self.batch_size:]
+                    break
+            if self._pending:
+                logger.error(f"write-behind 플러시 실패 ({len(self._pending)}건, 다음 주기에 재시도)")
+                time.sleep(min(5.0, self.flush_interval * 2))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+            if not self._pending and self._queue.unfinished_tasks == 0:
+                self._truncate_journal()
+            with self._flushed:
+                self._flushed.notify_all()
+
+    def _write_isolating(self, units: List[List[Record]]) -> List[List[Record]]:
+        """작업 단위 저장 (실패하면 반씩 나눠 다시 저장), 저장하지 못한 작업 단위 반환
+
+        나눠도 혼자 실패하는 작업 단위는 dead-letter로 보내고 나머지는 저장합니다.
+        일시적 오류가 나면 중단하고 아직 저장하지 않은 작업 단위를 모두 반환합니다.
+        """
+        parts = [units]
+        while parts:
+            part = parts.pop()
+            try:
+                self._write_units(part)
+            except Exception as e:
+                self._stats["failures"] += 1
+                if _is_transient(e):
+                    logger.error(f"write-behind 저장 실패 (일시적 오류): {e}")
+                    return part + [unit for rest in reversed(parts) for unit in rest]
+                if len(part) == 1:
+                    self._dead_letter(part[0], e)
+                else:
+                    middle = len(part) // 2
+                    parts.append(part[middle:])
+                    parts.append(part[:middle])
+                continue
+            self._stats["flushed"] += len(part)
+            self._stats["batches"] += 1
+        return []
+
+    def _dead_letter(self, unit: List[Record], error: Exception):
+        """저장할 수 없는 작업 단위를 dead-letter 파일(지정하지 않으면 로그)에 기록"""
+        self._stats["dead_lettered"] += 1
+        tables = ", ".join(sorted({table for table, _, _ in unit}))
+        logger.error(f"❌ 저장할 수 없는 학습 기록을 건너뜁니다 ({tables}): {error}")
+        line = json.dumps({
+            "failed_at": datetime.utcnow().isoformat(),
+            "error": str(error).strip(),
+            "unit": json.loads(_encode_unit(unit)),
+        }, ensure_ascii=False)
+        if self.dead_letter_path:
+            try:
+                with open(self.dead_letter_path, "a", encoding="utf-8") as dead_letter:
+                    dead_letter.write(line + "\n")
+                return
+            except OSError as e:
+                logger.error(f"dead-letter 파일 기록 실패: {e}")
+        logger.error(f"dead-letter: {line}")
+
+    def _write_units(self, units: List[List[Record]]):
+        """작업 단위들을 테이블/컬럼별 다중 행 INSERT로 저장"""
+        grouped: Dict[Tuple[str, Tuple[str, ...]], List[Tuple[Any, ...]]] = {}
+        for unit in units:
+            for table, columns, values in unit:
+                grouped.setdefault((table, tuple(columns)), []).append(tuple(values))
+
+        # 그룹 순서는 첫 등장 순서 (블롭 행이 이를 참조하는 기록보다 먼저 저장됨)
+        statements = [
+            (f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s {insert_suffix(table)}", rows)
+            for (table, columns), rows in grouped.items()
+        ]
+        if statements:
+            self.db.execute_values_batch(statements)
+        for listener in self._write_listeners:
+            try:
+                listener(units)
+            except Exception as e:
+                logger.warning(f"write-behind 저장 후 처리 실패: {e}")
+
+    def _append_journal(self, unit: List[Record]):
+        """작업 단위를 저널에 기록 (_journal_lock 보유 상태에서 호출)"""
+        if not self._journal:
+            return
+        self._journal.write(_encode_unit(unit) + "\n")
+        self._journal.flush()
+        if self.journal_fsync:
+            os.fsync(self._journal.fileno())
+
+    def _truncate_journal(self):
+        """모든 작업이 저장되면 저널 비우기"""
+        if not self._journal:
+            return
+        with self._journal_lock:
+            if self._journal and self._queue.unfinished_tasks == 0 and not self._pending:
+                self._journal.seek(0)
+                self._journal.truncate()
+
+    def _open_journal(self):
+        """이 프로세스의 저널을 열고 종료된 프로세스의 저널을 넘겨받음
+
+        넘겨받은 작업 단위는 이 프로세스의 저널에 옮겨 적은 뒤 원래 저널을 지우고,
+        재시도 대기열에 넣어 플러시 스레드가 저장합니다 (초기화 중에는 DB에 쓰지 않음).
+        """
+        path = f"{self.journal_path}.{os.getpid()}"
+        try:
+            journal = self._lock_journal(path)
+            # 같은 pid를 쓰던 이전 프로세스의 저널이 남아 있을 수 있음
+            journal.seek(0)
+            units = self._read_journal(journal, path)
+            orphans = self._claim_orphan_journals(path)
+            for orphan_path, orphan in orphans:
+                units.extend(self._read_journal(orphan, orphan_path))
+            journal.seek(0)
+            journal.truncate()
+            for unit in units:
+                journal.write(_encode_unit(unit) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        except OSError as e:
+            logger.error(f"❌ write-behind 저널을 열 수 없어 저널 없이 동작합니다: {e}")
+            return
+
+        for orphan_path, orphan in orphans:
+            # 잠금을 쥔 채 비우고 삭제해, 먼저 파일을 연 다른 프로세스가 다시 읽지 않게 함
+            try:
+                orphan.truncate(0)
+                os.remove(orphan_path)
+            except OSError as e:
+                logger.warning(f"재처리한 저널 정리 실패 ({orphan_path}): {e}")
+            orphan.close()
+        self._journal = journal
+        if units:
+            logger.info(f"🔁 write-behind 저널 재처리: {len(units)}건")
+            self._pending = units
+            self._stats["replayed"] = len(units)
+
+    def _lock_journal(self, path: str):
+        """이 프로세스의 저널 파일을 열고 잠금"""
+        while True:
+            journal = open(path, "a+", encoding="utf-8")
+            _lock_file(journal, blocking=True)
+            if _same_file(journal, path):
+                return journal
+            # 잠금을 기다리는 동안 다른 프로세스가 재처리 후 삭제함
+            journal.close()
+
+    def _claim_orphan_journals(self, own_path: str) -> List[Tuple[str, Any]]:
+        """종료된 프로세스의 저널을 잠그고 (경로, 파일) 목록 반환
+
+        실행 중인 프로세스는 자기 저널을 잠그고 있으므로 잠글 수 없는 저널은 건너뜁니다.
+        pid 없는 경로는 프로세스별 저널 이전 형식입니다.
+        """
+        candidates = [self.journal_path] + [
+            path for path in glob.glob(f"{glob.escape(self.journal_path)}.*")
+            if path.rsplit(".", 1)[1].isdigit() and path != own_path
+        ]
+        claimed = []
+        for path in candidates:
+            try:
+                orphan = open(path, "r+", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            if _lock_file(orphan, blocking=False) and _same_file(orphan, path):
+                claimed.append((path, orphan))
+            else:
+                orphan.close()
+        return claimed
+
+    def _read_journal(self, journal, path: str) -> List[List[Record]]:
+        """저널 파일의 작업 단위 목록 (손상된 줄은 건너뜀)"""
+        units = []
+        for number, line in enumerate(journal, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                units.append(_decode_unit(line))
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"손상된 저널 항목 무시 ({path}:{number}): {e}")
+        return units
+
+    def _close_journal(self):
+        """저널 닫기 (남은 작업이 없으면 파일 삭제, 있으면 다음 시작 때 재처리)"""
+        with self._journal_lock:
+            if not self._journal:
+                return
+            if not self._pending and self._queue.unfinished_tasks == 0:
+                self._journal.truncate(0)
+                os.remove(self._journal.name)
+            self._journal.close()
+            self._journal = None
+
+    def detach_after_fork(self):
+        """fork된 자식 프로세스에서 상속한 저널 파일 닫기
+
+        잠금은 부모와 공유하는 열린 파일에 걸려 있으므로 해제하지 않고 닫기만 합니다.
+        """
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+_write_buffer: Optional[WriteBehindBuffer] = None
+_write_buffer_lock = threading.Lock()
+
+
+def get_write_buffer() -> Optional[WriteBehindBuffer]:
+    """write-behind 버퍼 인스턴스 반환 (비활성화 시 None)"""
+    global _write_buffer
+    if not settings.WRITE_BEHIND_ENABLED:
+        return None
+    if _write_buffer is None:
+        with _write_buffer_lock:
+            if _write_buffer is None:
+                _write_buffer = WriteBehindBuffer(
+                    batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+                    flush_interval=settings.WRITE_BEHIND_FLUSH_INTERVAL_MS / 1000,
+                    max_queue=settings.WRITE_BEHIND_MAX_QUEUE,
+                    overflow=settings.WRITE_BEHIND_OVERFLOW,
+                    journal_path=settings.WRITE_BEHIND_JOURNAL_PATH,
+                    journal_fsync=settings.WRITE_BEHIND_JOURNAL_FSYNC,
+                    dead_letter_path=settings.WRITE_BEHIND_DEAD_LETTER_PATH
+                )
+    return _write_buffer
+
+
+def _reset_write_buffer_after_fork():
+    """fork된 자식 프로세스에서 부모의 버퍼 폐기 (플러시 스레드는 자식에 없음)
+
+    부모 큐의 복사본을 자식이 다시 저장하지 않도록 종료 시 처리도 해제하고,
+    자식은 처음 사용할 때 자신의 버퍼(와 자신의 저널)를 만듭니다.
+    """
+    global _write_buffer, _write_buffer_lock
+    if _write_buffer is not None:
+        atexit.unregister(_write_buffer.close)
+        _write_buffer.detach_after_fork()
+    _write_buffer = None
+    _write_buffer_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_write_buffer_after_fork)
@@ -5,5 +5,14 @@ Service modules for the application
 from .auth_service import AuthService
 from .ai_service import AIService
 from .learning_service import LearningService
+from .export_service import ExportService
+from .import_service import ImportService
+from .factory import Services, get_services, close_services
+from .page_loader import PageDataLoader
+from .transcript import ChatTranscript
 
-__all__ = ["AuthService", "AIService", "LearningService"]
+__all__ = [
+    "AuthService", "AIService", "LearningService", "ExportService", "ImportService",
+    "Services", "get_services", "close_services", "PageDataLoader",
+    "ChatTranscript",
+]
@@ -6,6 +6,7 @@ import logging
 import time
 from typing import Optional, Dict, Any
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
 from ..core.config import settings
@@ -29,6 +30,16 @@ class AIService:
         
         if not self.openai_available and not self.solar_available:
             logger.warning("⚠️ OpenAI API 키와 Solar API 키가 모두 설정되지 않았습니다.")
+        
+        # API 호출용 HTTP 세션 (연결 재사용, 여러 세션/스레드가 공유)
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.AI_HTTP_POOL_SIZE)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+    
+    def close(self):
+        """HTTP 세션 연결 종료"""
+        self.http.close()
     
     def get_response(self, prompt: str, use_solar: bool = False) -> str:
         """AI 응답 생성"""
@@ -62,7 +73,7 @@ class AIService:
                 "temperature": 0.7
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.openai_base_url}/chat/completions",
                 headers=headers,
                 json=payload,
@@ -114,7 +125,7 @@ class AIService:
                 "temperature": 0.7
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.solar_base_url}/chat/completions",
                 headers=headers,
                 json=payload,
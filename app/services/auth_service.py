@@ -27,12 +27,7 @@ class AuthService:
             if not self._validate_signup_input(username, email, password, full_name):
                 return None
             
-            # 중복 확인
-            if self._check_duplicate_user(username, email):
-                logger.warning(f"중복 사용자 시도: username={username}, email={email}")
-                return None
-            
-            # 비밀번호 해싱
+            # 비밀번호 해싱 (연결을 잡기 전에 CPU 작업 수행)
             password_hash = self.security_manager.hash_password(password)
             
             # 사용자 생성
@@ -52,7 +47,13 @@ class AuthService:
             RETURNING id, username, email, full_name, created_at, is_active
             """
             
-            result = self.db.execute_query(query, user_data)
+            # 중복 확인과 사용자 생성을 한 트랜잭션에서 처리
+            with self.db.transaction() as tx:
+                if self._check_duplicate_user(username, email, tx=tx):
+                    logger.warning(f"중복 사용자 시도: username={username}, email={email}")
+                    return None
+                
+                result = tx.execute(query, user_data)
             
             if result:
                 user = result[0]
@@ -80,7 +81,7 @@ class AuthService:
             WHERE email = %s AND is_active = TRUE
             """
             
-            result = self.db.execute_query(query, (email,))
+            result = self.db.execute_prepared('wq_login_user', query, (email,))
             
             if not result:
                 logger.warning(f"존재하지 않는 사용자 또는 비활성 계정: {email}")
@@ -177,7 +178,7 @@ class AuthService:
             WHERE id = %s AND is_active = TRUE
             """
             
-            result = self.db.execute_query(query, (user_id,))
+            result = self.db.execute_prepared('wq_user_by_id', query, (user_id,))
             
             if result:
                 return dict(result[0])
@@ -197,7 +198,7 @@ class AuthService:
             WHERE email = %s AND is_active = TRUE
             """
             
-            result = self.db.execute_query(query, (email,))
+            result = self.db.execute_prepared('wq_user_by_email', query, (email,))
             
             if result:
                 return dict(result[0])
@@ -254,8 +255,8 @@ class AuthService:
         
         return True
     
-    def _check_duplicate_user(self, username: str, email: str) -> bool:
-        """중복 사용자 확인"""
+    def _check_duplicate_user(self, username: str, email: str, tx=None) -> bool:
+        """중복 사용자 확인 (tx가 주어지면 해당 트랜잭션에서 조회)"""
         try:
             query = """
             SELECT COUNT(*) as count
@@ -263,7 +264,10 @@ class AuthService:
             WHERE username = %s OR email = %s
             """
             
-            result = self.db.execute_query(query, (username, email))
+            if tx:
+                result = tx.execute_prepared('wq_duplicate_user', query, (username, email))
+            else:
+                result = self.db.execute_prepared('wq_duplicate_user', query, (username, email))
             
             if result and result[0]['count'] > 0:
                 return True
@@ -283,7 +287,7 @@ class AuthService:
             WHERE id = %s
             """
             
-            self.db.execute_query(query, (datetime.utcnow(), user_id))
+            self.db.execute_prepared('wq_update_last_login', query, (datetime.utcnow(), user_id))
             
         except Exception as e:
             logger.error(f"마지막 로그인 시간 업데이트 중 오류: {e}")
@@ -0,0 +1,120 @@
+"""
+사용자 학습 기록 내보내기 서비스 (NDJSON / CSV 스트리밍)
+"""
+
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from typing import Any, Iterator, Optional
+
+from ..core.content_store import blob_select
+from ..core.database import get_db
+from .records import ActivityRecord, ChatRecord, GrammarCheckRecord, VocabularyCheckRecord, record_columns
+
+logger = logging.getLogger(__name__)
+
+# 내보낼 기록 종류 (레코드 타입에 테이블과 컬럼이 정의되어 있음)
+EXPORT_SOURCES = (ChatRecord, GrammarCheckRecord, VocabularyCheckRecord, ActivityRecord)
+
+CSV_COLUMNS = (
+    'record_type', 'id', 'created_at', 'user_message', 'ai_response', 'message_type',
+    'original_text', 'corrected_text', 'analysis_result', 'activity_type', 'description', 'metadata'
+)
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+
+def _json_default(value: Any) -> Any:
+    """JSON 직렬화 보조 (날짜시간)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class ExportService:
+    """사용자의 전체 학습 기록을 스트리밍으로 내보내기
+
+    테이블별로 서버 측 커서를 열어 행을 조금씩 읽고 곧바로 직렬화하므로
+    기록 양과 무관하게 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, itersize: int = 2000):
+        self.db = get_db()
+        self.itersize = itersize
+
+    def iter_records(self, user_id: int) -> Iterator[Any]:
+        """학습 기록 레코드를 종류별, 시간순으로 하나씩 반환 (튜플 행, 행당 딕셔너리 없음)"""
+        for row_type in EXPORT_SOURCES:
+            select_columns, blob_joins = blob_select(row_type.TABLE, record_columns(row_type))
+            query = f"""
+            SELECT t.id, {select_columns}, t.created_at
+            FROM {row_type.TABLE} t
+            {blob_joins}
+            WHERE t.user_id = %s
+            ORDER BY t.created_at, t.id
+            """
+            yield from self.db.stream_query(query, (user_id,), itersize=self.itersize, row_type=row_type)
+
+    def iter_export(self, user_id: int, fmt: str = 'ndjson', compress: bool = False) -> Iterator[bytes]:
+        """내보내기 데이터를 bytes 조각으로 반환 (compress=True면 gzip 스트림)"""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식: {fmt}")
+
+        chunks = self._iter_ndjson(user_id) if fmt == 'ndjson' else self._iter_csv(user_id)
+        if not compress:
+            yield from chunks
+            return
+
+        # wbits=31: gzip 헤더/트레일러 포함
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def export_to_file(self, user_id: int, path: str, fmt: str = 'ndjson',
+                       compress: bool = False) -> int:
+        """파일로 내보내기, 기록한 바이트 수 반환"""
+        written = 0
+        with open(path, 'wb') as output:
+            for chunk in self.iter_export(user_id, fmt=fmt, compress=compress):
+                output.write(chunk)
+                written += len(chunk)
+        logger.info(f"✅ 학습 기록 내보내기 완료: user_id={user_id}, {path} ({written} bytes)")
+        return written
+
+    def get_filename(self, user_id: int, fmt: str = 'ndjson', compress: bool = False,
+                     now: Optional[datetime] = None) -> str:
+        """내보내기 파일 이름"""
+        stamp = (now or datetime.utcnow()).strftime('%Y%m%d')
+        return f"wordquest_history_{user_id}_{stamp}.{fmt}{'.gz' if compress else ''}"
+
+    def _iter_ndjson(self, user_id: int) -> Iterator[bytes]:
+        """한 줄에 기록 하나씩 JSON"""
+        for record in self.iter_records(user_id):
+            line = {'record_type': record.RECORD_TYPE, **record.to_dict()}
+            yield (json.dumps(line, ensure_ascii=False, default=_json_default) + '\n').encode('utf-8')
+
+    def _iter_csv(self, user_id: int) -> Iterator[bytes]:
+        """모든 기록 종류를 공통 컬럼으로 펼친 CSV"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        for record in self.iter_records(user_id):
+            values = {'record_type': record.RECORD_TYPE, 'created_at': record.timestamp.isoformat()}
+            metadata = record.get('metadata')
+            if metadata is not None:
+                values['metadata'] = json.dumps(metadata, ensure_ascii=False, default=_json_default)
+            writer.writerow([
+                values[column] if column in values else record.get(column)
+                for column in CSV_COLUMNS
+            ])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
@@ -0,0 +1,78 @@
+"""
+프로세스 단위 서비스 인스턴스 (Streamlit 세션/재실행 간 공유)
+"""
+
+import atexit
+import logging
+import os
+import threading
+from typing import NamedTuple, Optional
+
+from ..core.database import get_db
+from .ai_service import AIService
+from .auth_service import AuthService
+from .export_service import ExportService
+from .learning_service import LearningService
+
+logger = logging.getLogger(__name__)
+
+
+class Services(NamedTuple):
+    """앱에서 쓰는 서비스 묶음
+
+    서비스는 요청별 상태를 갖지 않고 프로세스 단위 자원(DB 연결 풀, write-behind 버퍼,
+    통계 캐시, HTTP 연결 풀)만 참조하므로 모든 세션이 같은 인스턴스를 씁니다.
+    """
+    auth: AuthService
+    ai: AIService
+    learning: LearningService
+    export: ExportService
+
+
+_services: Optional[Services] = None
+_services_lock = threading.Lock()
+
+
+def get_services() -> Services:
+    """서비스 묶음 반환 (처음 호출할 때 생성, 프로세스 종료 시 close_services 실행)"""
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = Services(
+                    auth=AuthService(),
+                    ai=AIService(),
+                    learning=LearningService(),
+                    export=ExportService()
+                )
+                atexit.register(close_services)
+                logger.info("✅ 서비스 인스턴스 생성 완료")
+    return _services
+
+
+def close_services():
+    """서비스 자원 정리 (저장 대기 기록 저장 → HTTP 세션 → DB 연결 순서)"""
+    global _services
+    with _services_lock:
+        services, _services = _services, None
+    if services is None:
+        return
+    atexit.unregister(close_services)
+    if services.learning.write_buffer:
+        services.learning.write_buffer.close()
+    services.ai.close()
+    get_db().close()
+    logger.info("✅ 서비스 자원 정리 완료")
+
+
+def _reset_services_after_fork():
+    """fork된 자식 프로세스에서 부모의 서비스 폐기 (자식은 처음 사용할 때 새로 생성)"""
+    global _services, _services_lock
+    if _services is not None:
+        atexit.unregister(close_services)
+    _services = None
+    _services_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_services_after_fork)
@@ -0,0 +1,303 @@
+"""
+사용자/학습 기록 대량 가져오기 서비스 (COPY FROM STDIN + 스테이징 테이블)
+"""
+
+import csv
+import io
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..core.content_store import BLOBS_TABLE, BLOB_COLUMNS, insert_suffix
+from ..core.database import get_db
+from ..core.security import get_input_validator
+
+logger = logging.getLogger(__name__)
+
+BCRYPT_HASH_RE = re.compile(r"^\$2[abxy]?\$\d{2}\$[./A-Za-z0-9]{53}$")
+
+CONFLICT_POLICIES = ('skip', 'error')
+
+
+class ImportSpec:
+    """가져오기 대상 정의
+
+    columns: CSV 컬럼 (learning 테이블은 user_id 대신 username으로 사용자 연결)
+    casts: 스테이징(TEXT) → 대상 컬럼 변환 타입
+    defaults: 값이 비어 있을 때 사용할 SQL 식 (명시적 NULL은 컬럼 DEFAULT를 쓰지 않으므로)
+    dedupe: skip 정책에서 기존 행과 같은지 비교할 컬럼 (created_at과 함께 비교)
+    """
+
+    def __init__(self, kind: str, table: str, columns: Tuple[str, ...], required: Tuple[str, ...],
+                 casts: Optional[Dict[str, str]] = None, defaults: Optional[Dict[str, str]] = None,
+                 dedupe: Optional[str] = None):
+        self.kind = kind
+        self.table = table
+        self.columns = columns
+        self.required = required
+        self.casts = casts or {}
+        self.defaults = {'created_at': 'CURRENT_TIMESTAMP', **(defaults or {})}
+        self.dedupe = dedupe
+
+    @property
+    def staging_table(self) -> str:
+        return f"wq_import_{self.kind}"
+
+    @property
+    def is_user_table(self) -> bool:
+        return self.kind == 'users'
+
+    def cast(self, column: str, alias: str = "s") -> str:
+        """스테이징 컬럼 변환식"""
+        if column in self.casts:
+            return f"{alias}.{column}::{self.casts[column]}"
+        return f"{alias}.{column}"
+
+    def value(self, column: str, alias: str = "s") -> str:
+        """INSERT ... SELECT에 쓰는 값 식 (기본값 적용)"""
+        if column in self.defaults:
+            return f"COALESCE({self.cast(column, alias)}, {self.defaults[column]})"
+        return self.cast(column, alias)
+
+
+IMPORT_SPECS: Dict[str, ImportSpec] = {
+    spec.kind: spec for spec in (
+        ImportSpec(
+            'users', 'claude_integration_users',
+            ('username', 'email', 'password_hash', 'full_name', 'created_at', 'is_active'),
+            required=('username', 'email', 'password_hash', 'full_name'),
+            casts={'created_at': 'TIMESTAMP', 'is_active': 'BOOLEAN'},
+            defaults={'is_active': 'TRUE'}
+        ),
+        ImportSpec(
+            'chat_messages', 'claude_integration_chat_messages',
+            ('username', 'user_message', 'ai_response', 'message_type', 'created_at'),
+            required=('username', 'user_message', 'ai_response'),
+            casts={'created_at': 'TIMESTAMP'}, defaults={'message_type': "'chat'"},
+            dedupe='user_message'
+        ),
+        ImportSpec(
+            'grammar_checks', 'claude_integration_grammar_checks',
+            ('username', 'original_text', 'corrected_text', 'created_at'),
+            required=('username', 'original_text', 'corrected_text'),
+            casts={'created_at': 'TIMESTAMP'}, dedupe='original_text'
+        ),
+        ImportSpec(
+            'vocabulary_checks', 'claude_integration_vocabulary_checks',
+            ('username', 'original_text', 'analysis_result', 'created_at'),
+            required=('username', 'original_text', 'analysis_result'),
+            casts={'created_at': 'TIMESTAMP'}, dedupe='original_text'
+        ),
+        ImportSpec(
+            'learning_activities', 'claude_integration_learning_activities',
+            ('username', 'activity_type', 'description', 'metadata', 'created_at'),
+            required=('username', 'activity_type', 'description'),
+            casts={'created_at': 'TIMESTAMP', 'metadata': 'JSONB'}, dedupe='description'
+        ),
+    )
+}
+
+
+class ImportService:
+    """CSV 대량 가져오기
+
+    입력을 batch_size행씩 나누어 처리합니다. 각 배치는
+    행 검증 → 임시 스테이징 테이블로 COPY → 사용자 매칭 → INSERT ... SELECT
+    순서로 한 트랜잭션에서 실행되며, 배치마다 progress 콜백이 호출됩니다.
+    사용자는 해시된 비밀번호(bcrypt)로만 가져올 수 있습니다.
+    """
+
+    def __init__(self, batch_size: int = 50000, on_conflict: str = 'skip',
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 max_error_samples: int = 100):
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"지원하지 않는 충돌 처리 정책: {on_conflict}")
+        self.db = get_db()
+        self.input_validator = get_input_validator()
+        self.batch_size = batch_size
+        self.on_conflict = on_conflict
+        self.progress = progress
+        self.max_error_samples = max_error_samples
+
+    def import_csv(self, kind: str, path: str) -> Dict[str, Any]:
+        """헤더가 있는 CSV 파일 가져오기"""
+        with open(path, newline='', encoding='utf-8') as source:
+            return self.import_rows(kind, csv.DictReader(source))
+
+    def import_rows(self, kind: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """딕셔너리 행 가져오기, 처리 결과 요약 반환"""
+        spec = IMPORT_SPECS.get(kind)
+        if spec is None:
+            raise ValueError(f"지원하지 않는 가져오기 대상: {kind} ({', '.join(IMPORT_SPECS)})")
+
+        summary = {'kind': kind, 'processed': 0, 'inserted': 0, 'skipped': 0, 'rejected': 0, 'errors': []}
+        batch: List[List[Any]] = []
+        # 1행은 CSV 헤더
+        for line_no, row in enumerate(rows, start=2):
+            summary['processed'] += 1
+            values, error = self._validate_row(spec, row)
+            if error:
+                self._reject(summary, line_no, error)
+                continue
+            batch.append([line_no] + values)
+            if len(batch) >= self.batch_size:
+                self._load_batch(spec, batch, summary)
+                batch = []
+        if batch:
+            self._load_batch(spec, batch, summary)
+
+        logger.info(
+            f"✅ 가져오기 완료 ({kind}): 처리 {summary['processed']} / 추가 {summary['inserted']} / "
+            f"건너뜀 {summary['skipped']} / 거부 {summary['rejected']}"
+        )
+        return summary
+
+    def _validate_row(self, spec: ImportSpec, row: Dict[str, Any]) -> Tuple[Optional[List[Any]], Optional[str]]:
+        """행 검증 및 스테이징용 값 정규화 (값 목록, 오류 메시지)"""
+        values = []
+        for column in spec.columns:
+            value = row.get(column)
+            if value is None or (isinstance(value, str) and not value.strip()):
+                if column in spec.required:
+                    return None, f"필수 값 누락: {column}"
+                values.append(None)
+                continue
+
+            cast = spec.casts.get(column)
+            try:
+                if cast == 'TIMESTAMP':
+                    if not isinstance(value, datetime):
+                        value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+                    # 저장 시각은 UTC 기준 (시간대 없는 TIMESTAMP)
+                    if value.tzinfo:
+                        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+                    value = value.isoformat()
+                elif cast == 'BOOLEAN':
+                    normalized = str(value).lower()
+                    if normalized not in ('true', 'false', '1', '0', 't', 'f'):
+                        return None, f"잘못된 논리값: {column}={value}"
+                    value = normalized in ('true', '1', 't')
+                elif cast == 'JSONB':
+                    value = json.dumps(value if not isinstance(value, str) else json.loads(value))
+            except (ValueError, TypeError) as e:
+                return None, f"잘못된 값: {column}={value!r} ({e})"
+            values.append(value)
+
+        if spec.is_user_table:
+            record = dict(zip(spec.columns, values))
+            if not self.input_validator.validate_email(record['email']):
+                return None, f"잘못된 이메일: {record['email']}"
+            if not BCRYPT_HASH_RE.match(record['password_hash']):
+                return None, "password_hash는 bcrypt 해시여야 합니다"
+        return values, None
+
+    def _reject(self, summary: Dict[str, Any], line_no: int, error: str):
+        """거부된 행 기록 (오류 예시는 max_error_samples개까지)"""
+        summary['rejected'] += 1
+        if len(summary['errors']) < self.max_error_samples:
+            summary['errors'].append({'line': line_no, 'error': error})
+
+    def _load_batch(self, spec: ImportSpec, batch: List[List[Any]], summary: Dict[str, Any]):
+        """검증된 배치를 스테이징 테이블로 COPY 후 대상 테이블에 반영 (한 트랜잭션)"""
+        staging = spec.staging_table
+        staging_columns = ('line_no',) + spec.columns
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(batch)
+        buffer.seek(0)
+
+        with self.db.get_cursor() as cursor:
+            # 커밋 시 비워지는 세션 임시 테이블 (풀 연결마다 한 번 생성)
+            cursor.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS {staging} (
+                    {', '.join(f'{column} TEXT' for column in staging_columns)}
+                ) ON COMMIT DELETE ROWS
+            """)
+            cursor.copy_expert(
+                f"COPY {staging} ({', '.join(staging_columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+
+            unknown = 0
+            if spec.is_user_table:
+                inserted = self._insert_users(cursor, spec)
+            else:
+                unknown = self._reject_unknown_users(cursor, spec, summary)
+                inserted = self._insert_learning_rows(cursor, spec)
+
+        summary['inserted'] += inserted
+        summary['skipped'] += len(batch) - inserted - unknown
+
+        if self.progress:
+            self.progress(dict(summary, errors=len(summary['errors'])))
+
+    def _insert_users(self, cursor, spec: ImportSpec) -> int:
+        """스테이징 → 사용자 테이블 (skip: 같은 username/email은 건너뜀)"""
+        cursor.execute(f"""
+            INSERT INTO {spec.table}
+                (username, email, password_hash, full_name, created_at, updated_at, is_active)
+            SELECT s.username, s.email, s.password_hash, s.full_name,
+                   {spec.value('created_at')}, CURRENT_TIMESTAMP, {spec.value('is_active')}
+            FROM {spec.staging_table} s
+            ORDER BY s.line_no::BIGINT
+            {'ON CONFLICT DO NOTHING' if self.on_conflict == 'skip' else ''}
+        """)
+        return cursor.rowcount
+
+    def _reject_unknown_users(self, cursor, spec: ImportSpec, summary: Dict[str, Any]) -> int:
+        """등록되지 않은 username을 참조하는 행 거부, 거부한 행 수 반환"""
+        cursor.execute(f"""
+            SELECT s.line_no::BIGINT AS line_no, s.username
+            FROM {spec.staging_table} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM claude_integration_users u WHERE u.username = s.username
+            )
+            ORDER BY s.line_no::BIGINT
+        """)
+        unknown = cursor.fetchall()
+        for row in unknown:
+            self._reject(summary, row['line_no'], f"알 수 없는 사용자: {row['username']}")
+        return len(unknown)
+
+    def _insert_learning_rows(self, cursor, spec: ImportSpec) -> int:
+        """스테이징 → 학습 기록 테이블 (skip: 같은 사용자/시각/내용의 기존 행은 건너뜀)"""
+        blob_columns = BLOB_COLUMNS.get(spec.table, {})
+        target_columns = []
+        select_values = []
+        for column in spec.columns:
+            if column == 'username':
+                continue
+            if column in blob_columns:
+                # 본문은 블롭 테이블에 한 번만 저장하고 기록에는 해시만 남김
+                cursor.execute(f"""
+                    INSERT INTO {BLOBS_TABLE} (hash, content, byte_size)
+                    SELECT sha256(convert_to(s.{column}, 'UTF8')), s.{column}, octet_length(s.{column})
+                    FROM {spec.staging_table} s
+                    WHERE s.{column} IS NOT NULL
+                    {insert_suffix(BLOBS_TABLE)}
+                """)
+                target_columns.append(blob_columns[column])
+                select_values.append(f"sha256(convert_to(s.{column}, 'UTF8'))")
+            else:
+                target_columns.append(column)
+                select_values.append(spec.value(column))
+        duplicate_filter = ""
+        if self.on_conflict == 'skip' and spec.dedupe:
+            duplicate_filter = f"""
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {spec.table} t
+                WHERE t.user_id = u.id
+                AND t.created_at = {spec.value('created_at')}
+                AND t.{spec.dedupe} = s.{spec.dedupe}
+            )
+            """
+        cursor.execute(f"""
+            INSERT INTO {spec.table} (user_id, {', '.join(target_columns)})
+            SELECT u.id, {', '.join(select_values)}
+            FROM {spec.staging_table} s
+            JOIN claude_integration_users u ON u.username = s.username
+            {duplicate_filter}
+            ORDER BY s.line_no::BIGINT
+        """)
+        return cursor.rowcount
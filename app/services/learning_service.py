@@ -4,10 +4,17 @@
 
 import logging
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
+import base64
 
+from ..core.content_store import BLOB_COLUMNS, blob_record, blob_select, content_hash, insert_suffix
 from ..core.database import get_db
+from ..core.stats_cache import get_stats_cache
+from ..core.write_behind import get_write_buffer
+from .records import (
+    ActivityRecord, ChatRecord, GrammarCheckRecord, SearchHit, VocabularyCheckRecord, record_columns
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,24 +23,32 @@ class LearningService:
     
     def __init__(self):
         self.db = get_db()
+        self.write_buffer = get_write_buffer()
+        # 통계/최근 활동 조회 캐시 (학습 기록 저장 시 해당 사용자 항목 무효화)
+        self.stats_cache = get_stats_cache()
+        if self.write_buffer:
+            self.write_buffer.add_write_listener(self.stats_cache.invalidate_units)
     
     def save_chat_message(self, user_id: int, user_message: str, ai_response: str) -> bool:
         """채팅 메시지 저장"""
         try:
-            query = """
-            INSERT INTO claude_integration_chat_messages 
-            (user_id, user_message, ai_response, created_at, message_type)
-            VALUES (%s, %s, %s, %s, 'chat')
-            """
-            
-            self.db.execute_query(query, (user_id, user_message, ai_response, datetime.utcnow()))
-            
-            # 학습 활동 기록
-            self._record_learning_activity(
-                user_id=user_id,
-                activity_type="chat",
-                description=f"AI와의 영어 학습 대화: {user_message[:50]}..."
-            )
+            created_at = datetime.utcnow()
+            self._save_learning_record([
+                # 본문은 내용 해시 기준으로 한 번만 저장
+                blob_record(ai_response),
+                (
+                    'claude_integration_chat_messages',
+                    ('user_id', 'user_message', 'ai_response_hash', 'created_at', 'message_type'),
+                    (user_id, user_message, content_hash(ai_response), created_at, 'chat')
+                ),
+                # 학습 활동 기록
+                self._learning_activity_record(
+                    user_id=user_id,
+                    activity_type="chat",
+                    description=f"AI와의 영어 학습 대화: {user_message[:50]}...",
+                    created_at=created_at
+                )
+            ])
             
             logger.info(f"채팅 메시지 저장 완료: user_id={user_id}")
             return True
@@ -45,20 +60,22 @@ class LearningService:
     def save_grammar_check(self, user_id: int, original_text: str, corrected_text: str) -> bool:
         """문법 검사 결과 저장"""
         try:
-            query = """
-            INSERT INTO claude_integration_grammar_checks 
-            (user_id, original_text, corrected_text, created_at)
-            VALUES (%s, %s, %s, %s)
-            """
-            
-            self.db.execute_query(query, (user_id, original_text, corrected_text, datetime.utcnow()))
-            
-            # 학습 활동 기록
-            self._record_learning_activity(
-                user_id=user_id,
-                activity_type="grammar_check",
-                description=f"문법 검사 완료: {original_text[:50]}..."
-            )
+            created_at = datetime.utcnow()
+            self._save_learning_record([
+                blob_record(corrected_text),
+                (
+                    'claude_integration_grammar_checks',
+                    ('user_id', 'original_text', 'corrected_text_hash', 'created_at'),
+                    (user_id, original_text, content_hash(corrected_text), created_at)
+                ),
+                # 학습 활동 기록
+                self._learning_activity_record(
+                    user_id=user_id,
+                    activity_type="grammar_check",
+                    description=f"문법 검사 완료: {original_text[:50]}...",
+                    created_at=created_at
+                )
+            ])
             
             logger.info(f"문법 검사 결과 저장 완료: user_id={user_id}")
             return True
@@ -70,20 +87,22 @@ class LearningService:
     def save_vocabulary_check(self, user_id: int, original_text: str, analysis_result: str) -> bool:
         """어휘 분석 결과 저장"""
         try:
-            query = """
-            INSERT INTO claude_integration_vocabulary_checks 
-            (user_id, original_text, analysis_result, created_at)
-            VALUES (%s, %s, %s, %s)
-            """
-            
-            self.db.execute_query(query, (user_id, original_text, analysis_result, datetime.utcnow()))
-            
-            # 학습 활동 기록
-            self._record_learning_activity(
-                user_id=user_id,
-                activity_type="vocabulary_check",
-                description=f"어휘 분석 완료: {original_text[:50]}..."
-            )
+            created_at = datetime.utcnow()
+            self._save_learning_record([
+                blob_record(analysis_result),
+                (
+                    'claude_integration_vocabulary_checks',
+                    ('user_id', 'original_text', 'analysis_result_hash', 'created_at'),
+                    (user_id, original_text, content_hash(analysis_result), created_at)
+                ),
+                # 학습 활동 기록
+                self._learning_activity_record(
+                    user_id=user_id,
+                    activity_type="vocabulary_check",
+                    description=f"어휘 분석 완료: {original_text[:50]}...",
+                    created_at=created_at
+                )
+            ])
             
             logger.info(f"어휘 분석 결과 저장 완료: user_id={user_id}")
             return True
@@ -92,172 +111,154 @@ class LearningService:
             logger.error(f"어휘 분석 결과 저장 중 오류: {e}")
             return False
     
+    def _save_learning_record(self, unit: List[tuple]):
+        """학습 기록 저장 (기록과 학습 활동을 한 트랜잭션으로 저장)
+
+        write-behind 활성화 시 버퍼에 넣고 즉시 반환합니다.
+        저장 후 잠시 동안 해당 사용자의 조회는 프라이머리에서 처리됩니다.
+        해당 사용자의 통계 캐시는 저장 직후(write-behind는 플러시 후에도 한 번 더) 무효화됩니다.
+        """
+        if self.write_buffer:
+            self.write_buffer.enqueue(unit)
+        else:
+            with self.db.transaction() as tx:
+                tx.execute_pipelined([
+                    (self._insert_query(table, columns), values)
+                    for table, columns, values in unit
+                ])
+        
+        for _, columns, values in unit:
+            if 'user_id' in columns:
+                user_id = values[columns.index('user_id')]
+                self.db.note_write(user_id)
+                self.stats_cache.invalidate(user_id)
+                break
+        self.db.ensure_partitions_if_due()
+    
+    def _insert_query(self, table: str, columns: tuple) -> str:
+        """단일 행 INSERT 문 생성"""
+        return f"""
+        INSERT INTO {table} 
+        ({', '.join(columns)})
+        VALUES ({', '.join(['%s'] * len(columns))})
+        {insert_suffix(table)}
+        """
+    
     def get_user_stats(self, user_id: int) -> Dict[str, Any]:
-        """사용자 학습 통계 조회"""
+        """사용자 학습 통계 조회 (카운터 테이블 기본 키 조회, 캐시 사용)"""
         try:
-            stats = {}
-            
-            # 총 채팅 수
-            chat_query = """
-            SELECT COUNT(*) as count
-            FROM claude_integration_chat_messages 
-            WHERE user_id = %s
-            """
-            chat_result = self.db.execute_query(chat_query, (user_id,))
-            stats['total_chats'] = chat_result[0]['count'] if chat_result else 0
-            
-            # 총 문법 검사 수
-            grammar_query = """
-            SELECT COUNT(*) as count
-            FROM claude_integration_grammar_checks 
-            WHERE user_id = %s
-            """
-            grammar_result = self.db.execute_query(grammar_query, (user_id,))
-            stats['grammar_checks'] = grammar_result[0]['count'] if grammar_result else 0
-            
-            # 총 어휘 분석 수
-            vocab_query = """
-            SELECT COUNT(*) as count
-            FROM claude_integration_vocabulary_checks 
-            WHERE user_id = %s
-            """
-            vocab_result = self.db.execute_query(vocab_query, (user_id,))
-            stats['vocabulary_checks'] = vocab_result[0]['count'] if vocab_result else 0
-            
-            # 총 학습 활동 수
-            activity_query = """
-            SELECT COUNT(*) as count
-            FROM claude_integration_learning_activities 
-            WHERE user_id = %s
-            """
-            activity_result = self.db.execute_query(activity_query, (user_id,))
-            stats['total_activities'] = activity_result[0]['count'] if activity_result else 0
-            
-            # 학습 일수 계산
-            first_activity_query = """
-            SELECT MIN(created_at) as first_date
-            FROM claude_integration_learning_activities 
-            WHERE user_id = %s
-            """
-            first_result = self.db.execute_query(first_activity_query, (user_id,))
-            
-            if first_result and first_result[0]['first_date']:
-                first_date = first_result[0]['first_date']
-                if isinstance(first_date, str):
-                    first_date = datetime.fromisoformat(first_date.replace('Z', '+00:00'))
-                days_diff = (datetime.utcnow() - first_date).days
-                stats['study_days'] = max(1, days_diff)
-            else:
-                stats['study_days'] = 0
-            
-            # 총 학습 시간 (대략적인 추정)
-            stats['total_study_time'] = (stats['total_chats'] * 5 + 
-                                       stats['grammar_checks'] * 3 + 
-                                       stats['vocabulary_checks'] * 3)
-            
-            return stats
+            return self.stats_cache.get_or_load(user_id, 'user_stats', lambda: self._load_user_stats(user_id))
             
         except Exception as e:
             logger.error(f"사용자 통계 조회 중 오류: {e}")
-            return {
-                'total_chats': 0,
-                'grammar_checks': 0,
-                'vocabulary_checks': 0,
-                'total_activities': 0,
-                'study_days': 0,
-                'total_study_time': 0
-            }
+            return self._build_user_stats(0, 0, 0, 0, None)
+    
+    def _load_user_stats(self, user_id: int) -> Dict[str, Any]:
+        """카운터 테이블에서 통계 조회"""
+        query = """
+        SELECT total_chats, grammar_checks, vocabulary_checks,
+               total_activities, first_activity_at
+        FROM claude_integration_user_learning_counters
+        WHERE user_id = %s
+        """
+        result = self.db.execute_prepared('wq_user_stats', query, (user_id,),
+                                        read_only=True, user_id=user_id)
+        row = result[0] if result else {}
+        
+        return self._build_user_stats(
+            total_chats=row.get('total_chats') or 0,
+            grammar_checks=row.get('grammar_checks') or 0,
+            vocabulary_checks=row.get('vocabulary_checks') or 0,
+            total_activities=row.get('total_activities') or 0,
+            first_date=row.get('first_activity_at')
+        )
+    
+    def _build_user_stats(self, total_chats: int, grammar_checks: int, vocabulary_checks: int,
+                          total_activities: int, first_date) -> Dict[str, Any]:
+        """집계 값으로 통계 딕셔너리 구성"""
+        stats = {
+            'total_chats': total_chats,
+            'grammar_checks': grammar_checks,
+            'vocabulary_checks': vocabulary_checks,
+            'total_activities': total_activities
+        }
+        
+        # 학습 일수 계산
+        if first_date:
+            if isinstance(first_date, str):
+                first_date = datetime.fromisoformat(first_date.replace('Z', '+00:00'))
+            days_diff = (datetime.utcnow() - first_date).days
+            stats['study_days'] = max(1, days_diff)
+        else:
+            stats['study_days'] = 0
+        
+        # 총 학습 시간 (대략적인 추정)
+        stats['total_study_time'] = (stats['total_chats'] * 5 + 
+                                   stats['grammar_checks'] * 3 + 
+                                   stats['vocabulary_checks'] * 3)
+        
+        return stats
     
-    def get_recent_activities(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
-        """최근 학습 활동 조회"""
+    def get_recent_activities(self, user_id: int, limit: int = 10) -> List[ActivityRecord]:
+        """최근 학습 활동 조회 (캐시 사용)"""
         try:
-            # 먼저 learning_activities 테이블에서 조회 시도
+            # 기록된 학습 활동을 우선 조회하고, 없으면 원본 테이블에서 대체 활동을 생성
+            # (한 번의 쿼리로 정렬/제한까지 DB에서 처리)
             query = """
-            SELECT activity_type, description, created_at, metadata
-            FROM claude_integration_learning_activities 
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            
-            result = self.db.execute_query(query, (user_id, limit))
-            
-            # 결과가 있으면 반환
-            if result:
-                activities = []
-                for row in result:
-                    activity = {
-                        'type': row['activity_type'],
-                        'description': row['description'],
-                        'created_at': self._format_datetime(row['created_at']),
-                        'metadata': row.get('metadata', {})
-                    }
-                    activities.append(activity)
-                return activities
-            
-            # learning_activities에 데이터가 없으면 다른 테이블에서 대체 데이터 생성
-            logger.info(f"사용자 {user_id}의 learning_activities 데이터가 없어 대체 데이터를 생성합니다.")
-            
-            # 채팅 메시지, 문법 검사, 어휘 분석에서 최근 활동 생성
-            activities = []
-            
-            # 최근 채팅 메시지
-            chat_query = """
-            SELECT user_message, created_at
-            FROM claude_integration_chat_messages 
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            chat_result = self.db.execute_query(chat_query, (user_id, limit))
-            
-            for row in chat_result:
-                activities.append({
-                    'type': 'chat',
-                    'description': f"AI와의 영어 학습 대화: {row['user_message'][:50]}...",
-                    'created_at': self._format_datetime(row['created_at']),
-                    'metadata': {'source': 'chat_messages'}
-                })
-            
-            # 최근 문법 검사
-            grammar_query = """
-            SELECT original_text, created_at
-            FROM claude_integration_grammar_checks 
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            grammar_result = self.db.execute_query(grammar_query, (user_id, limit))
-            
-            for row in grammar_result:
-                activities.append({
-                    'type': 'grammar_check',
-                    'description': f"문법 검사 완료: {row['original_text'][:50]}...",
-                    'created_at': self._format_datetime(row['created_at']),
-                    'metadata': {'source': 'grammar_checks'}
-                })
-            
-            # 최근 어휘 분석
-            vocab_query = """
-            SELECT original_text, created_at
-            FROM claude_integration_vocabulary_checks 
-            WHERE user_id = %s
+            WITH recorded AS (
+                SELECT id, activity_type, description, COALESCE(metadata, '{}'::JSONB) AS metadata, created_at
+                FROM claude_integration_learning_activities
+                WHERE user_id = %(user_id)s
+                ORDER BY created_at DESC
+                LIMIT %(limit)s
+            )
+            SELECT id, activity_type, description, metadata, created_at FROM recorded
+            UNION ALL
+            SELECT id, activity_type, description, metadata, created_at
+            FROM (
+                (SELECT id,
+                        'chat' AS activity_type,
+                        'AI와의 영어 학습 대화: ' || LEFT(user_message, 50) || '...' AS description,
+                        jsonb_build_object('source', 'chat_messages') AS metadata,
+                        created_at
+                 FROM claude_integration_chat_messages
+                 WHERE user_id = %(user_id)s
+                 ORDER BY created_at DESC
+                 LIMIT %(limit)s)
+                UNION ALL
+                (SELECT id,
+                        'grammar_check',
+                        '문법 검사 완료: ' || LEFT(original_text, 50) || '...',
+                        jsonb_build_object('source', 'grammar_checks'),
+                        created_at
+                 FROM claude_integration_grammar_checks
+                 WHERE user_id = %(user_id)s
+                 ORDER BY created_at DESC
+                 LIMIT %(limit)s)
+                UNION ALL
+                (SELECT id,
+                        'vocabulary_check',
+                        '어휘 분석 완료: ' || LEFT(original_text, 50) || '...',
+                        jsonb_build_object('source', 'vocabulary_checks'),
+                        created_at
+                 FROM claude_integration_vocabulary_checks
+                 WHERE user_id = %(user_id)s
+                 ORDER BY created_at DESC
+                 LIMIT %(limit)s)
+            ) derived
+            WHERE NOT EXISTS (SELECT 1 FROM recorded)
             ORDER BY created_at DESC
-            LIMIT %s
+            LIMIT %(limit)s
             """
-            vocab_result = self.db.execute_query(vocab_query, (user_id, limit))
             
-            for row in vocab_result:
-                activities.append({
-                    'type': 'vocabulary_check',
-                    'description': f"어휘 분석 완료: {row['original_text'][:50]}...",
-                    'created_at': self._format_datetime(row['created_at']),
-                    'metadata': {'source': 'vocabulary_checks'}
-                })
-            
-            # 날짜순으로 정렬하고 limit 적용
-            activities.sort(key=lambda x: x['created_at'], reverse=True)
-            return activities[:limit]
+            return self.stats_cache.get_or_load(
+                user_id, f'recent_activities:{limit}',
+                lambda: self.db.execute_prepared(
+                    'wq_recent_activities', query, {'user_id': user_id, 'limit': limit},
+                    read_only=True, user_id=user_id, row_type=ActivityRecord
+                ),
+                restore=lambda rows: [ActivityRecord._make(row) for row in rows]
+            )
             
         except Exception as e:
             logger.error(f"최근 학습 활동 조회 중 오류: {e}")
@@ -273,164 +274,269 @@ class LearningService:
     
     def get_weekly_activities(self, user_id: int) -> Dict[str, int]:
         """주간 학습 활동 통계"""
+        return self.get_activity_series(user_id, days=7)
+    
+    def get_activity_series(self, user_id: int, days: int = 7,
+                            activity_type: Optional[str] = None,
+                            end_date: Optional[date] = None) -> Dict[str, int]:
+        """기간별 일일 학습 활동 수 (일별 집계 테이블에서 조회, 빈 날짜는 0)
+        
+        30/90/365일 달력 히트맵도 7일 차트와 같은 비용으로 조회됩니다.
+        activity_type을 지정하면 해당 유형만 집계합니다.
+        """
         try:
-            # 최근 7일간의 활동
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=7)
+            end_date = end_date or datetime.utcnow().date()
+            start_date = end_date - timedelta(days=max(days, 1) - 1)
             
             query = """
-            SELECT 
-                DATE(created_at) as activity_date,
-                COUNT(*) as activity_count
-            FROM claude_integration_learning_activities 
-            WHERE user_id = %s 
-            AND created_at BETWEEN %s AND %s
-            GROUP BY DATE(created_at)
-            ORDER BY activity_date
+            SELECT d::DATE AS activity_date, COALESCE(SUM(r.activity_count), 0) AS activity_count
+            FROM generate_series(%(start_date)s::DATE, %(end_date)s::DATE, INTERVAL '1 day') AS d
+            LEFT JOIN claude_integration_daily_activity_rollup r
+                ON r.user_id = %(user_id)s
+                AND r.day = d::DATE
+                AND (%(activity_type)s::VARCHAR IS NULL OR r.activity_type = %(activity_type)s::VARCHAR)
+            GROUP BY d
+            ORDER BY d
             """
             
-            result = self.db.execute_query(query, (user_id, start_date, end_date))
-            
-            # 날짜별 활동 수를 딕셔너리로 변환
-            weekly_data = {}
-            for row in result:
-                date_str = row['activity_date'].strftime('%Y-%m-%d') if hasattr(row['activity_date'], 'strftime') else str(row['activity_date'])
-                weekly_data[date_str] = row['activity_count']
-            
-            # 빈 날짜는 0으로 채우기
-            current_date = start_date
-            while current_date <= end_date:
-                date_str = current_date.strftime('%Y-%m-%d')
-                if date_str not in weekly_data:
-                    weekly_data[date_str] = 0
-                current_date += timedelta(days=1)
+            def load_series() -> Dict[str, int]:
+                result = self.db.execute_prepared('wq_activity_series', query, {
+                    'user_id': user_id,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'activity_type': activity_type
+                }, read_only=True, user_id=user_id)
+                return {
+                    row['activity_date'].strftime('%Y-%m-%d'): int(row['activity_count'])
+                    for row in result
+                }
             
-            return weekly_data
+            # 날짜가 바뀌면 키가 달라지므로 지난 날짜 기준 결과는 쓰이지 않음
+            return self.stats_cache.get_or_load(
+                user_id, f'activity_series:{start_date}:{end_date}:{activity_type or "*"}', load_series
+            )
             
         except Exception as e:
-            logger.error(f"주간 학습 활동 조회 중 오류: {e}")
+            logger.error(f"기간별 학습 활동 조회 중 오류: {e}")
             return {}
     
-    def get_grammar_checks(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_grammar_checks(self, user_id: int, limit: int = 10) -> List[GrammarCheckRecord]:
         """문법 검사 기록 조회"""
+        return self.get_grammar_checks_page(user_id, limit=limit)['items']
+    
+    def get_vocabulary_checks(self, user_id: int, limit: int = 10) -> List[VocabularyCheckRecord]:
+        """어휘 분석 기록 조회"""
+        return self.get_vocabulary_checks_page(user_id, limit=limit)['items']
+    
+    def get_chat_history(self, user_id: int, limit: int = 20) -> List[ChatRecord]:
+        """채팅 기록 조회"""
+        return self.get_chat_history_page(user_id, limit=limit)['items']
+    
+    def get_grammar_checks_page(self, user_id: int, limit: int = 10,
+                                cursor: Optional[str] = None) -> Dict[str, Any]:
+        """문법 검사 기록 페이지 조회 (키셋 페이지네이션)"""
         try:
-            query = """
-            SELECT original_text, corrected_text, created_at
-            FROM claude_integration_grammar_checks 
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            
-            result = self.db.execute_query(query, (user_id, limit))
-            
-            checks = []
-            for row in result:
-                check = {
-                    'original_text': row['original_text'],
-                    'corrected_text': row['corrected_text'],
-                    'created_at': self._format_datetime(row['created_at'])
-                }
-                checks.append(check)
-            
-            return checks
-            
+            return self._fetch_history_page('grammar_checks', GrammarCheckRecord, user_id, limit, cursor)
         except Exception as e:
             logger.error(f"문법 검사 기록 조회 중 오류: {e}")
-            return []
+            return {'items': [], 'next_cursor': None}
     
-    def get_vocabulary_checks(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
-        """어휘 분석 기록 조회"""
+    def get_vocabulary_checks_page(self, user_id: int, limit: int = 10,
+                                   cursor: Optional[str] = None) -> Dict[str, Any]:
+        """어휘 분석 기록 페이지 조회 (키셋 페이지네이션)"""
         try:
-            query = """
-            SELECT original_text, analysis_result, created_at
-            FROM claude_integration_vocabulary_checks 
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            
-            result = self.db.execute_query(query, (user_id, limit))
-            
-            checks = []
-            for row in result:
-                check = {
-                    'original_text': row['original_text'],
-                    'analysis_result': row['analysis_result'],
-                    'created_at': self._format_datetime(row['created_at'])
-                }
-                checks.append(check)
-            
-            return checks
-            
+            return self._fetch_history_page('vocabulary_checks', VocabularyCheckRecord, user_id, limit, cursor)
         except Exception as e:
             logger.error(f"어휘 분석 기록 조회 중 오류: {e}")
-            return []
+            return {'items': [], 'next_cursor': None}
     
-    def get_chat_history(self, user_id: int, limit: int = 20) -> List[Dict[str, Any]]:
-        """채팅 기록 조회"""
+    def get_chat_history_page(self, user_id: int, limit: int = 20,
+                              cursor: Optional[str] = None) -> Dict[str, Any]:
+        """채팅 기록 페이지 조회 (키셋 페이지네이션)"""
         try:
-            query = """
-            SELECT user_message, ai_response, created_at
-            FROM claude_integration_chat_messages 
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            
-            result = self.db.execute_query(query, (user_id, limit))
-            
-            chats = []
-            for row in result:
-                chat = {
-                    'user_message': row['user_message'],
-                    'ai_response': row['ai_response'],
-                    'created_at': self._format_datetime(row['created_at'])
-                }
-                chats.append(chat)
-            
-            return chats
-            
+            return self._fetch_history_page('chat_history', ChatRecord, user_id, limit, cursor)
         except Exception as e:
             logger.error(f"채팅 기록 조회 중 오류: {e}")
-            return []
+            return {'items': [], 'next_cursor': None}
     
-    def _record_learning_activity(self, user_id: int, activity_type: str, description: str, metadata: Optional[Dict] = None):
-        """학습 활동 기록"""
+    def _fetch_history_page(self, name: str, row_type, user_id: int,
+                            limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+        """(created_at, id) 키셋 기준 최신순 페이지 조회
+
+        다음 페이지 존재 여부 확인을 위해 limit + 1행을 읽고,
+        마지막 행의 (created_at, id)를 불투명 커서로 반환합니다.
+        행은 row_type 레코드로 반환합니다 (created_at 표시 형식은 화면에서 계산).
+        """
+        table = row_type.TABLE
+        columns = record_columns(row_type)
+        # 본문은 페이지 행만 골라낸 뒤 블롭 테이블에서 읽어옴 (기존 행은 테이블 본문 사용)
+        hash_columns = tuple(
+            hash_column for column, hash_column in BLOB_COLUMNS.get(table, {}).items() if column in columns
+        )
+        inner_columns = ', '.join(('id',) + columns + hash_columns + ('created_at',))
+        blob_columns, blob_joins = blob_select(table, columns)
+        
+        if cursor:
+            before_created_at, before_id = self._decode_cursor(cursor)
+            query = f"""
+            SELECT t.id, {blob_columns}, t.created_at
+            FROM (
+                SELECT {inner_columns}
+                FROM {table}
+                WHERE user_id = %s
+                AND created_at <= %s
+                AND (created_at, id) < (%s, %s)
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+            ) t
+            {blob_joins}
+            ORDER BY t.created_at DESC, t.id DESC
+            """
+            # 행 비교식만으로는 파티션 제외가 안 되므로 created_at 상한을 별도로 지정
+            result = self.db.execute_prepared(
+                f'wq_{name}_after', query,
+                (user_id, before_created_at, before_created_at, before_id, limit + 1),
+                read_only=True, user_id=user_id, row_type=row_type
+            )
+        else:
+            query = f"""
+            SELECT t.id, {blob_columns}, t.created_at
+            FROM (
+                SELECT {inner_columns}
+                FROM {table}
+                WHERE user_id = %s
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+            ) t
+            {blob_joins}
+            ORDER BY t.created_at DESC, t.id DESC
+            """
+            result = self.db.execute_prepared(
+                f'wq_{name}', query, (user_id, limit + 1),
+                read_only=True, user_id=user_id, row_type=row_type
+            )
+        
+        items = result[:limit]
+        next_cursor = None
+        if len(result) > limit and items:
+            next_cursor = self._encode_cursor(items[-1].timestamp, items[-1].id)
+        
+        return {'items': items, 'next_cursor': next_cursor}
+    
+    def search_history(self, user_id: int, query: str, limit: int = 10,
+                       page: int = 1) -> Dict[str, Any]:
+        """채팅/문법 검사 기록 전문 검색 (관련도순, 페이지 단위)
+        
+        영어는 어간 기준(english), 한국어 등은 원형 토큰 기준(simple)으로 검색합니다.
+        반환값: {'items': [...], 'page': n, 'has_more': bool}
+        """
+        query = (query or '').strip()
+        page = max(page, 1)
+        if not query:
+            return {'items': [], 'page': page, 'has_more': False}
+        
         try:
-            query = """
-            INSERT INTO claude_integration_learning_activities 
-            (user_id, activity_type, description, metadata, created_at)
-            VALUES (%s, %s, %s, %s, %s)
+            search_query = """
+            WITH q AS (
+                SELECT websearch_to_tsquery('english', %(query)s) ||
+                       websearch_to_tsquery('simple', %(query)s) AS tsq
+            ),
+            -- 본문(AI 응답/교정문)은 블롭에 있으므로 기록 자체와 블롭 양쪽에서 일치 항목 수집
+            chat_matches AS (
+                SELECT c.id, c.created_at
+                FROM claude_integration_chat_messages c, q
+                WHERE c.user_id = %(user_id)s AND c.search_vector @@ q.tsq
+                UNION
+                SELECT c.id, c.created_at
+                FROM claude_integration_content_blobs b
+                JOIN claude_integration_chat_messages c ON c.ai_response_hash = b.hash, q
+                WHERE b.search_vector @@ q.tsq AND c.user_id = %(user_id)s
+            ),
+            grammar_matches AS (
+                SELECT g.id
+                FROM claude_integration_grammar_checks g, q
+                WHERE g.user_id = %(user_id)s AND g.search_vector @@ q.tsq
+                UNION
+                SELECT g.id
+                FROM claude_integration_content_blobs b
+                JOIN claude_integration_grammar_checks g ON g.corrected_text_hash = b.hash, q
+                WHERE b.search_vector @@ q.tsq AND g.user_id = %(user_id)s
+            ),
+            hits AS (
+                SELECT 'chat' AS record_type, c.id, c.created_at,
+                       c.user_message AS title, COALESCE(c.ai_response, b.content) AS body,
+                       ts_rank_cd(c.search_vector || COALESCE(b.search_vector, ''::TSVECTOR), q.tsq) AS rank
+                FROM chat_matches m
+                JOIN claude_integration_chat_messages c ON c.id = m.id AND c.created_at = m.created_at
+                LEFT JOIN claude_integration_content_blobs b ON b.hash = c.ai_response_hash, q
+                UNION ALL
+                SELECT 'grammar_check', g.id, g.created_at,
+                       g.original_text, COALESCE(g.corrected_text, b.content),
+                       ts_rank_cd(g.search_vector || COALESCE(b.search_vector, ''::TSVECTOR), q.tsq)
+                FROM grammar_matches m
+                JOIN claude_integration_grammar_checks g ON g.id = m.id
+                LEFT JOIN claude_integration_content_blobs b ON b.hash = g.corrected_text_hash, q
+            ),
+            ranked AS (
+                SELECT * FROM hits
+                ORDER BY rank DESC, created_at DESC, id DESC
+                LIMIT %(limit)s OFFSET %(offset)s
+            )
+            -- 하이라이트는 반환할 행에 대해서만 계산
+            SELECT r.record_type, r.id, r.created_at, r.title, r.rank,
+                   ts_headline('english', r.body, q.tsq,
+                               'MaxFragments=1, MaxWords=30, MinWords=10, StartSel=**, StopSel=**') AS snippet
+            FROM ranked r, q
+            ORDER BY r.rank DESC, r.created_at DESC, r.id DESC
             """
             
-            metadata_json = json.dumps(metadata) if metadata else None
+            result = self.db.execute_prepared('wq_search_history', search_query, {
+                'user_id': user_id,
+                'query': query,
+                'limit': limit + 1,
+                'offset': (page - 1) * limit
+            }, read_only=True, user_id=user_id, row_type=SearchHit)
             
-            self.db.execute_query(query, (user_id, activity_type, description, metadata_json, datetime.utcnow()))
+            return {'items': result[:limit], 'page': page, 'has_more': len(result) > limit}
             
         except Exception as e:
-            logger.error(f"학습 활동 기록 중 오류: {e}")
+            logger.error(f"학습 기록 검색 중 오류: {e}")
+            return {'items': [], 'page': page, 'has_more': False}
+    
+    def cursor_before(self, created_at: datetime) -> str:
+        """지정 시각 이전 기록부터 조회하는 페이지 커서"""
+        return self._encode_cursor(created_at, 0)
+    
+    def _encode_cursor(self, created_at: datetime, record_id: int) -> str:
+        """페이지 커서 인코딩 (불투명 문자열)"""
+        payload = json.dumps({'t': created_at.isoformat(), 'i': record_id}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
     
-    def _format_datetime(self, dt) -> str:
-        """날짜시간 형식 변환"""
+    def _decode_cursor(self, cursor: str) -> tuple:
+        """페이지 커서 디코딩"""
         try:
-            if isinstance(dt, str):
-                # 문자열인 경우 파싱
-                dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
-            
-            if isinstance(dt, datetime):
-                # 한국 시간으로 변환 (UTC+9)
-                kst_time = dt + timedelta(hours=9)
-                return kst_time.strftime('%Y-%m-%d %H:%M')
-            else:
-                return str(dt)
-        except Exception:
-            return str(dt)
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(payload['t']), int(payload['i'])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"잘못된 페이지 커서: {cursor}") from e
+    
+    def _learning_activity_record(self, user_id: int, activity_type: str, description: str,
+                                  metadata: Optional[Dict] = None,
+                                  created_at: Optional[datetime] = None) -> tuple:
+        """학습 활동 기록 행 생성"""
+        metadata_json = json.dumps(metadata) if metadata else None
+        return (
+            'claude_integration_learning_activities',
+            ('user_id', 'activity_type', 'description', 'metadata', 'created_at'),
+            (user_id, activity_type, description, metadata_json, created_at or datetime.utcnow())
+        )
     
-    def get_learning_progress(self, user_id: int) -> Dict[str, Any]:
-        """학습 진도 조회"""
+    def get_learning_progress(self, user_id: int, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """학습 진도 조회 (이미 조회한 통계가 있으면 재사용)"""
         try:
-            stats = self.get_user_stats(user_id)
+            if stats is None:
+                stats = self.get_user_stats(user_id)
             
             # 진도 계산
             total_activities = stats['total_activities']
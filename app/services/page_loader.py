@@ -0,0 +1,98 @@
+"""
+페이지 단위 데이터 로더 (같은 호출 중복 제거, 독립 조회 동시 실행)
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PageDataLoader:
+    """한 번의 화면 렌더링에서 쓰는 데이터 로더
+
+    - 같은 함수/인자 호출은 한 번만 실행하고 결과(Future)를 공유합니다.
+    - 조회는 공유 스레드 풀에서 동시에 실행되므로, 필요한 조회를 먼저 모두 submit하고
+      화면을 그리면서 get()으로 결과를 받으면 지연 시간이 조회 시간의 합이 아니라 최댓값이 됩니다.
+    - 로더는 렌더링하는 스레드 하나에서만 사용하고, 넘긴 함수 안에서 Streamlit API나
+      로더를 다시 호출하지 않습니다.
+    """
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        self.executor = executor or get_page_executor()
+        self._futures: Dict[tuple, Future] = {}
+        self._durations: List[float] = []
+        self._started = time.perf_counter()
+        self.deduplicated = 0
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """조회 시작 (이미 같은 호출이 있으면 그 Future 반환)"""
+        future, created = self._future(func, args, kwargs)
+        if not created:
+            self.deduplicated += 1
+        return future
+
+    def get(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """조회 결과 반환 (아직 시작하지 않았으면 시작 후 대기)"""
+        return self._future(func, args, kwargs)[0].result()
+
+    def _future(self, func: Callable[..., Any], args: tuple, kwargs: dict):
+        """(호출의 Future, 새로 시작했는지 여부)"""
+        key = (func, args, tuple(sorted(kwargs.items())))
+        future = self._futures.get(key)
+        if future is not None:
+            return future, False
+        future = self.executor.submit(self._timed, func, args, kwargs)
+        self._futures[key] = future
+        return future, True
+
+    def _timed(self, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._durations.append((time.perf_counter() - started) * 1000)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """로더 통계 (조회 시간 합계와 실제 경과 시간 비교용)"""
+        return {
+            "calls": len(self._futures),
+            "deduplicated": self.deduplicated,
+            "query_ms_sum": round(sum(self._durations), 2),
+            "query_ms_max": round(max(self._durations, default=0.0), 2),
+            "elapsed_ms": round((time.perf_counter() - self._started) * 1000, 2),
+        }
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_page_executor() -> ThreadPoolExecutor:
+    """페이지 조회용 공유 스레드 풀 (PAGE_LOADER_WORKERS개)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PAGE_LOADER_WORKERS,
+                    thread_name_prefix="page-loader"
+                )
+    return _executor
+
+
+def _reset_executor_after_fork():
+    """fork된 자식 프로세스에서 스레드 풀 폐기 (작업 스레드는 자식에 없음)"""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor_after_fork)
@@ -0,0 +1,107 @@
+"""
+학습 기록 행 타입 (튜플 커서 결과를 그대로 담는 경량 레코드)
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+# 한국 시간 (UTC+9)
+KST_OFFSET = timedelta(hours=9)
+
+
+def format_kst(dt) -> str:
+    """날짜시간을 한국 시간 'YYYY-MM-DD HH:MM' 문자열로 변환"""
+    try:
+        if isinstance(dt, str):
+            # 문자열인 경우 파싱
+            dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+        if isinstance(dt, datetime):
+            return (dt + KST_OFFSET).strftime('%Y-%m-%d %H:%M')
+        return str(dt)
+    except Exception:
+        return str(dt)
+
+
+class RecordView:
+    """레코드 공통 동작
+
+    - 행 값은 튜플로만 보관하고(행당 딕셔너리 없음) created_at 표시 문자열은
+      화면에 그릴 때 계산합니다. 원본 시각은 timestamp 필드에 있습니다.
+    - 기존 딕셔너리 행과 같이 record['created_at'] 형태의 접근도 지원합니다.
+    - 테이블 레코드는 SELECT id, <본문 컬럼>, created_at 순서의 튜플 행으로 만듭니다.
+    """
+
+    __slots__ = ()
+
+    @property
+    def created_at(self) -> str:
+        return format_kst(self.timestamp)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """원본 값 딕셔너리 (created_at은 datetime 그대로)"""
+        values = self._asdict()
+        values['created_at'] = values.pop('timestamp')
+        return values
+
+
+class ChatRecord(RecordView, namedtuple('ChatRecord',
+                                        ('id', 'user_message', 'ai_response', 'message_type', 'timestamp'))):
+    """채팅 기록"""
+    __slots__ = ()
+    RECORD_TYPE = 'chat'
+    TABLE = 'claude_integration_chat_messages'
+
+
+class GrammarCheckRecord(RecordView, namedtuple('GrammarCheckRecord',
+                                                ('id', 'original_text', 'corrected_text', 'timestamp'))):
+    """문법 검사 기록"""
+    __slots__ = ()
+    RECORD_TYPE = 'grammar_check'
+    TABLE = 'claude_integration_grammar_checks'
+
+
+class VocabularyCheckRecord(RecordView, namedtuple('VocabularyCheckRecord',
+                                                   ('id', 'original_text', 'analysis_result', 'timestamp'))):
+    """어휘 분석 기록"""
+    __slots__ = ()
+    RECORD_TYPE = 'vocabulary_check'
+    TABLE = 'claude_integration_vocabulary_checks'
+
+
+class ActivityRecord(RecordView, namedtuple('ActivityRecord',
+                                            ('id', 'activity_type', 'description', 'metadata', 'timestamp'))):
+    """학습 활동 기록"""
+    __slots__ = ()
+    RECORD_TYPE = 'activity'
+    TABLE = 'claude_integration_learning_activities'
+
+    @property
+    def type(self) -> str:
+        return self.activity_type
+
+
+class SearchHit(RecordView, namedtuple('SearchHit',
+                                       ('record_type', 'id', 'timestamp', 'title', 'rank', 'snippet'))):
+    """학습 기록 검색 결과"""
+    __slots__ = ()
+
+    @property
+    def type(self) -> str:
+        return self.record_type
+
+
+def record_columns(row_type) -> tuple:
+    """테이블 레코드의 본문 컬럼 (id, ..., created_at 사이의 필드)"""
+    return row_type._fields[1:-1]
@@ -0,0 +1,159 @@
+"""
+세션별 채팅 대화 기록 (최근 대화만 보관, 이전 대화는 필요할 때 DB에서 조회)
+"""
+
+import sys
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+
+class ChatTurn(NamedTuple):
+    """질문과 응답 한 쌍"""
+    prompt: str
+    response: str
+    timestamp: datetime
+    saved: bool  # 학습 기록(DB)에 저장되었는지 여부
+
+
+def _turn_size(turn: ChatTurn) -> int:
+    """대화 한 쌍이 차지하는 메모리 (바이트, 본문 문자열 기준)"""
+    return sys.getsizeof(turn.prompt) + sys.getsizeof(turn.response)
+
+
+class ChatTranscript:
+    """세션 상태에 두는 채팅 기록
+
+    - 최근 대화는 max_turns개까지만 보관하고 넘치면 가장 오래된 것부터 버립니다
+      (화면도 보관 중인 대화만 다시 그림).
+    - 버린 대화와 이전 세션 대화는 "이전 대화 보기"를 누를 때 학습 기록에서 페이지 단위로
+      불러옵니다. 처음 누를 때 보관 중인 가장 오래된 저장 대화 시각 이전 기록부터 읽으므로
+      화면에 있는 대화와 겹치지 않습니다.
+    - 이전 대화를 불러온 뒤 최근 대화에서 밀려난 대화는 이전 대화 끝에 붙여 화면에서 빠지지
+      않게 합니다. 이전 대화는 max_earlier_turns개까지만 보관하고, 넘치면 가장 오래된 대화를
+      해제한 뒤 남은 가장 오래된 대화 이전부터 다시 불러올 수 있게 합니다.
+    - memory_bytes()로 세션이 보관 중인 본문 크기를 확인할 수 있습니다.
+    """
+
+    def __init__(self, max_turns: int = 20, max_earlier_turns: int = 100):
+        self.max_turns = max_turns
+        self.max_earlier_turns = max_earlier_turns
+        self.recent: "deque[ChatTurn]" = deque(maxlen=max_turns)
+        self.earlier: List[ChatTurn] = []  # 불러온 이전 대화 (오래된 순)
+        self.evicted = 0
+        self._earlier_cursor: Optional[str] = None
+        self._earlier_started = False
+        self._earlier_exhausted = False
+        self._cursor_before: Optional[Callable[[datetime], str]] = None
+        self._bytes = 0
+
+    def add_turn(self, prompt: str, response: str, saved: bool) -> ChatTurn:
+        """대화 추가 (보관 개수를 넘으면 가장 오래된 대화를 버림)
+
+        학습 기록 저장보다 먼저 호출해야 시각 기준으로 이전 대화와 겹치지 않습니다.
+        """
+        if len(self.recent) == self.max_turns:
+            oldest = self.recent[0]
+            self.evicted += 1
+            if self._earlier_started:
+                # 이전 대화 조회 기준 시각보다 최근이므로 이전 대화 끝에 이어 붙임
+                self.earlier.append(oldest)
+                self._trim_earlier()
+            else:
+                self._bytes -= _turn_size(oldest)
+        turn = ChatTurn(prompt, response, datetime.utcnow(), saved)
+        self.recent.append(turn)
+        self._bytes += _turn_size(turn)
+        return turn
+
+    def mark_unsaved(self, turn: ChatTurn):
+        """저장에 실패한 대화 표시 (이전 대화 조회 기준 시각에서 제외)"""
+        for turns in (self.recent, self.earlier):
+            for index, kept_turn in enumerate(turns):
+                if kept_turn is turn:
+                    turns[index] = turn._replace(saved=False)
+                    return
+
+    def turns(self) -> Iterator[ChatTurn]:
+        """화면에 표시할 대화 (불러온 이전 대화 → 최근 대화 순)"""
+        yield from self.earlier
+        yield from self.recent
+
+    def can_load_earlier(self) -> bool:
+        """불러올 이전 대화가 남아 있을 수 있는지 여부 (보관 상한에 도달하면 False)"""
+        return not self._earlier_exhausted and not self.earlier_full()
+
+    def earlier_full(self) -> bool:
+        """이전 대화 보관 상한에 도달했는지 여부"""
+        return len(self.earlier) >= self.max_earlier_turns
+
+    def load_earlier(self, load_page: Callable[..., Dict[str, Any]], user_id: int,
+                     cursor_before: Callable[[datetime], str], page_size: int = 10) -> int:
+        """이전 대화 한 페이지 불러오기, 불러온 개수 반환
+
+        load_page는 LearningService.get_chat_history_page, cursor_before는
+        LearningService.cursor_before입니다.
+        """
+        page_size = min(page_size, self.max_earlier_turns - len(self.earlier))
+        if self._earlier_exhausted or page_size <= 0:
+            return 0
+        self._cursor_before = cursor_before
+        if not self._earlier_started:
+            # 저장된 대화 중 가장 오래된 것의 시각 이전부터 조회 (없으면 최신 기록부터)
+            boundary = next((turn.timestamp for turn in self.recent if turn.saved), None)
+            self._earlier_cursor = cursor_before(boundary) if boundary else None
+            self._earlier_started = True
+
+        page = load_page(user_id, limit=page_size, cursor=self._earlier_cursor)
+        loaded = [
+            ChatTurn(record.user_message, record.ai_response or "", record.timestamp, True)
+            for record in reversed(page['items'])
+        ]
+        self.earlier[:0] = loaded
+        self._bytes += sum(_turn_size(turn) for turn in loaded)
+        self._earlier_cursor = page['next_cursor']
+        if not self._earlier_cursor:
+            self._earlier_exhausted = True
+        return len(loaded)
+
+    def _trim_earlier(self):
+        """이전 대화가 상한을 넘으면 가장 오래된 것부터 해제 (해제한 대화는 다시 불러올 수 있음)"""
+        overflow = len(self.earlier) - self.max_earlier_turns
+        if overflow <= 0:
+            return
+        self._bytes -= sum(_turn_size(turn) for turn in self.earlier[:overflow])
+        del self.earlier[:overflow]
+        self._earlier_cursor = self._cursor_before(self.earlier[0].timestamp)
+        self._earlier_exhausted = False
+
+    def hide_earlier(self):
+        """불러온 이전 대화를 메모리에서 해제 (다시 불러올 수 있음)"""
+        self._bytes -= sum(_turn_size(turn) for turn in self.earlier)
+        self.earlier = []
+        self._earlier_cursor = None
+        self._earlier_started = False
+        self._earlier_exhausted = False
+
+    def clear(self):
+        """화면의 대화 기록 초기화 (학습 기록은 유지)"""
+        self.recent.clear()
+        self.hide_earlier()
+        self.evicted = 0
+        self._bytes = 0
+
+    def memory_bytes(self) -> int:
+        """보관 중인 대화 본문 크기 (바이트)"""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self.earlier) + len(self.recent)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """세션 메모리 사용 현황"""
+        return {
+            "recent_turns": len(self.recent),
+            "max_turns": self.max_turns,
+            "earlier_turns": len(self.earlier),
+            "evicted_turns": self.evicted,
+            "memory_kb": round(self._bytes / 1024, 1),
+        }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 백엔드 비교 벤치마크 (PostgreSQL vs 내장 SQLite)
+
+같은 LearningService 코드로 각 백엔드의 저장 경로(채팅/문법 검사 저장)와
+대시보드 조회 경로(통계, 최근 활동, 일별 활동, 기록 첫 페이지)의 지연 시간을 비교합니다.
+연결할 수 없는 백엔드는 건너뜁니다.
+
+사용법:
+    python benchmarks/bench_backends.py --rows 2000 --repeat 50
+    python benchmarks/bench_backends.py --backends sqlite --sqlite-path /tmp/bench.db
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import Database
+from app.core.sqlite_backend import SqliteDatabase
+from app.services.learning_service import LearningService
+
+
+def create_bench_user(db) -> int:
+    """벤치마크용 사용자 생성"""
+    suffix = uuid.uuid4().hex[:8]
+    return db.execute_query(
+        """
+        INSERT INTO claude_integration_users (username, email, password_hash, full_name)
+        VALUES (%s, %s, 'x', 'Benchmark User')
+        RETURNING id
+        """,
+        (f"bench_backend_{suffix}", f"bench_backend_{suffix}@example.com")
+    )[0]['id']
+
+
+def time_calls(func, count: int) -> list:
+    """함수 호출 지연 시간 측정 (밀리초, 호출마다 인덱스 전달)"""
+    samples = []
+    for index in range(count):
+        started = time.perf_counter()
+        func(index)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples: list) -> str:
+    """지연 시간 요약 문자열"""
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"median {statistics.median(ordered):8.3f}ms  p95 {p95:8.3f}ms"
+
+
+def load_dashboard(service: LearningService, user_id: int):
+    """대시보드 한 화면에 필요한 조회"""
+    stats = service.get_user_stats(user_id)
+    service.get_learning_progress(user_id, stats=stats)
+    service.get_recent_activities(user_id, limit=10)
+    service.get_activity_series(user_id, days=7)
+    service.get_chat_history_page(user_id, limit=20)
+
+
+def run_backend(label: str, db, rows: int, repeat: int):
+    """백엔드 하나의 저장/조회 경로 측정"""
+    if not db.test_connection():
+        print(f"\n⚠️ {label}: 연결할 수 없어 건너뜁니다")
+        return
+    db.create_tables_if_not_exist()
+
+    service = LearningService()
+    service.db = db
+    service.write_buffer = None  # 저장 경로 자체의 지연을 측정
+
+    print(f"\n▶ {label}")
+    user_id = create_bench_user(db)
+    try:
+        saves = time_calls(
+            lambda i: service.save_chat_message(user_id, f"bench message {i}", f"bench response {i % 50}"),
+            rows
+        )
+        grammar = time_calls(
+            lambda i: service.save_grammar_check(user_id, f"bench text {i}", f"bench corrected {i % 50}"),
+            max(rows // 4, 1)
+        )
+        load_dashboard(service, user_id)  # 워밍업
+        dashboard = time_calls(lambda i: load_dashboard(service, user_id), repeat)
+        search = time_calls(lambda i: service.search_history(user_id, "bench response"), repeat)
+        print(f"  채팅 저장        : {summarize(saves)}")
+        print(f"  문법 검사 저장   : {summarize(grammar)}")
+        print(f"  대시보드 조회    : {summarize(dashboard)}")
+        print(f"  기록 검색        : {summarize(search)}")
+    finally:
+        db.execute_query("DELETE FROM claude_integration_users WHERE id = %s", (user_id,), budget='batch')
+        db.close()
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="데이터베이스 백엔드 비교 벤치마크")
+    parser.add_argument("--backends", nargs="+", choices=("postgres", "sqlite"),
+                        default=["postgres", "sqlite"], help="비교할 백엔드")
+    parser.add_argument("--rows", type=int, default=2000, help="저장 경로 측정 횟수 (채팅 저장 기준)")
+    parser.add_argument("--repeat", type=int, default=50, help="조회 경로 측정 반복 횟수")
+    parser.add_argument("--sqlite-path", help="SQLite 파일 경로 (기본: 임시 파일)")
+    args = parser.parse_args()
+
+    print("🏁 데이터베이스 백엔드 비교 벤치마크")
+    print("=" * 60)
+    for backend in args.backends:
+        if backend == "postgres":
+            run_backend("PostgreSQL", Database(), args.rows, args.repeat)
+            continue
+        path = args.sqlite_path or os.path.join(tempfile.mkdtemp(prefix="wq_bench_"), "bench.db")
+        run_backend(f"SQLite ({path})", SqliteDatabase(path), args.rows, args.repeat)
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+대시보드 데이터 조회 벤치마크 (순차 조회 vs PageDataLoader 동시 조회)
+
+대시보드에 필요한 통계, 기간별 활동, 최근 활동 조회를 순서대로 실행할 때와
+PageDataLoader로 동시에 실행할 때의 화면당 조회 시간을 비교합니다.
+통계 캐시는 끄고 매번 DB에서 조회합니다.
+
+사용법:
+    python benchmarks/bench_page_loader.py --days 30 --repeat 50
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import get_db
+from app.core.stats_cache import StatsCache
+from app.services.learning_service import LearningService
+from app.services.page_loader import PageDataLoader
+
+
+def create_bench_user(db, service: LearningService, records: int) -> int:
+    """벤치마크용 사용자와 학습 기록 생성"""
+    suffix = uuid.uuid4().hex[:8]
+    user_id = db.execute_query(
+        """
+        INSERT INTO claude_integration_users (username, email, password_hash, full_name)
+        VALUES (%s, %s, 'x', 'Benchmark User')
+        RETURNING id
+        """,
+        (f"bench_loader_{suffix}", f"bench_loader_{suffix}@example.com")
+    )[0]['id']
+    for index in range(records):
+        service.save_chat_message(user_id, f"bench message {index}", f"bench response {index % 20}")
+    return user_id
+
+
+def time_calls(func, repeat: int) -> list:
+    """함수 호출 지연 시간 측정 (밀리초)"""
+    func()  # 워밍업
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples: list) -> str:
+    """지연 시간 요약 문자열"""
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"median {statistics.median(ordered):8.2f}ms  p95 {p95:8.2f}ms"
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="대시보드 데이터 조회 벤치마크")
+    parser.add_argument("--records", type=int, default=200, help="생성할 학습 기록 수")
+    parser.add_argument("--days", type=int, default=30, help="기간별 활동 조회 일수")
+    parser.add_argument("--repeat", type=int, default=50, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    db = get_db()
+    if not db.test_connection():
+        print("❌ 데이터베이스 연결 실패")
+        return False
+    db.create_tables_if_not_exist()
+
+    service = LearningService()
+    service.stats_cache = StatsCache()  # 캐시 없이 매번 조회
+    service.write_buffer = None
+
+    def sequential():
+        service.get_user_stats(user_id)
+        service.get_activity_series(user_id, days=args.days)
+        service.get_recent_activities(user_id, limit=10)
+
+    def concurrent():
+        loader = PageDataLoader()
+        loader.submit(service.get_user_stats, user_id)
+        loader.submit(service.get_activity_series, user_id, days=args.days)
+        loader.submit(service.get_recent_activities, user_id, limit=10)
+        loader.get(service.get_user_stats, user_id)
+        loader.get(service.get_activity_series, user_id, days=args.days)
+        loader.get(service.get_recent_activities, user_id, limit=10)
+
+    print("⚡ 대시보드 데이터 조회 벤치마크")
+    print("=" * 60)
+    user_id = create_bench_user(db, service, args.records)
+    try:
+        print(f"  순차 조회        : {summarize(time_calls(sequential, args.repeat))}")
+        print(f"  동시 조회 (로더) : {summarize(time_calls(concurrent, args.repeat))}")
+    finally:
+        db.execute_query("DELETE FROM claude_integration_users WHERE id = %s", (user_id,), budget='batch')
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
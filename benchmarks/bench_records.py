@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+학습 기록 행 타입 벤치마크
+
+같은 기록 페이지를 기존 방식(RealDictCursor 딕셔너리 → 딕셔너리 복사 + 행마다 날짜 형식 변환)과
+튜플 커서 + 레코드 타입(화면에 그릴 때 날짜 형식 변환) 방식으로 읽어
+1만 행당 CPU 시간과 메모리(결과 보관 크기, 최대 할당량)를 비교합니다.
+
+사용법:
+    python benchmarks/bench_records.py --rows 10000 --repeat 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import get_db
+from app.services.records import GrammarCheckRecord, format_kst
+
+PAGE_QUERY = """
+SELECT id, original_text, corrected_text, created_at
+FROM claude_integration_grammar_checks
+WHERE user_id = %s
+ORDER BY created_at DESC, id DESC
+LIMIT %s
+"""
+
+
+def create_bench_user(db, rows: int) -> int:
+    """벤치마크용 사용자와 문법 검사 기록 생성"""
+    suffix = uuid.uuid4().hex[:8]
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO claude_integration_users (username, email, password_hash, full_name)
+            VALUES (%s, %s, 'x', 'Benchmark User')
+            RETURNING id
+            """,
+            (f"bench_records_{suffix}", f"bench_records_{suffix}@example.com")
+        )
+        user_id = cursor.fetchone()['id']
+    db.execute_query(
+        """
+        INSERT INTO claude_integration_grammar_checks (user_id, original_text, corrected_text, created_at)
+        SELECT %s, 'bench text ' || g, 'bench corrected sentence number ' || g,
+               NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, %s) AS g
+        """,
+        (user_id, rows),
+        budget='batch'
+    )
+    return user_id
+
+
+def load_dicts(db, user_id: int, rows: int) -> list:
+    """기존 방식: 딕셔너리 행을 다시 딕셔너리로 복사하며 날짜 형식 변환"""
+    return [
+        {
+            'id': row['id'],
+            'original_text': row['original_text'],
+            'corrected_text': row['corrected_text'],
+            'created_at': format_kst(row['created_at'])
+        }
+        for row in db.execute_query(PAGE_QUERY, (user_id, rows))
+    ]
+
+
+def load_records(db, user_id: int, rows: int) -> list:
+    """튜플 커서 + 레코드 타입"""
+    return db.execute_query(PAGE_QUERY, (user_id, rows), row_type=GrammarCheckRecord)
+
+
+def render(items: list) -> int:
+    """화면 출력과 같은 필드 접근 (날짜 표시 문자열 포함)"""
+    total = 0
+    for item in items:
+        total += len(f"{item['created_at']} {item['original_text']} {item['corrected_text']}")
+    return total
+
+
+def measure(load, render_items: bool, repeat: int) -> dict:
+    """CPU 시간(ms)과 메모리(KB) 측정"""
+    load()  # 워밍업
+    cpu = []
+    for _ in range(repeat):
+        started = time.process_time()
+        items = load()
+        if render_items:
+            render(items)
+        cpu.append((time.process_time() - started) * 1000)
+
+    tracemalloc.start()
+    items = load()
+    retained, _ = tracemalloc.get_traced_memory()
+    if render_items:
+        render(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'rows': len(items),
+        'cpu_ms': statistics.median(cpu),
+        'retained_kb': retained / 1024,
+        'peak_kb': peak / 1024,
+    }
+
+
+def report(label: str, result: dict):
+    """1만 행 기준으로 환산해 출력"""
+    scale = 10000 / max(result['rows'], 1)
+    print(f"  {label:<22}: CPU {result['cpu_ms'] * scale:8.2f}ms  "
+          f"보관 {result['retained_kb'] * scale:9.1f}KB  최대 {result['peak_kb'] * scale:9.1f}KB")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="학습 기록 행 타입 벤치마크")
+    parser.add_argument("--rows", type=int, default=10000, help="읽을 기록 행 수")
+    parser.add_argument("--repeat", type=int, default=10, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    db = get_db()
+    if not db.test_connection():
+        print("❌ 데이터베이스 연결 실패")
+        return False
+    db.create_tables_if_not_exist()
+
+    print("🧮 학습 기록 행 타입 벤치마크 (1만 행 기준)")
+    print("=" * 60)
+    print(f"\n▶ {args.rows:,}행 데이터 생성 중...")
+    user_id = create_bench_user(db, args.rows)
+    try:
+        for render_items, title in ((False, "조회만"), (True, "조회 + 화면 출력")):
+            print(f"\n  [{title}]")
+            report("딕셔너리 (기존)", measure(lambda: load_dicts(db, user_id, args.rows), render_items, args.repeat))
+            report("튜플 + 레코드 타입", measure(lambda: load_records(db, user_id, args.rows), render_items, args.repeat))
+    finally:
+        db.execute_query("DELETE FROM claude_integration_users WHERE id = %s", (user_id,), budget='batch')
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+학습 기록 전문 검색 벤치마크
+
+채팅/문법 검사 기록 말뭉치(기본 100만 행)를 생성한 뒤
+ILIKE 순차 검색과 tsvector + GIN 기반 LearningService.search_history의
+지연 시간을 검색어별로 비교합니다.
+
+사용법:
+    python benchmarks/bench_search.py --rows 1000000 --users 100 --repeat 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import get_db
+from app.services.learning_service import LearningService
+
+SEARCH_TERMS = ["present perfect", "irregular verbs", "관계대명사", "subjunctive mood"]
+
+ILIKE_QUERY = """
+SELECT 'chat' AS record_type, id, created_at
+FROM claude_integration_chat_messages
+WHERE user_id = %(user_id)s
+AND (user_message ILIKE %(pattern)s OR ai_response ILIKE %(pattern)s)
+UNION ALL
+SELECT 'grammar_check', id, created_at
+FROM claude_integration_grammar_checks
+WHERE user_id = %(user_id)s
+AND (original_text ILIKE %(pattern)s OR corrected_text ILIKE %(pattern)s)
+ORDER BY created_at DESC
+LIMIT 10
+"""
+
+# 말뭉치 문장 조각 (검색어가 일부 행에만 등장하도록 구성)
+CORPUS_PHRASES = """
+ARRAY[
+    'How do I use the present perfect tense with since and for?',
+    'Can you explain irregular verbs like go went gone?',
+    '관계대명사 which와 that의 차이를 알려주세요',
+    'When should I use the subjunctive mood in English?',
+    'Please check my sentence about yesterday''s meeting.',
+    'What is the difference between affect and effect?',
+    'I goes to school every day.',
+    'She have been working here for three years.',
+    '영어 이메일을 자연스럽게 고쳐 주세요',
+    'Is this paragraph grammatically correct?'
+]
+"""
+
+
+def create_corpus(db, rows: int, users: int) -> list:
+    """벤치마크용 사용자와 검색 말뭉치 생성 (서버 측 generate_series 사용)"""
+    suffix = uuid.uuid4().hex[:8]
+    user_ids = []
+    with db.get_cursor() as cursor:
+        for index in range(users):
+            cursor.execute(
+                """
+                INSERT INTO claude_integration_users (username, email, password_hash, full_name)
+                VALUES (%s, %s, 'x', 'Benchmark User')
+                RETURNING id
+                """,
+                (f"bench_search_{suffix}_{index}", f"bench_search_{suffix}_{index}@example.com")
+            )
+            user_ids.append(cursor.fetchone()['id'])
+
+    per_table = rows // 2
+    seed_queries = [
+        f"""
+        INSERT INTO claude_integration_chat_messages (user_id, user_message, ai_response, created_at)
+        SELECT (%(user_ids)s::INTEGER[])[1 + g %% %(users)s],
+               ({CORPUS_PHRASES})[1 + (g * 7) %% 10] || ' #' || g,
+               'Explanation ' || g || ': ' || ({CORPUS_PHRASES})[1 + (g * 3) %% 10],
+               NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, %(rows)s) AS g
+        """,
+        f"""
+        INSERT INTO claude_integration_grammar_checks (user_id, original_text, corrected_text, created_at)
+        SELECT (%(user_ids)s::INTEGER[])[1 + g %% %(users)s],
+               ({CORPUS_PHRASES})[1 + (g * 11) %% 10] || ' #' || g,
+               'Corrected ' || g || ': ' || ({CORPUS_PHRASES})[1 + (g * 5) %% 10],
+               NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, %(rows)s) AS g
+        """,
+    ]
+    for query in seed_queries:
+        db.execute_query(query, {'user_ids': user_ids, 'users': users, 'rows': per_table}, budget='batch')
+    db.execute_query("ANALYZE claude_integration_chat_messages", budget='batch')
+    db.execute_query("ANALYZE claude_integration_grammar_checks", budget='batch')
+    return user_ids
+
+
+def time_calls(func, repeat: int) -> list:
+    """함수 호출 지연 시간 측정 (밀리초)"""
+    func()  # 워밍업
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples: list) -> str:
+    """지연 시간 요약 문자열"""
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"median {statistics.median(ordered):8.2f}ms  p95 {p95:8.2f}ms"
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="학습 기록 전문 검색 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000000, help="말뭉치 전체 행 수 (채팅/문법 검사 절반씩)")
+    parser.add_argument("--users", type=int, default=100, help="행을 나눠 가질 사용자 수")
+    parser.add_argument("--repeat", type=int, default=20, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    db = get_db()
+    if not db.test_connection():
+        print("❌ 데이터베이스 연결 실패")
+        return False
+    db.create_tables_if_not_exist()
+    service = LearningService()
+
+    print("🔍 학습 기록 전문 검색 벤치마크")
+    print("=" * 60)
+    print(f"\n▶ {args.rows:,}행 말뭉치 생성 중 (사용자 {args.users}명)...")
+    user_ids = create_corpus(db, args.rows, args.users)
+    user_id = user_ids[0]
+    try:
+        for term in SEARCH_TERMS:
+            ilike = time_calls(
+                lambda: db.execute_query(ILIKE_QUERY, {'user_id': user_id, 'pattern': f"%{term}%"}, budget='batch'),
+                args.repeat
+            )
+            fts = time_calls(lambda: service.search_history(user_id, term, limit=10), args.repeat)
+            hits = len(service.search_history(user_id, term, limit=10)['items'])
+            print(f"\n  검색어: {term!r} (상위 {hits}건)")
+            print(f"    ILIKE 순차 검색    : {summarize(ilike)}")
+            print(f"    tsvector + GIN     : {summarize(fts)}")
+    finally:
+        db.execute_query("DELETE FROM claude_integration_users WHERE id = ANY(%s)", (user_ids,), budget='batch')
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+서비스 인스턴스 재사용 벤치마크
+
+Streamlit은 상호작용마다 스크립트를 다시 실행합니다. 기존처럼 재실행마다 서비스를
+새로 만드는 경우와 프로세스 단위 서비스(get_services)를 재사용하는 경우의
+재실행당 준비 시간과, AI API 호출 지연(재실행마다 새 HTTP 연결 vs 연결 재사용)을 비교합니다.
+AI API는 로컬 HTTP 서버로 대체하므로 API 키나 네트워크가 필요 없습니다.
+
+사용법:
+    python benchmarks/bench_service_factories.py --repeat 200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.ai_service import AIService
+from app.services.auth_service import AuthService
+from app.services.export_service import ExportService
+from app.services.factory import close_services, get_services
+from app.services.learning_service import LearningService
+
+COMPLETION = json.dumps({"choices": [{"message": {"content": "bench answer"}}]}).encode()
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    """chat/completions 응답을 흉내 내는 keep-alive 핸들러"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def time_calls(func, repeat: int) -> list:
+    """함수 호출 지연 시간 측정 (밀리초)"""
+    func()  # 워밍업
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples: list) -> str:
+    """지연 시간 요약 문자열"""
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"median {statistics.median(ordered):8.3f}ms  p95 {p95:8.3f}ms"
+
+
+def build_services():
+    """기존 방식: 재실행마다 서비스 생성"""
+    return AuthService(), AIService(), LearningService(), ExportService()
+
+
+def local_ai_service(base_url: str) -> AIService:
+    """로컬 서버를 호출하는 AI 서비스"""
+    service = AIService()
+    service.openai_api_key = "bench"
+    service.openai_available = True
+    service.openai_base_url = base_url
+    return service
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="서비스 인스턴스 재사용 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CompletionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print("♻️ 서비스 인스턴스 재사용 벤치마크")
+    print("=" * 60)
+    try:
+        print("\n  [재실행당 서비스 준비]")
+        print(f"  재실행마다 생성  : {summarize(time_calls(build_services, args.repeat))}")
+        print(f"  get_services     : {summarize(time_calls(get_services, args.repeat))}")
+
+        def fresh_call():
+            service = local_ai_service(base_url)
+            service.get_response("hello")
+            service.close()
+
+        shared = local_ai_service(base_url)
+        print("\n  [AI API 호출 (로컬 서버)]")
+        print(f"  재실행마다 새 연결 : {summarize(time_calls(fresh_call, args.repeat))}")
+        print(f"  연결 재사용        : {summarize(time_calls(lambda: shared.get_response('hello'), args.repeat))}")
+        shared.close()
+    finally:
+        server.shutdown()
+        close_services()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
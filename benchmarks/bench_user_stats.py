@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+사용자 학습 통계 조회 벤치마크
+
+기존 5회 쿼리 방식, 단일 집계 쿼리 방식, 카운터 테이블 조회 방식
+(LearningService.get_user_stats)의 지연 시간을 사용자당 행 수
+(기본 1만/100만)별로 비교합니다.
+
+사용법:
+    python benchmarks/bench_user_stats.py --rows 10000 1000000 --repeat 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import get_db
+from app.services.learning_service import LearningService
+
+LEGACY_QUERIES = [
+    "SELECT COUNT(*) as count FROM claude_integration_chat_messages WHERE user_id = %s",
+    "SELECT COUNT(*) as count FROM claude_integration_grammar_checks WHERE user_id = %s",
+    "SELECT COUNT(*) as count FROM claude_integration_vocabulary_checks WHERE user_id = %s",
+    "SELECT COUNT(*) as count FROM claude_integration_learning_activities WHERE user_id = %s",
+    "SELECT MIN(created_at) as first_date FROM claude_integration_learning_activities WHERE user_id = %s",
+]
+
+AGGREGATED_QUERY = """
+SELECT
+    (SELECT COUNT(*) FROM claude_integration_chat_messages WHERE user_id = %(user_id)s) AS total_chats,
+    (SELECT COUNT(*) FROM claude_integration_grammar_checks WHERE user_id = %(user_id)s) AS grammar_checks,
+    (SELECT COUNT(*) FROM claude_integration_vocabulary_checks WHERE user_id = %(user_id)s) AS vocabulary_checks,
+    activities.total_activities,
+    activities.first_date
+FROM (
+    SELECT COUNT(*) AS total_activities, MIN(created_at) AS first_date
+    FROM claude_integration_learning_activities
+    WHERE user_id = %(user_id)s
+) AS activities
+"""
+
+
+def create_bench_user(db, rows: int) -> int:
+    """벤치마크용 사용자와 학습 데이터 생성 (서버 측 generate_series 사용)"""
+    suffix = uuid.uuid4().hex[:8]
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO claude_integration_users (username, email, password_hash, full_name)
+            VALUES (%s, %s, 'x', 'Benchmark User')
+            RETURNING id
+            """,
+            (f"bench_{suffix}", f"bench_{suffix}@example.com")
+        )
+        user_id = cursor.fetchone()['id']
+
+    seed_queries = [
+        """
+        INSERT INTO claude_integration_chat_messages (user_id, user_message, ai_response, created_at)
+        SELECT %s, 'bench message ' || g, 'bench response ' || g,
+               NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, %s) AS g
+        """,
+        """
+        INSERT INTO claude_integration_grammar_checks (user_id, original_text, corrected_text, created_at)
+        SELECT %s, 'bench text ' || g, 'bench corrected ' || g,
+               NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, %s) AS g
+        """,
+        """
+        INSERT INTO claude_integration_vocabulary_checks (user_id, original_text, analysis_result, created_at)
+        SELECT %s, 'bench text ' || g, 'bench analysis ' || g,
+               NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, %s) AS g
+        """,
+        """
+        INSERT INTO claude_integration_learning_activities (user_id, activity_type, description, created_at)
+        SELECT %s, 'chat', 'bench activity ' || g,
+               NOW() - (g || ' seconds')::interval
+        FROM generate_series(1, %s) AS g
+        """,
+    ]
+    for query in seed_queries:
+        db.execute_query(query, (user_id, rows), budget='batch')
+    db.execute_query("ANALYZE", budget='batch')
+    return user_id
+
+
+def time_calls(func, repeat: int) -> list:
+    """함수 호출 지연 시간 측정 (밀리초)"""
+    func()  # 워밍업
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples: list) -> str:
+    """지연 시간 요약 문자열"""
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"median {statistics.median(ordered):8.2f}ms  p95 {p95:8.2f}ms"
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="사용자 학습 통계 조회 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 1000000],
+                        help="사용자당 테이블별 행 수")
+    parser.add_argument("--repeat", type=int, default=20, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    db = get_db()
+    if not db.test_connection():
+        print("❌ 데이터베이스 연결 실패")
+        return False
+    db.create_tables_if_not_exist()
+    service = LearningService()
+
+    print("📊 사용자 학습 통계 조회 벤치마크")
+    print("=" * 60)
+    for rows in args.rows:
+        print(f"\n▶ 사용자당 {rows:,}행 데이터 생성 중...")
+        user_id = create_bench_user(db, rows)
+        try:
+            legacy = time_calls(
+                lambda: [db.execute_query(query, (user_id,), budget='batch') for query in LEGACY_QUERIES],
+                args.repeat
+            )
+            aggregated = time_calls(
+                lambda: db.execute_query(AGGREGATED_QUERY, {'user_id': user_id}, budget='batch'),
+                args.repeat
+            )
+            counters = time_calls(lambda: service.get_user_stats(user_id), args.repeat)
+            print(f"  기존 (5회 쿼리)   : {summarize(legacy)}")
+            print(f"  단일 집계 쿼리    : {summarize(aggregated)}")
+            print(f"  카운터 테이블 조회 : {summarize(counters)}")
+        finally:
+            db.execute_query("DELETE FROM claude_integration_users WHERE id = %s", (user_id,), budget='batch')
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+WordQuest Claude Integration - 데이터베이스 관리 도구
+
+사용법:
+    python db_tools.py migrate [--status]
+    python db_tools.py rebuild-counters [--user-id USER_ID]
+    python db_tools.py rebuild-rollup [--user-id USER_ID]
+    python db_tools.py backfill-activities [--user-id USER_ID]
+    python db_tools.py partitions [--archive] [--retention-months N] [--archive-dir DIR]
+    python db_tools.py export --user-id USER_ID [--format ndjson|csv] [--gzip] [--output PATH]
+    python db_tools.py import KIND CSV_PATH [--batch-size N] [--on-conflict skip|error]
+    python db_tools.py gc-blobs [--grace-minutes N]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# SQLite 백엔드에서 지원하지 않는 작업 (파티션, COPY 사용)
+SQLITE_UNSUPPORTED = {
+    "partitions --archive": "파티션 아카이브",
+    "import": "CSV 대량 가져오기",
+}
+
+
+def unsupported_on_backend(db, command: str) -> bool:
+    """현재 백엔드에서 지원하지 않는 작업이면 안내를 출력하고 True 반환"""
+    if getattr(db, "backend", None) != "sqlite" or command not in SQLITE_UNSUPPORTED:
+        return False
+    print(f"❌ sqlite 백엔드에서는 지원하지 않는 작업입니다: {SQLITE_UNSUPPORTED[command]} ({command}). "
+          f"DATABASE_BACKEND=postgres에서 실행하세요.")
+    return True
+
+
+def migrate(db, args) -> bool:
+    """스키마 마이그레이션 적용 또는 상태 출력"""
+    if args.status:
+        for migration in db.get_migration_status():
+            mark = "✅" if migration['applied'] else "⏳"
+            applied_at = migration['applied_at'] or "-"
+            print(f"{mark} {migration['version']:04d}_{migration['name']}  ({applied_at})")
+        return True
+
+    # 데이터가 있는 테이블을 다시 쓰는 오프라인 마이그레이션도 여기서만 적용
+    applied = db.create_tables_if_not_exist(allow_offline=True)
+    if applied:
+        print(f"✅ 마이그레이션 적용 완료: {applied}")
+    else:
+        print("✅ 적용할 마이그레이션이 없습니다.")
+    return True
+
+
+def rebuild_counters(db, args) -> bool:
+    """사용자별 학습 카운터 재구축 (백필)"""
+    db.create_tables_if_not_exist()
+    target = f"사용자 {args.user_id}" if args.user_id else "전체 사용자"
+    print(f"🔄 {target}의 학습 카운터를 재구축합니다...")
+    rebuilt = db.rebuild_user_learning_counters(args.user_id)
+    print(f"✅ 학습 카운터 재구축 완료: {rebuilt}명")
+    return True
+
+
+def rebuild_rollup(db, args) -> bool:
+    """일별 활동 집계 재구축"""
+    db.create_tables_if_not_exist()
+    target = f"사용자 {args.user_id}" if args.user_id else "전체 사용자"
+    print(f"🔄 {target}의 일별 활동 집계를 재구축합니다...")
+    rebuilt = db.rebuild_daily_activity_rollup(args.user_id)
+    print(f"✅ 일별 활동 집계 재구축 완료: {rebuilt}행")
+    return True
+
+
+def backfill_activities(db, args) -> bool:
+    """학습 활동 기록이 없는 사용자의 활동 백필"""
+    db.create_tables_if_not_exist()
+    target = f"사용자 {args.user_id}" if args.user_id else "전체 사용자"
+    print(f"🔄 {target}의 학습 활동을 백필합니다...")
+    backfilled = db.backfill_learning_activities(args.user_id)
+    print(f"✅ 학습 활동 백필 완료: {backfilled}건")
+    return True
+
+
+def partitions(db, args) -> bool:
+    """월 파티션 사전 생성 및 보존 기간 초과 파티션 아카이브"""
+    if args.archive and unsupported_on_backend(db, "partitions --archive"):
+        return False
+    db.create_tables_if_not_exist()
+    print("✅ 향후 월 파티션 확인 완료")
+    if args.archive:
+        archived = db.archive_expired_partitions(args.retention_months, args.archive_dir)
+        for item in archived:
+            print(f"📦 {item['partition']} -> {item['path']}")
+        print(f"✅ 파티션 아카이브 완료: {len(archived)}개")
+    return True
+
+
+def export(db, args) -> bool:
+    """사용자 학습 기록 내보내기 (파일 또는 표준 출력으로 스트리밍)"""
+    from app.services.export_service import ExportService
+    export_service = ExportService()
+
+    if args.output:
+        written = export_service.export_to_file(args.user_id, args.output, fmt=args.format, compress=args.gzip)
+        print(f"✅ 내보내기 완료: {args.output} ({written} bytes)", file=sys.stderr)
+        return True
+
+    for chunk in export_service.iter_export(args.user_id, fmt=args.format, compress=args.gzip):
+        sys.stdout.buffer.write(chunk)
+    sys.stdout.buffer.flush()
+    return True
+
+
+def import_data(db, args) -> bool:
+    """CSV 대량 가져오기 (users를 먼저 가져온 뒤 학습 기록을 가져옴)"""
+    from app.services.import_service import ImportService
+
+    if unsupported_on_backend(db, "import"):
+        return False
+
+    def report(progress):
+        print(
+            f"  ... {progress['processed']}행 처리 (추가 {progress['inserted']}, "
+            f"건너뜀 {progress['skipped']}, 거부 {progress['rejected']})",
+            flush=True
+        )
+
+    db.create_tables_if_not_exist()
+    import_service = ImportService(batch_size=args.batch_size, on_conflict=args.on_conflict, progress=report)
+    print(f"📥 {args.kind} 가져오기 시작: {args.path}")
+    summary = import_service.import_csv(args.kind, args.path)
+    for error in summary['errors']:
+        print(f"  ⚠️ {error['line']}행: {error['error']}")
+    print(
+        f"✅ 가져오기 완료: 처리 {summary['processed']} / 추가 {summary['inserted']} / "
+        f"건너뜀 {summary['skipped']} / 거부 {summary['rejected']}"
+    )
+    return True
+
+
+def gc_blobs(db, args) -> bool:
+    """참조되지 않는 본문 블롭 정리"""
+    db.create_tables_if_not_exist()
+    result = db.collect_content_blobs(args.grace_minutes)
+    print(f"✅ 본문 블롭 정리 완료: 참조 수 보정 {result['recounted']}건, 삭제 {result['deleted']}건")
+    return True
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """명령행 파서 생성"""
+    parser = argparse.ArgumentParser(description="WordQuest 데이터베이스 관리 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="스키마 마이그레이션 적용")
+    migrate_parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    migrate_parser.set_defaults(handler=migrate)
+
+    counters_parser = subparsers.add_parser("rebuild-counters", help="사용자별 학습 카운터 재구축/백필")
+    counters_parser.add_argument("--user-id", type=int, default=None, help="특정 사용자만 재구축")
+    counters_parser.set_defaults(handler=rebuild_counters)
+
+    rollup_parser = subparsers.add_parser("rebuild-rollup", help="일별 활동 집계 재구축")
+    rollup_parser.add_argument("--user-id", type=int, default=None, help="특정 사용자만 재구축")
+    rollup_parser.set_defaults(handler=rebuild_rollup)
+
+    backfill_parser = subparsers.add_parser("backfill-activities", help="학습 활동 기록이 없는 사용자의 활동 백필")
+    backfill_parser.add_argument("--user-id", type=int, default=None, help="특정 사용자만 백필")
+    backfill_parser.set_defaults(handler=backfill_activities)
+
+    partitions_parser = subparsers.add_parser("partitions", help="월 파티션 사전 생성/보존 기간 초과분 아카이브")
+    partitions_parser.add_argument("--archive", action="store_true", help="보존 기간이 지난 파티션 아카이브")
+    partitions_parser.add_argument("--retention-months", type=int, default=None, help="보존 개월 수 (기본: 설정값)")
+    partitions_parser.add_argument("--archive-dir", default=None, help="아카이브 파일 저장 경로 (기본: 설정값)")
+    partitions_parser.set_defaults(handler=partitions)
+
+    export_parser = subparsers.add_parser("export", help="사용자 학습 기록 내보내기 (NDJSON/CSV)")
+    export_parser.add_argument("--user-id", type=int, required=True, help="내보낼 사용자 ID")
+    export_parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="출력 형식")
+    export_parser.add_argument("--gzip", action="store_true", help="gzip 압축")
+    export_parser.add_argument("--output", default=None, help="출력 파일 (기본: 표준 출력)")
+    export_parser.set_defaults(handler=export)
+
+    import_parser = subparsers.add_parser("import", help="CSV 대량 가져오기 (COPY)")
+    import_parser.add_argument("kind", choices=["users", "chat_messages", "grammar_checks",
+                                                "vocabulary_checks", "learning_activities"],
+                               help="가져올 대상")
+    import_parser.add_argument("path", help="헤더가 있는 CSV 파일 (학습 기록은 username 컬럼으로 사용자 연결)")
+    import_parser.add_argument("--batch-size", type=int, default=50000, help="배치당 행 수")
+    import_parser.add_argument("--on-conflict", choices=["skip", "error"], default="skip",
+                               help="중복 처리: skip(건너뜀) | error(배치 실패)")
+    import_parser.set_defaults(handler=import_data)
+
+    gc_parser = subparsers.add_parser("gc-blobs", help="참조되지 않는 본문 블롭 정리")
+    gc_parser.add_argument("--grace-minutes", type=int, default=60, help="이 시간보다 최근 블롭은 유지")
+    gc_parser.set_defaults(handler=gc_blobs)
+
+    return parser
+
+
+def main():
+    """메인 실행 함수"""
+    args = build_parser().parse_args()
+
+    from app.core.database import get_db
+    db = get_db()
+
+    try:
+        if not db.test_connection():
+            print("❌ 데이터베이스 연결 실패")
+            return False
+        return args.handler(db, args)
+    except Exception as e:
+        print(f"❌ 작업 실패: {e}")
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -8,6 +8,7 @@ import streamlit as st
 import os
 import sys
 import logging
+import time
 from pathlib import Path
 
 # 로깅 설정
@@ -51,13 +52,20 @@ if 'debug_mode' not in st.session_state:
 
 # 서비스 import
 try:
-    from app.services.auth_service import AuthService
-    from app.services.ai_service import AIService
-    from app.services.learning_service import LearningService
-    auth_service = AuthService()
-    ai_service = AIService()
-    learning_service = LearningService()
-    logger.info("✅ 모든 서비스 모듈을 성공적으로 불러왔습니다.")
+    from app.services.factory import get_services
+    from app.services.page_loader import PageDataLoader
+    from app.services.transcript import ChatTranscript
+
+    @st.cache_resource(show_spinner=False)
+    def load_services():
+        """서비스 인스턴스 (재실행마다 새로 만들지 않고 모든 세션이 공유)"""
+        return get_services()
+
+    services = load_services()
+    auth_service = services.auth
+    ai_service = services.ai
+    learning_service = services.learning
+    export_service = services.export
 except ImportError as e:
     error_msg = f"❌ 서비스 모듈을 불러올 수 없습니다: {e}"
     logger.error(error_msg)
@@ -66,6 +74,7 @@ except ImportError as e:
 
 def main():
     """메인 애플리케이션 함수"""
+    started = time.perf_counter()
     try:
         st.title("🎓 영어 학습 AI 시스템")
         st.markdown("---")
@@ -90,6 +99,9 @@ def main():
         st.error(error_msg)
         if st.session_state.debug_mode:
             st.exception(e)
+    finally:
+        # 스크립트 재실행 시간 (디버그 정보에 직전 값 표시)
+        st.session_state.last_rerun_ms = (time.perf_counter() - started) * 1000
 
 def show_debug_info():
     """디버그 정보 표시"""
@@ -103,6 +115,21 @@ def show_debug_info():
         "current_page": st.session_state.current_page,
         "debug_mode": st.session_state.debug_mode
     })
+    if 'last_rerun_ms' in st.session_state:
+        st.sidebar.markdown(f"**직전 재실행 시간**: {st.session_state.last_rerun_ms:.1f}ms")
+    if 'transcript' in st.session_state:
+        transcript_stats = st.session_state.transcript.get_stats()
+        st.sidebar.markdown(
+            f"**채팅 기록 메모리**: {transcript_stats['memory_kb']}KB "
+            f"(최근 {transcript_stats['recent_turns']}/{transcript_stats['max_turns']}, "
+            f"이전 {transcript_stats['earlier_turns']}, 버림 {transcript_stats['evicted_turns']})"
+        )
+    if 'last_page_load' in st.session_state:
+        page_load = st.session_state.last_page_load
+        st.sidebar.markdown(
+            f"**직전 페이지 조회**: 경과 {page_load['elapsed_ms']}ms "
+            f"(조회 {page_load['calls']}건 합계 {page_load['query_ms_sum']}ms, 중복 제거 {page_load['deduplicated']}건)"
+        )
     
     # 서비스 상태 확인
     try:
@@ -110,7 +137,50 @@ def show_debug_info():
         st.sidebar.markdown(f"**DB 상태**: {db_status}")
     except:
         st.sidebar.markdown("**DB 상태**: 확인 불가")
-    
+
+    # DB 계측 정보
+    try:
+        db_metrics = learning_service.db.get_metrics_snapshot(top=5)
+        pool = db_metrics['pool']
+        st.sidebar.markdown(
+            f"**DB 풀**: 사용 중 {pool['in_use']} / 유휴 {pool['idle']} "
+            f"(대기 평균 {pool['checkout_wait_avg_ms']}ms, 최대 {pool['checkout_wait_max_ms']}ms)"
+        )
+        st.sidebar.markdown(f"**슬로우 쿼리**: {len(db_metrics['slow_queries'])}건 (≥ {db_metrics['slow_query_threshold_ms']}ms)")
+        if 'replication' in db_metrics:
+            replication = db_metrics['replication']
+            healthy = sum(1 for replica in replication['replicas'] if replica['healthy'])
+            st.sidebar.markdown(
+                f"**읽기 복제본**: 정상 {healthy}/{len(replication['replicas'])} "
+                f"(복제본 읽기 {replication['replica_reads']} / 프라이머리 대체 {replication['primary_fallbacks']})"
+            )
+        with st.sidebar.expander("쿼리 계측 (상위 5개)"):
+            st.json(db_metrics['queries'])
+            if db_metrics['slow_queries']:
+                st.markdown("**슬로우 쿼리 로그**")
+                st.json(db_metrics['slow_queries'][-10:])
+            if db_metrics['explains']:
+                st.markdown("**EXPLAIN 샘플**")
+                st.json(db_metrics['explains'][-3:])
+    except:
+        st.sidebar.markdown("**DB 계측**: 확인 불가")
+
+    # write-behind 버퍼 상태
+    if learning_service.write_buffer:
+        wb_stats = learning_service.write_buffer.get_stats()
+        st.sidebar.markdown(
+            f"**저장 대기열**: {wb_stats['queued']}건 "
+            f"(저장 {wb_stats['flushed']} / 재시도 {wb_stats['pending_retry']} / 실패 {wb_stats['failures']}"
+            f" / 건너뜀 {wb_stats['dead_lettered']})"
+        )
+
+    # 통계 캐시 상태
+    cache_stats = learning_service.stats_cache.get_stats()
+    st.sidebar.markdown(
+        f"**통계 캐시** ({cache_stats['backend']}): 적중률 {cache_stats['hit_ratio']:.0%} "
+        f"(적중 {cache_stats['hits']} / 조회 {cache_stats['misses']} / 무효화 {cache_stats['invalidations']})"
+    )
+
     # API 상태 확인
     try:
         api_status = ai_service.get_api_status()
@@ -385,19 +455,42 @@ def show_chat_page():
     try:
         st.header("💬 AI 채팅")
         
-        # 채팅 히스토리 초기화
-        if "messages" not in st.session_state:
-            st.session_state.messages = []
+        # 채팅 기록 초기화 (최근 대화만 세션에 보관)
+        if "transcript" not in st.session_state:
+            st.session_state.transcript = ChatTranscript(
+                max_turns=settings.CHAT_TRANSCRIPT_MAX_TURNS,
+                max_earlier_turns=settings.CHAT_TRANSCRIPT_MAX_EARLIER_TURNS
+            )
+        transcript = st.session_state.transcript
+        
+        # 이전 대화 (학습 기록에서 필요할 때만 불러옴)
+        if st.session_state.is_authenticated:
+            if transcript.can_load_earlier():
+                if st.button("⬆️ 이전 대화 보기", key="chat_load_earlier"):
+                    loaded = transcript.load_earlier(
+                        learning_service.get_chat_history_page,
+                        st.session_state.user_id,
+                        learning_service.cursor_before,
+                        page_size=settings.CHAT_HISTORY_PAGE_SIZE
+                    )
+                    if not loaded:
+                        st.info("더 이전 대화가 없습니다.")
+            elif transcript.earlier_full():
+                st.caption("더 이전 대화는 대시보드의 학습 기록 검색이나 프로필의 기록 내보내기로 볼 수 있습니다.")
+            if transcript.earlier and st.button("이전 대화 숨기기", key="chat_hide_earlier"):
+                transcript.hide_earlier()
+        elif transcript.evicted:
+            st.caption(f"오래된 대화 {transcript.evicted}개는 표시하지 않습니다. 로그인하면 이전 대화를 다시 볼 수 있습니다.")
         
-        # 채팅 히스토리 표시
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+        # 채팅 기록 표시
+        for turn in transcript.turns():
+            with st.chat_message("user"):
+                st.markdown(turn.prompt)
+            with st.chat_message("assistant"):
+                st.markdown(turn.response)
         
         # 사용자 입력
         if prompt := st.chat_input("영어 학습에 대해 질문해보세요..."):
-            # 사용자 메시지 추가
-            st.session_state.messages.append({"role": "user", "content": prompt})
             with st.chat_message("user"):
                 st.markdown(prompt)
             
@@ -409,19 +502,22 @@ def show_chat_page():
                         response = ai_service.get_response(prompt, use_solar=True)
                         st.markdown(response)
                         
-                        # 채팅 히스토리에 추가
-                        st.session_state.messages.append({"role": "assistant", "content": response})
+                        # 채팅 기록에 추가 (학습 기록 저장 전에 추가해 이전 대화 조회와 겹치지 않게 함)
+                        turn = transcript.add_turn(prompt, response, saved=st.session_state.is_authenticated)
                         
                         # 학습 기록에 저장 (로그인된 사용자만)
                         if st.session_state.is_authenticated:
                             try:
-                                learning_service.save_chat_message(
+                                if learning_service.save_chat_message(
                                     st.session_state.user_id, 
                                     prompt, 
                                     response
-                                )
-                                logger.info(f"채팅 메시지 저장 완료: 사용자 {st.session_state.user_id}")
+                                ):
+                                    logger.info(f"채팅 메시지 저장 완료: 사용자 {st.session_state.user_id}")
+                                else:
+                                    transcript.mark_unsaved(turn)
                             except Exception as e:
+                                transcript.mark_unsaved(turn)
                                 st.warning(f"학습 기록 저장에 실패했습니다: {e}")
                                 logger.error(f"채팅 메시지 저장 실패: {e}")
                         
@@ -429,14 +525,14 @@ def show_chat_page():
                         error_msg = f"AI 응답 생성 중 오류가 발생했습니다: {e}"
                         logger.error(error_msg)
                         st.error(error_msg)
-                        st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                        transcript.add_turn(prompt, error_msg, saved=False)
                         if st.session_state.debug_mode:
                             st.exception(e)
         
-        # 채팅 히스토리 초기화 버튼
-        if st.session_state.messages:
+        # 채팅 기록 초기화 버튼 (화면 기록만 지우고 학습 기록은 유지)
+        if len(transcript):
             if st.button("🗑️ 채팅 히스토리 초기화"):
-                st.session_state.messages = []
+                transcript.clear()
                 st.rerun()
                 
     except Exception as e:
@@ -456,8 +552,17 @@ def show_dashboard_page():
             return
         
         try:
+            # 화면에 필요한 조회를 먼저 모두 시작 (동시 실행, 대기 시간은 가장 느린 조회 기준)
+            user_id = st.session_state.user_id
+            period_options = {"최근 7일": 7, "최근 30일": 30, "최근 90일": 90, "최근 1년": 365}
+            selected_period = st.session_state.get("activity_period", "최근 7일")
+            loader = PageDataLoader()
+            loader.submit(learning_service.get_user_stats, user_id)
+            loader.submit(learning_service.get_activity_series, user_id, days=period_options[selected_period])
+            loader.submit(learning_service.get_recent_activities, user_id, limit=10)
+            
             # 사용자 통계
-            stats = learning_service.get_user_stats(st.session_state.user_id)
+            stats = loader.get(learning_service.get_user_stats, user_id)
             
             # 통계 카드
             col1, col2, col3, col4 = st.columns(4)
@@ -466,36 +571,46 @@ def show_dashboard_page():
                 st.metric("총 채팅 수", stats.get('total_chats', 0))
             
             with col2:
-                st.metric("문법 검사 수", stats.get('total_grammar_checks', 0))
+                st.metric("문법 검사 수", stats.get('grammar_checks', 0))
             
             with col3:
-                st.metric("어휘 분석 수", stats.get('total_vocabulary_checks', 0))
+                st.metric("어휘 분석 수", stats.get('vocabulary_checks', 0))
             
             with col4:
                 st.metric("학습 일수", stats.get('study_days', 0))
             
-            # 주간 활동 차트
+            # 기간별 활동 차트 (일별 집계 테이블 기반)
             st.markdown("---")
-            st.subheader("📈 주간 활동")
+            st.subheader("📈 학습 활동 추이")
+            
+            period = st.selectbox("기간", list(period_options.keys()), key="activity_period")
             
-            weekly_activities = learning_service.get_weekly_activities(st.session_state.user_id)
-            if weekly_activities:
+            activity_series = loader.get(
+                learning_service.get_activity_series, user_id, days=period_options[period]
+            )
+            if activity_series:
                 import pandas as pd
-                df = pd.DataFrame(list(weekly_activities.items()), columns=['요일', '활동 수'])
-                st.bar_chart(df.set_index('요일'))
+                df = pd.DataFrame(list(activity_series.items()), columns=['날짜', '활동 수'])
+                st.bar_chart(df.set_index('날짜'))
             else:
-                st.info("아직 주간 활동 데이터가 없습니다.")
+                st.info("아직 활동 데이터가 없습니다.")
             
             # 최근 학습 기록
             st.markdown("---")
             st.subheader("📝 최근 학습 기록")
             
-            recent_activities = learning_service.get_recent_activities(st.session_state.user_id, limit=10)
+            recent_activities = loader.get(learning_service.get_recent_activities, user_id, limit=10)
             if recent_activities:
                 for activity in recent_activities:
                     st.markdown(f"- **{activity['type']}**: {activity['description']} ({activity['created_at']})")
             else:
                 st.info("아직 학습 기록이 없습니다.")
+            st.session_state.last_page_load = loader.get_stats()
+            
+            # 학습 기록 검색
+            st.markdown("---")
+            st.subheader("🔍 학습 기록 검색")
+            show_history_search()
                 
         except Exception as e:
             st.error(f"대시보드 데이터를 불러올 수 없습니다: {e}")
@@ -541,6 +656,7 @@ def show_grammar_page():
                                     text_input,
                                     result
                                 )
+                                reset_history_feed('grammar')
                                 st.success("✅ 문법 검사 결과가 학습 기록에 저장되었습니다.")
                                 logger.info(f"문법 검사 저장 완료: 사용자 {st.session_state.user_id}")
                             except Exception as e:
@@ -560,13 +676,12 @@ def show_grammar_page():
             st.subheader("📚 이전 문법 검사 기록")
             
             try:
-                grammar_checks = learning_service.get_grammar_checks(st.session_state.user_id, limit=5)
-                if grammar_checks:
-                    for check in grammar_checks:
-                        with st.expander(f"📝 {check['created_at']}"):
-                            st.markdown(f"**원문**: {check['original_text']}")
-                            st.markdown(f"**결과**: {check['corrected_text']}")
-                else:
+                def render_grammar_check(check):
+                    with st.expander(f"📝 {check['created_at']}"):
+                        st.markdown(f"**원문**: {check['original_text']}")
+                        st.markdown(f"**결과**: {check['corrected_text']}")
+                
+                if not show_history_feed('grammar', learning_service.get_grammar_checks_page, render_grammar_check):
                     st.info("아직 문법 검사 기록이 없습니다.")
             except Exception as e:
                 st.warning(f"문법 검사 기록을 불러올 수 없습니다: {e}")
@@ -612,6 +727,7 @@ def show_vocabulary_page():
                                     text_input,
                                     result
                                 )
+                                reset_history_feed('vocabulary')
                                 st.success("✅ 어휘 분석 결과가 학습 기록에 저장되었습니다.")
                                 logger.info(f"어휘 분석 저장 완료: 사용자 {st.session_state.user_id}")
                             except Exception as e:
@@ -631,13 +747,12 @@ def show_vocabulary_page():
             st.subheader("📚 이전 어휘 분석 기록")
             
             try:
-                vocabulary_checks = learning_service.get_vocabulary_checks(st.session_state.user_id, limit=5)
-                if vocabulary_checks:
-                    for check in vocabulary_checks:
-                        with st.expander(f"📚 {check['created_at']}"):
-                            st.markdown(f"**원문**: {check['original_text']}")
-                            st.markdown(f"**분석**: {check['analysis_result']}")
-                else:
+                def render_vocabulary_check(check):
+                    with st.expander(f"📚 {check['created_at']}"):
+                        st.markdown(f"**원문**: {check['original_text']}")
+                        st.markdown(f"**분석**: {check['analysis_result']}")
+                
+                if not show_history_feed('vocabulary', learning_service.get_vocabulary_checks_page, render_vocabulary_check):
                     st.info("아직 어휘 분석 기록이 없습니다.")
             except Exception as e:
                 st.warning(f"어휘 분석 기록을 불러올 수 없습니다: {e}")
@@ -651,6 +766,111 @@ def show_vocabulary_page():
         if st.session_state.debug_mode:
             st.exception(e)
 
+def show_history_feed(feed_key, load_page, render_item, page_size=5):
+    """키셋 커서 기반 기록 목록 ('더 보기'로 이전 기록을 이어서 불러옴)"""
+    state_key = f"{feed_key}_history_feed"
+    feed = st.session_state.get(state_key)
+    
+    # 첫 페이지 로드 (사용자가 바뀌면 다시 로드)
+    if not feed or feed['user_id'] != st.session_state.user_id:
+        page = load_page(st.session_state.user_id, limit=page_size)
+        feed = {
+            'user_id': st.session_state.user_id,
+            'items': page['items'],
+            'next_cursor': page['next_cursor']
+        }
+        st.session_state[state_key] = feed
+    
+    for item in feed['items']:
+        render_item(item)
+    
+    # 다음 페이지는 마지막 커서 이후만 조회하므로 페이지당 비용이 일정함
+    if feed['next_cursor'] and st.button("⬇️ 이전 기록 더 보기", key=f"{feed_key}_history_more"):
+        page = load_page(st.session_state.user_id, limit=page_size, cursor=feed['next_cursor'])
+        feed['items'].extend(page['items'])
+        feed['next_cursor'] = page['next_cursor']
+        st.rerun()
+    
+    return bool(feed['items'])
+
+def reset_history_feed(feed_key):
+    """기록 목록 상태 초기화 (새 기록 저장 후 첫 페이지부터 다시 로드)"""
+    st.session_state.pop(f"{feed_key}_history_feed", None)
+
+def show_history_search(page_size=10):
+    """채팅/문법 검사 기록 전문 검색"""
+    search_text = st.text_input(
+        "검색어",
+        placeholder="예: present perfect, 현재완료",
+        key="history_search_text"
+    )
+    
+    # 검색어가 바뀌면 첫 페이지부터
+    if st.session_state.get('history_search_last') != search_text:
+        st.session_state.history_search_last = search_text
+        st.session_state.history_search_page = 1
+    
+    if not search_text.strip():
+        return
+    
+    page = st.session_state.get('history_search_page', 1)
+    results = learning_service.search_history(
+        st.session_state.user_id, search_text, limit=page_size, page=page
+    )
+    
+    if not results['items']:
+        st.info("검색 결과가 없습니다.")
+        return
+    
+    type_labels = {'chat': '💬 채팅', 'grammar_check': '✏️ 문법 검사'}
+    for item in results['items']:
+        with st.expander(f"{type_labels.get(item['type'], item['type'])} · {item['created_at']} · {item['title'][:40]}"):
+            st.markdown(f"**질문/원문**: {item['title']}")
+            st.markdown(f"**내용**: {item['snippet']}")
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        if page > 1 and st.button("⬅️ 이전", key="history_search_prev"):
+            st.session_state.history_search_page = page - 1
+            st.rerun()
+    with col2:
+        if results['has_more'] and st.button("다음 ➡️", key="history_search_next"):
+            st.session_state.history_search_page = page + 1
+            st.rerun()
+    with col3:
+        st.caption(f"{page} 페이지")
+
+def show_history_export():
+    """전체 학습 기록 내보내기 (서버 측 커서로 임시 파일에 스트리밍 후 다운로드)
+
+    내보내기 파일은 버튼을 누른 실행에서만 만들고 다운로드 버튼에 넘긴 뒤 바로 삭제합니다.
+    세션 상태에 경로나 내용을 남기지 않으므로 다음 실행이나 다음 로그인 사용자에게 보이지 않습니다.
+    """
+    col1, col2 = st.columns(2)
+    with col1:
+        export_format = st.selectbox("형식", ["ndjson", "csv"], key="export_format")
+    with col2:
+        compress = st.checkbox("gzip 압축", value=True, key="export_gzip")
+    
+    if st.button("📦 내보내기 파일 만들기"):
+        import tempfile
+        user_id = st.session_state.user_id
+        with st.spinner("학습 기록을 내보내는 중..."):
+            file_name = export_service.get_filename(user_id, fmt=export_format, compress=compress)
+            with tempfile.TemporaryDirectory(prefix="wq_export_") as export_dir:
+                export_path = os.path.join(export_dir, file_name)
+                export_service.export_to_file(user_id, export_path, fmt=export_format, compress=compress)
+                with open(export_path, 'rb') as export_file:
+                    export_data = export_file.read()
+        st.download_button(
+            "⬇️ 다운로드",
+            data=export_data,
+            file_name=file_name,
+            mime="application/gzip" if compress else (
+                "application/x-ndjson" if export_format == "ndjson" else "text/csv"
+            )
+        )
+
 def show_profile_page():
     """프로필 페이지"""
     try:
@@ -679,8 +899,13 @@ def show_profile_page():
             st.markdown("---")
             st.subheader("📊 학습 통계 요약")
             
-            stats = learning_service.get_user_stats(st.session_state.user_id)
-            progress = learning_service.get_learning_progress(st.session_state.user_id)
+            # 통계는 로더로 한 번만 조회하고 진도 계산에 재사용
+            loader = PageDataLoader()
+            stats = loader.get(learning_service.get_user_stats, st.session_state.user_id)
+            learning_progress = learning_service.get_learning_progress(st.session_state.user_id, stats=stats)
+            st.session_state.last_page_load = loader.get_stats()
+            stats = learning_progress.get('stats', {})
+            progress = learning_progress.get('progress', {})
             
             col1, col2, col3 = st.columns(3)
             
@@ -691,7 +916,12 @@ def show_profile_page():
                 st.metric("학습 레벨", progress.get('level', '초급'))
             
             with col3:
-                st.metric("학습 진행률", f"{progress.get('progress_percentage', 0)}%")
+                st.metric("학습 진행률", f"{progress.get('percentage', 0):.0f}%")
+            
+            # 학습 기록 내보내기
+            st.markdown("---")
+            st.subheader("💾 학습 기록 내보내기")
+            show_history_export()
             
             # 비밀번호 변경
             st.markdown("---")
@@ -760,7 +990,7 @@ def logout():
         st.session_state.is_authenticated = False
         st.session_state.user_info = None
         st.session_state.current_page = 'home'
-        st.session_state.messages = []
+        st.session_state.pop('transcript', None)
         st.success("로그아웃되었습니다.")
         logger.info(f"사용자 로그아웃: {user_id}")
     except Exception as e:
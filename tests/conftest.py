@@ -0,0 +1,131 @@
+"""
+테스트 공통 설정
+
+PostgreSQL 전용 경로 테스트는 TEST_DATABASE_URL(관리자 권한 DSN)이 있을 때만 실행합니다.
+테스트마다 빈 데이터베이스를 만들어 연결하고 끝나면 삭제합니다.
+
+    TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres python -m pytest
+"""
+
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def _admin_execute(statement: str):
+    """관리용 연결에서 자동 커밋으로 문장 실행 (CREATE/DROP DATABASE)"""
+    import psycopg2
+
+    conn = psycopg2.connect(TEST_DATABASE_URL)
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(statement)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def pg_database(monkeypatch):
+    """빈 테스트 데이터베이스에 연결한 Database (스키마 미적용)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL이 없어 PostgreSQL 테스트를 건너뜁니다")
+    from psycopg2.extensions import parse_dsn
+
+    from app.core.config import settings
+    from app.core.database import Database
+
+    params = parse_dsn(TEST_DATABASE_URL)
+    name = f"wq_test_{uuid.uuid4().hex[:12]}"
+    _admin_execute(f"CREATE DATABASE {name}")
+    monkeypatch.setattr(settings, "DATABASE_HOST", params.get("host", "localhost"))
+    monkeypatch.setattr(settings, "DATABASE_PORT", int(params.get("port", 5432)))
+    monkeypatch.setattr(settings, "DATABASE_USER", params.get("user", "postgres"))
+    monkeypatch.setattr(settings, "DATABASE_PASSWORD", params.get("password", ""))
+    monkeypatch.setattr(settings, "DATABASE_NAME", name)
+    db = Database()
+    try:
+        yield db
+    finally:
+        db.close()
+        _admin_execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+
+
+@pytest.fixture
+def pg_replica_url():
+    """복제본 역할을 하는 별도 빈 데이터베이스의 DSN (라우팅 대상 구분용)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL이 없어 PostgreSQL 테스트를 건너뜁니다")
+    from psycopg2.extensions import make_dsn
+
+    name = f"wq_replica_{uuid.uuid4().hex[:12]}"
+    _admin_execute(f"CREATE DATABASE {name}")
+    try:
+        yield make_dsn(TEST_DATABASE_URL, dbname=name)
+    finally:
+        _admin_execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+
+
+@pytest.fixture
+def pg_db(pg_database):
+    """스키마를 모두 적용한 PostgreSQL Database"""
+    pg_database.create_tables_if_not_exist()
+    return pg_database
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """스키마를 적용한 임시 파일 SQLite Database"""
+    from app.core.sqlite_backend import SqliteDatabase
+
+    database = SqliteDatabase(str(tmp_path / "wordquest.db"))
+    database.create_tables_if_not_exist()
+    yield database
+    database.close()
+
+
+def create_user(db, username: str = "learner") -> int:
+    """테스트 사용자 생성, id 반환 (두 백엔드 공통)"""
+    return db.execute_query(
+        "INSERT INTO claude_integration_users "
+        "(username, email, password_hash, full_name) "
+        "VALUES (%s, %s, 'x', 'Learner') RETURNING id",
+        (username, f"{username}@example.com")
+    )[0]['id']
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def any_db(request):
+    """두 백엔드 각각에서 실행 (PostgreSQL은 TEST_DATABASE_URL이 있을 때만)"""
+    name = "sqlite_db" if request.param == "sqlite" else "pg_db"
+    return request.getfixturevalue(name)
+
+
+def use_database(db, monkeypatch):
+    """서비스가 get_db()로 주어진 Database를 쓰도록 전역 인스턴스 교체
+
+    통계 캐시는 새 프로세스 내 캐시로 바꾸고 write-behind는 끕니다.
+    """
+    from app.core import database, stats_cache
+    from app.core.config import settings
+
+    monkeypatch.setattr(database, "_db", db)
+    monkeypatch.setattr(stats_cache, "_stats_cache", stats_cache.InProcessStatsCache())
+    monkeypatch.setattr(settings, "WRITE_BEHIND_ENABLED", False)
+
+
+@pytest.fixture
+def learning_service(any_db, monkeypatch):
+    """any_db를 사용하는 LearningService"""
+    from app.services.learning_service import LearningService
+
+    use_database(any_db, monkeypatch)
+    return LearningService()
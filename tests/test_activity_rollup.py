@@ -0,0 +1,52 @@
+"""
+일별 활동 집계 테스트 (트리거 갱신, 기간별 조회, 재구축)
+"""
+
+from datetime import date, datetime
+
+from conftest import create_user
+
+ROLLUP_TABLE = "claude_integration_daily_activity_rollup"
+
+
+def add_activity(db, user_id, created_at, activity_type="chat"):
+    db.execute_query(
+        "INSERT INTO claude_integration_learning_activities "
+        "(user_id, activity_type, description, created_at) VALUES (%s, %s, 'x', %s)",
+        (user_id, activity_type, created_at)
+    )
+
+
+def test_series_fills_missing_days_with_zero(learning_service):
+    db = learning_service.db
+    user_id = create_user(db)
+    add_activity(db, user_id, datetime(2024, 3, 1, 9, 0))
+    add_activity(db, user_id, datetime(2024, 3, 1, 23, 0), "grammar_check")
+    add_activity(db, user_id, datetime(2024, 3, 3, 8, 0))
+
+    series = learning_service.get_activity_series(
+        user_id, days=4, end_date=date(2024, 3, 4)
+    )
+    assert series == {
+        '2024-03-01': 2, '2024-03-02': 0, '2024-03-03': 1, '2024-03-04': 0
+    }
+    chats = learning_service.get_activity_series(
+        user_id, days=4, activity_type="chat", end_date=date(2024, 3, 4)
+    )
+    assert list(chats.values()) == [1, 0, 1, 0]
+
+
+def test_rebuild_rollup_for_one_user(any_db):
+    learner = create_user(any_db, "learner")
+    other = create_user(any_db, "other")
+    for user_id in (learner, other):
+        add_activity(any_db, user_id, datetime(2024, 3, 1, 9, 0))
+    any_db.execute_query(f"UPDATE {ROLLUP_TABLE} SET activity_count = 7")
+
+    assert any_db.rebuild_daily_activity_rollup(learner) == 1
+    rows = any_db.execute_query(
+        f"SELECT user_id, activity_count FROM {ROLLUP_TABLE} ORDER BY user_id"
+    )
+    assert [(row['user_id'], row['activity_count']) for row in rows] == [
+        (learner, 1), (other, 7)
+    ]
@@ -0,0 +1,61 @@
+"""
+내용 주소 기반 본문 블롭 테스트 (중복 제거, 참조 수 트리거, 정리)
+"""
+
+import hashlib
+
+from conftest import create_user
+
+from app.core.content_store import BLOBS_TABLE, blob_select, content_hash
+
+CHAT_TABLE = "claude_integration_chat_messages"
+
+
+def blobs(db):
+    rows = db.execute_query(
+        f"SELECT content, ref_count FROM {BLOBS_TABLE} ORDER BY content"
+    )
+    return [(row['content'], row['ref_count']) for row in rows]
+
+
+def test_content_hash_matches_sql_sha256():
+    assert content_hash("안녕") == hashlib.sha256("안녕".encode("utf-8")).digest()
+
+
+def test_blob_select_prefers_inline_content():
+    expressions, joins = blob_select(CHAT_TABLE, ("user_message", "ai_response"))
+    assert expressions == (
+        "t.user_message, COALESCE(t.ai_response, b_ai_response.content) AS ai_response"
+    )
+    assert joins == (
+        f"LEFT JOIN {BLOBS_TABLE} b_ai_response "
+        f"ON b_ai_response.hash = t.ai_response_hash"
+    )
+
+
+def test_identical_responses_are_stored_once(learning_service):
+    db = learning_service.db
+    user_id = create_user(db)
+    learning_service.save_chat_message(user_id, "one", "same answer")
+    learning_service.save_chat_message(user_id, "two", "same answer")
+    learning_service.save_grammar_check(user_id, "I goes", "I go")
+    assert blobs(db) == [("I go", 1), ("same answer", 2)]
+
+    db.execute_query(f"DELETE FROM {CHAT_TABLE} WHERE user_message = 'one'")
+    assert blobs(db) == [("I go", 1), ("same answer", 1)]
+
+
+def test_collect_removes_only_unreferenced_old_blobs(learning_service):
+    db = learning_service.db
+    user_id = create_user(db)
+    learning_service.save_chat_message(user_id, "one", "kept answer")
+    learning_service.save_chat_message(user_id, "two", "dropped answer")
+    db.execute_query(f"DELETE FROM {CHAT_TABLE} WHERE user_message = 'two'")
+    # 보존 시간이 지난 블롭처럼 생성 시각을 과거로 옮김
+    db.execute_query(
+        f"UPDATE {BLOBS_TABLE} SET created_at = %s", ("2020-01-01 00:00:00",)
+    )
+
+    assert db.collect_content_blobs(grace_minutes=60) == {'recounted': 0, 'deleted': 1}
+    assert blobs(db) == [("kept answer", 1)]
+    assert learning_service.get_chat_history(user_id)[0].ai_response == "kept answer"
@@ -0,0 +1,93 @@
+"""
+데이터베이스 계측 테스트 (쿼리 지문, 슬로우 쿼리, Prometheus 출력, EXPLAIN 샘플링)
+"""
+
+import threading
+
+import psycopg2
+
+from app.core.config import settings
+from app.core.database import Database
+from app.core.db_metrics import DatabaseMetrics, fingerprint_query, to_prometheus
+
+
+def test_fingerprint_normalizes_literals_and_parameters():
+    first = fingerprint_query("SELECT * FROM t WHERE id = 1 AND name = 'a'  -- x")
+    second = fingerprint_query("SELECT * FROM t\n WHERE id = %s AND name = %(name)s")
+    assert first == second == "SELECT * FROM t WHERE id = ? AND name = ?"
+    assert fingerprint_query("SELECT 1 WHERE id IN (1, 2, 3)") == (
+        "SELECT ? WHERE id IN (?)"
+    )
+
+
+def test_slow_queries_are_logged_and_exported():
+    metrics = DatabaseMetrics(slow_query_ms=100)
+    assert not metrics.record_query("SELECT 1", 5.0, rows=1)
+    assert metrics.record_query("SELECT 2", 150.0, rows=3)
+    metrics.record_checkout(2.0)
+
+    snapshot = metrics.snapshot({"in_use": 1, "idle": 2, "max": 10})
+    assert [query["count"] for query in snapshot["queries"]] == [2]
+    assert snapshot["slow_queries"][0]["elapsed_ms"] == 150.0
+    text = to_prometheus(snapshot)
+    bucket = 'wordquest_db_query_latency_ms_bucket{query="SELECT ?",le="+Inf"} 2'
+    assert bucket in text
+    assert "wordquest_db_pool_in_use 1" in text
+
+
+def test_only_select_statements_are_sampled_for_explain():
+    metrics = DatabaseMetrics(explain_sample_rate=1.0)
+    assert metrics.should_explain("  SELECT 1")
+    assert not metrics.should_explain("UPDATE t SET a = 1")
+    assert not DatabaseMetrics(explain_sample_rate=0.0).should_explain("SELECT 1")
+
+
+def test_explain_runs_off_the_request_thread(pg_db, monkeypatch):
+    captured = []
+    done = threading.Event()
+
+    def capture(query, params, replica=None):
+        captured.append((threading.current_thread().name, query, params, replica))
+        done.set()
+
+    monkeypatch.setattr(pg_db, "_capture_explain", capture)
+    pg_db.metrics.explain_sample_rate = 1.0
+    pg_db.execute_query("SELECT %s AS value", (1,))
+
+    assert done.wait(5)
+    thread_name, query, params, replica = captured[0]
+    assert thread_name.startswith("db-explain")
+    assert (query, params, replica) == ("SELECT %s AS value", (1,), None)
+
+
+def test_explain_records_primary_plan(pg_db):
+    pg_db.metrics.explain_sample_rate = 1.0
+    pg_db.execute_query("SELECT COUNT(*) FROM claude_integration_users")
+    pg_db.close()  # 대기 중인 EXPLAIN 수집이 끝날 때까지 기다림
+
+    explains = pg_db.metrics.snapshot()["explains"]
+    assert [explain["fingerprint"] for explain in explains] == [
+        "SELECT COUNT(*) FROM claude_integration_users"
+    ]
+    assert explains[0]["plan"][0]["Plan"]
+
+
+def test_replica_reads_are_explained_on_the_replica(
+    pg_db, pg_replica_url, monkeypatch
+):
+    # 복제본에만 있는 테이블: 프라이머리에서 EXPLAIN하면 실패해 계획이 남지 않음
+    conn = psycopg2.connect(pg_replica_url)
+    with conn, conn.cursor() as cursor:
+        cursor.execute("CREATE TABLE wq_replica_only (note TEXT)")
+        cursor.execute("INSERT INTO wq_replica_only VALUES ('from replica')")
+    conn.close()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", pg_replica_url)
+    db = Database()
+    db.metrics.explain_sample_rate = 1.0
+    try:
+        rows = db.execute_query("SELECT note FROM wq_replica_only", read_only=True)
+    finally:
+        db.close()
+
+    assert [row['note'] for row in rows] == ["from replica"]
+    assert len(db.metrics.snapshot()["explains"]) == 1
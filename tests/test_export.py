@@ -0,0 +1,63 @@
+"""
+학습 기록 내보내기 테스트 (NDJSON/CSV, gzip, 스트리밍 커서)
+"""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from conftest import create_user
+
+from app.services.export_service import CSV_COLUMNS, ExportService
+
+
+@pytest.fixture
+def exporter(learning_service):
+    """기록 두 명분을 저장한 뒤 한 행씩 읽는 ExportService"""
+    user_id = create_user(learning_service.db)
+    other_id = create_user(learning_service.db, "other")
+    learning_service.save_chat_message(user_id, "Hello", "Hi there")
+    learning_service.save_grammar_check(user_id, "I goes", "I go")
+    learning_service.save_vocabulary_check(other_id, "word", "meaning")
+    service = ExportService(itersize=1)
+    service.user_id = user_id
+    return service
+
+
+def test_ndjson_export_contains_only_the_users_records(exporter):
+    output = b"".join(exporter.iter_export(exporter.user_id))
+    lines = [json.loads(line) for line in output.decode("utf-8").splitlines()]
+
+    assert [line['record_type'] for line in lines] == [
+        "chat", "grammar_check", "activity", "activity"
+    ]
+    assert lines[0]['ai_response'] == "Hi there"
+    assert lines[1]['corrected_text'] == "I go"
+    assert lines[2]['description'].startswith("AI와의 영어 학습 대화: Hello")
+
+
+def test_compressed_csv_export(exporter):
+    output = b"".join(exporter.iter_export(exporter.user_id, fmt="csv", compress=True))
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(output).decode("utf-8"))))
+
+    assert list(rows[0]) == list(CSV_COLUMNS)
+    assert [(row['record_type'], row['user_message']) for row in rows[:2]] == [
+        ("chat", "Hello"), ("grammar_check", "")
+    ]
+
+
+def test_unknown_format_is_rejected(exporter):
+    with pytest.raises(ValueError):
+        list(exporter.iter_export(exporter.user_id, fmt="xml"))
+
+
+def test_closing_a_stream_returns_its_connection(pg_db):
+    stream = pg_db.stream_query(
+        "SELECT generate_series(1, 10) AS n", itersize=2
+    )
+    assert next(stream)['n'] == 1
+    assert pg_db.get_pool_status()['in_use'] == 1
+    stream.close()
+    assert pg_db.get_pool_status()['in_use'] == 0
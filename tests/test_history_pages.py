@@ -0,0 +1,74 @@
+"""
+키셋 페이지네이션 기록 조회 테스트 (동일 시각 정렬, 커서, 블롭 본문)
+"""
+
+from datetime import datetime, timedelta
+
+from conftest import create_user
+
+BASE_TIME = datetime(2024, 3, 1, 9, 0)
+
+
+def add_grammar_check(db, user_id, created_at, text):
+    return db.execute_query(
+        "INSERT INTO claude_integration_grammar_checks "
+        "(user_id, original_text, corrected_text, created_at) "
+        "VALUES (%s, %s, 'fixed', %s) RETURNING id",
+        (user_id, text, created_at)
+    )[0]['id']
+
+
+def test_pages_cover_every_row_once_in_order(learning_service):
+    db = learning_service.db
+    user_id = create_user(db)
+    other_id = create_user(db, "other")
+    # 세 행은 같은 시각: id로 순서가 고정되어야 함
+    times = [BASE_TIME, BASE_TIME, BASE_TIME, BASE_TIME + timedelta(minutes=1),
+             BASE_TIME - timedelta(minutes=1)]
+    ids = [add_grammar_check(db, user_id, created_at, f"text {index}")
+           for index, created_at in enumerate(times)]
+    add_grammar_check(db, other_id, BASE_TIME, "not mine")
+
+    seen = []
+    cursor = None
+    while True:
+        page = learning_service.get_grammar_checks_page(user_id, limit=2, cursor=cursor)
+        seen.extend(record.id for record in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    expected = sorted(zip(times, ids), reverse=True)
+    assert seen == [record_id for _, record_id in expected]
+
+
+def test_cursor_before_skips_newer_rows(learning_service):
+    db = learning_service.db
+    user_id = create_user(db)
+    add_grammar_check(db, user_id, BASE_TIME, "older")
+    add_grammar_check(db, user_id, BASE_TIME + timedelta(hours=1), "newer")
+
+    cursor = learning_service.cursor_before(BASE_TIME + timedelta(minutes=30))
+    page = learning_service.get_grammar_checks_page(user_id, limit=5, cursor=cursor)
+    assert [record.original_text for record in page['items']] == ["older"]
+    assert page['items'][0].timestamp == BASE_TIME
+    assert page['next_cursor'] is None
+
+
+def test_invalid_cursor_returns_an_empty_page(learning_service):
+    user_id = create_user(learning_service.db)
+    page = learning_service.get_chat_history_page(user_id, cursor="not-a-cursor")
+    assert page == {'items': [], 'next_cursor': None}
+
+
+def test_chat_history_reads_responses_from_blobs(learning_service):
+    user_id = create_user(learning_service.db)
+    learning_service.save_chat_message(user_id, "Hello", "Hi there")
+    learning_service.save_vocabulary_check(user_id, "ubiquitous", "everywhere")
+
+    chats = learning_service.get_chat_history(user_id)
+    assert [(chat.user_message, chat.ai_response) for chat in chats] == [
+        ("Hello", "Hi there")
+    ]
+    checks = learning_service.get_vocabulary_checks(user_id)
+    assert [check['analysis_result'] for check in checks] == ["everywhere"]
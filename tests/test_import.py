@@ -0,0 +1,87 @@
+"""
+COPY 기반 대량 가져오기 테스트 (PostgreSQL 서버 필요: TEST_DATABASE_URL)
+"""
+
+import csv
+
+import pytest
+from conftest import use_database
+
+from app.core.content_store import BLOBS_TABLE
+from app.services.import_service import ImportService
+
+PASSWORD_HASH = "$2b$12$" + "a" * 53
+
+
+@pytest.fixture
+def importer(pg_db, monkeypatch):
+    use_database(pg_db, monkeypatch)
+    return ImportService
+
+
+def user_row(username, email=None, password_hash=PASSWORD_HASH):
+    return {
+        'username': username,
+        'email': email or f"{username}@example.com",
+        'password_hash': password_hash,
+        'full_name': username.title(),
+        'created_at': "2024-03-01T09:00:00+09:00",
+    }
+
+
+def test_users_are_validated_and_duplicates_skipped(importer, pg_db):
+    rows = [
+        user_row("alice"),
+        user_row("bob", email="not-an-email"),
+        user_row("carol", password_hash="plain-text"),
+    ]
+    summary = importer().import_rows('users', rows)
+
+    assert (summary['inserted'], summary['rejected']) == (1, 2)
+    assert [error['line'] for error in summary['errors']] == [3, 4]
+    user = pg_db.execute_query(
+        "SELECT created_at, is_active FROM claude_integration_users"
+    )[0]
+    # 시간대가 있는 값은 UTC로 저장
+    assert user['created_at'].isoformat() == "2024-03-01T00:00:00"
+    assert user['is_active'] is True
+
+    again = importer().import_rows('users', [user_row("alice")])
+    assert (again['inserted'], again['skipped']) == (0, 1)
+
+
+def test_learning_rows_share_blobs_and_bump_counters(importer, pg_db, tmp_path):
+    importer().import_rows('users', [user_row("alice")])
+    path = tmp_path / "chats.csv"
+    with open(path, "w", newline="", encoding="utf-8") as output:
+        writer = csv.writer(output)
+        writer.writerow(["username", "user_message", "ai_response", "created_at"])
+        writer.writerow(["alice", "hi", "same answer", "2024-03-01T09:00:00"])
+        writer.writerow(["alice", "hello", "same answer", "2024-03-01T09:05:00"])
+        writer.writerow(["nobody", "hey", "other answer", "2024-03-01T09:10:00"])
+
+    batches = []
+    summary = importer(batch_size=2, progress=batches.append).import_csv(
+        'chat_messages', str(path)
+    )
+    assert (summary['inserted'], summary['rejected'], summary['skipped']) == (2, 1, 0)
+    assert len(batches) == 2
+    assert summary['errors'] == [{'line': 4, 'error': "알 수 없는 사용자: nobody"}]
+
+    blobs = pg_db.execute_query(f"SELECT content, ref_count FROM {BLOBS_TABLE}")
+    ref_counts = {row['content']: row['ref_count'] for row in blobs}
+    assert ref_counts["same answer"] == 2
+    counters = pg_db.execute_query(
+        "SELECT total_chats FROM claude_integration_user_learning_counters"
+    )
+    assert counters[0]['total_chats'] == 2
+
+    again = importer().import_csv('chat_messages', str(path))
+    assert (again['inserted'], again['skipped']) == (0, 2)
+
+
+def test_unknown_kind_and_policy_are_rejected(importer):
+    with pytest.raises(ValueError):
+        importer(on_conflict="replace")
+    with pytest.raises(ValueError):
+        importer().import_rows('payments', [])
@@ -0,0 +1,56 @@
+"""
+지연 생성 데이터베이스 인스턴스와 fork 안전성 테스트
+"""
+
+import os
+
+from conftest import create_user
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import Database, get_db
+from app.core.sqlite_backend import SqliteDatabase
+
+
+def test_database_does_not_connect_until_first_use(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_PORT", 1)
+    db = Database()
+    assert db.connection_pool is None
+    assert db.get_pool_status()['in_use'] == 0
+
+
+def test_get_db_creates_one_instance_for_the_configured_backend(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, "_db", None)
+    monkeypatch.setattr(settings, "DATABASE_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "wordquest.db"))
+
+    db = get_db()
+    assert isinstance(db, SqliteDatabase)
+    assert get_db() is db
+    db.close()
+
+
+def count_users(db):
+    return db.execute_query(
+        "SELECT COUNT(*) AS n FROM claude_integration_users"
+    )[0]['n']
+
+
+def test_forked_child_uses_its_own_connections(any_db):
+    create_user(any_db)
+    assert count_users(any_db) == 1
+
+    pid = os.fork()
+    if pid == 0:
+        # 자식: 상속한 연결 대신 새 연결로 조회/쓰기
+        status = 1
+        try:
+            create_user(any_db, "child")
+            status = 0 if count_users(any_db) == 2 else 1
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    # 부모의 연결은 자식이 닫지 않았으므로 그대로 사용 가능
+    assert count_users(any_db) == 2
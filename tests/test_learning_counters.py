@@ -0,0 +1,67 @@
+"""
+트리거로 관리하는 사용자 학습 카운터 테스트 (증분 갱신, 재구축)
+"""
+
+from datetime import datetime
+
+from conftest import create_user
+
+COUNTERS_TABLE = "claude_integration_user_learning_counters"
+
+
+def add_activity(db, user_id, created_at, activity_type="chat"):
+    db.execute_query(
+        "INSERT INTO claude_integration_learning_activities "
+        "(user_id, activity_type, description, created_at) VALUES (%s, %s, 'x', %s)",
+        (user_id, activity_type, created_at)
+    )
+
+
+def counters(db, user_id):
+    rows = db.execute_query(
+        f"SELECT total_chats, grammar_checks, vocabulary_checks, total_activities, "
+        f"first_activity_at, last_activity_at FROM {COUNTERS_TABLE} WHERE user_id = %s",
+        (user_id,)
+    )
+    return dict(rows[0]) if rows else None
+
+
+def test_inserts_bump_counters(any_db):
+    user_id = create_user(any_db)
+    assert counters(any_db, user_id) is None
+
+    for table, column in (("chat_messages", "user_message"),
+                          ("grammar_checks", "original_text"),
+                          ("grammar_checks", "original_text"),
+                          ("vocabulary_checks", "original_text")):
+        any_db.execute_query(
+            f"INSERT INTO claude_integration_{table} (user_id, {column}) "
+            f"VALUES (%s, 'text')", (user_id,)
+        )
+    add_activity(any_db, user_id, datetime(2024, 3, 2, 9, 0))
+    add_activity(any_db, user_id, datetime(2024, 3, 1, 9, 0))
+    add_activity(any_db, user_id, datetime(2024, 3, 5, 9, 0))
+
+    assert counters(any_db, user_id) == {
+        'total_chats': 1,
+        'grammar_checks': 2,
+        'vocabulary_checks': 1,
+        'total_activities': 3,
+        'first_activity_at': datetime(2024, 3, 1, 9, 0),
+        'last_activity_at': datetime(2024, 3, 5, 9, 0),
+    }
+
+
+def test_rebuild_only_touches_the_given_user(any_db):
+    learner = create_user(any_db, "learner")
+    other = create_user(any_db, "other")
+    for user_id in (learner, other):
+        add_activity(any_db, user_id, datetime(2024, 3, 1, 9, 0))
+    any_db.execute_query(f"UPDATE {COUNTERS_TABLE} SET total_activities = 42")
+
+    assert any_db.rebuild_user_learning_counters(learner) == 1
+    assert counters(any_db, learner)['total_activities'] == 1
+    assert counters(any_db, other)['total_activities'] == 42
+
+    any_db.rebuild_user_learning_counters()
+    assert counters(any_db, other)['total_activities'] == 1
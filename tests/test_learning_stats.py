@@ -0,0 +1,43 @@
+"""
+사용자 학습 통계 조회 테스트 (집계 값, 조회 왕복 횟수)
+"""
+
+from conftest import create_user
+
+
+def test_user_stats_count_saved_records(learning_service):
+    user_id = create_user(learning_service.db)
+    learning_service.save_chat_message(user_id, "Hello", "Hi there")
+    learning_service.save_chat_message(user_id, "How are you?", "Fine")
+    learning_service.save_grammar_check(user_id, "I goes", "I go")
+    learning_service.save_vocabulary_check(user_id, "ubiquitous", "everywhere")
+
+    stats = learning_service.get_user_stats(user_id)
+    assert stats == {
+        'total_chats': 2,
+        'grammar_checks': 1,
+        'vocabulary_checks': 1,
+        'total_activities': 4,
+        'study_days': 1,
+        'total_study_time': 2 * 5 + 3 + 3,
+    }
+
+
+def test_user_stats_use_a_single_query(learning_service):
+    user_id = create_user(learning_service.db)
+    learning_service.save_grammar_check(user_id, "I goes", "I go")
+    learning_service.db.metrics.reset()
+
+    learning_service.get_user_stats(user_id)
+    queries = learning_service.db.get_metrics_snapshot()["queries"]
+    assert sum(query["count"] for query in queries) == 1
+
+
+def test_user_without_records_has_empty_stats(learning_service):
+    user_id = create_user(learning_service.db)
+
+    stats = learning_service.get_user_stats(user_id)
+    assert stats['total_activities'] == 0
+    assert stats['study_days'] == 0
+    assert stats['total_study_time'] == 0
+    assert learning_service.get_learning_progress(user_id)['progress']['level'] == '초급'
@@ -0,0 +1,141 @@
+"""
+스키마 마이그레이션 실행기 테스트 (PostgreSQL 서버 필요: TEST_DATABASE_URL)
+"""
+
+import pytest
+from conftest import create_user
+
+from app.core.content_store import BLOBS_TABLE
+from app.core.database import Database
+from app.core.migrations import (
+    MIGRATIONS, MIGRATIONS_TABLE, USER_HISTORY_TABLES, Migration, MigrationRunner,
+    create_index_concurrently
+)
+
+CREATE_PROBE = "CREATE TABLE wq_migration_probe (id INTEGER)"
+ADD_NOTE = "ALTER TABLE wq_migration_probe ADD COLUMN note TEXT"
+INDEX_NAMES = [f"{table}_user_created_idx" for table in USER_HISTORY_TABLES]
+
+
+def test_fresh_database_applies_every_migration(pg_database):
+    applied = pg_database.create_tables_if_not_exist()
+
+    assert applied == [migration.version for migration in MIGRATIONS]
+    status = pg_database.get_migration_status()
+    assert all(migration['applied'] for migration in status)
+    with pg_database.get_cursor() as cursor:
+        assert MigrationRunner(pg_database).is_current(cursor)
+
+
+def test_second_bootstrap_is_a_no_op(pg_db):
+    # 새 인스턴스는 프로세스 캐시(_schema_ready)가 없으므로 버전 확인 쿼리로 판단
+    assert Database().create_tables_if_not_exist() == []
+
+
+def test_user_history_indexes_are_valid(pg_db):
+    with pg_db.get_cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname, i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = ANY(%s)
+        """, (INDEX_NAMES,))
+        indexes = {row['relname']: row['indisvalid'] for row in cursor.fetchall()}
+
+    assert set(indexes) == set(INDEX_NAMES)
+    assert all(indexes.values())
+
+
+def test_failed_migration_is_rolled_back_and_not_recorded(pg_database):
+    runner = MigrationRunner(pg_database, migrations=[
+        Migration(1, "create_table", [CREATE_PROBE]),
+        Migration(2, "broken", [
+            ADD_NOTE,
+            "SELECT * FROM wq_missing_table",
+        ]),
+    ])
+
+    with pytest.raises(Exception):
+        runner.run()
+
+    assert [row['applied'] for row in runner.status()] == [True, False]
+    assert not pg_database.execute_query(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'wq_migration_probe' AND column_name = 'note'"
+    )
+
+
+def test_non_transactional_migration_runs_in_autocommit(pg_database):
+    runner = MigrationRunner(pg_database, migrations=[
+        Migration(1, "create_table", [CREATE_PROBE]),
+        Migration(2, "concurrent_index", [
+            create_index_concurrently("wq_probe_idx", "wq_migration_probe", "id")
+        ], transactional=False),
+        Migration(3, "after_index", [ADD_NOTE]),
+    ])
+
+    assert runner.run() == [1, 2, 3]
+    rows = pg_database.execute_query(
+        f"SELECT version FROM {MIGRATIONS_TABLE} ORDER BY version"
+    )
+    assert [row['version'] for row in rows] == [1, 2, 3]
+
+
+def apply_until(db, version):
+    """version까지의 마이그레이션만 적용 (이전 버전 스키마에서 업그레이드하는 상황)"""
+    migrations = [migration for migration in MIGRATIONS if migration.version <= version]
+    MigrationRunner(db, migrations=migrations).run()
+
+
+def test_upgrade_applies_only_pending_versions(pg_database):
+    apply_until(pg_database, 3)
+    status = pg_database.get_migration_status()
+    assert [row['version'] for row in status if row['applied']] == [1, 2, 3]
+    assert all(row['applied_at'] for row in status if row['applied'])
+
+    pending = [migration.version for migration in MIGRATIONS if migration.version > 3]
+    assert pg_database.create_tables_if_not_exist() == pending
+
+
+def test_blob_migration_waits_for_db_tools_when_tables_have_rows(pg_database):
+    apply_until(pg_database, 6)
+    user_id = create_user(pg_database)
+    pg_database.execute_query(
+        "INSERT INTO claude_integration_chat_messages "
+        "(user_id, user_message, ai_response) VALUES (%s, 'hi', 'legacy answer')",
+        (user_id,)
+    )
+
+    with pytest.raises(RuntimeError, match="0007_content_addressed_blobs"):
+        pg_database.create_tables_if_not_exist()
+    assert not pg_database.get_migration_status()[-1]['applied']
+
+    assert pg_database.create_tables_if_not_exist(allow_offline=True) == [7]
+    row = pg_database.execute_query(
+        f"SELECT c.ai_response, b.content, b.ref_count "
+        f"FROM claude_integration_chat_messages c "
+        f"JOIN {BLOBS_TABLE} b ON b.hash = c.ai_response_hash"
+    )[0]
+    assert (row['ai_response'], row['content'], row['ref_count']) == (
+        None, "legacy answer", 1
+    )
+
+
+def test_search_migration_waits_for_db_tools_when_tables_have_rows(pg_database):
+    apply_until(pg_database, 5)
+    user_id = create_user(pg_database)
+    pg_database.execute_query(
+        "INSERT INTO claude_integration_grammar_checks "
+        "(user_id, original_text, corrected_text) VALUES (%s, 'I goes', 'I go')",
+        (user_id,)
+    )
+
+    with pytest.raises(RuntimeError, match="0006_full_text_search"):
+        pg_database.create_tables_if_not_exist()
+
+    assert pg_database.create_tables_if_not_exist(allow_offline=True) == [6, 7]
+    rows = pg_database.execute_query(
+        "SELECT id FROM claude_integration_grammar_checks "
+        "WHERE search_vector @@ plainto_tsquery('english', 'goes')"
+    )
+    assert len(rows) == 1
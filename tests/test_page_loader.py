@@ -0,0 +1,76 @@
+"""
+페이지 데이터 로더 테스트 (중복 제거, 동시 실행, 예외 전달)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import create_user
+
+from app.services.page_loader import PageDataLoader, get_page_executor
+
+
+@pytest.fixture
+def loader():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield PageDataLoader(executor)
+
+
+def test_identical_calls_run_once(loader):
+    calls = []
+    lock = threading.Lock()
+
+    def load(user_id, limit=10):
+        with lock:
+            calls.append((user_id, limit))
+        return [user_id] * limit
+
+    first = loader.submit(load, 1, limit=2)
+    assert loader.submit(load, 1, limit=2) is first
+    assert loader.get(load, 1, limit=2) == [1, 1]
+    assert loader.get(load, 2, limit=2) == [2, 2]
+
+    assert calls == [(1, 2), (2, 2)]
+    stats = loader.get_stats()
+    assert (stats["calls"], stats["deduplicated"]) == (2, 1)
+
+
+def test_independent_calls_run_concurrently(loader):
+    def slow(name):
+        time.sleep(0.2)
+        return name
+
+    started = time.monotonic()
+    for name in ("stats", "activities", "progress"):
+        loader.submit(slow, name)
+    assert [loader.get(slow, name) for name in ("stats", "activities", "progress")] \
+        == ["stats", "activities", "progress"]
+
+    # 조회 시간의 합(0.6초)이 아니라 최댓값에 가까움
+    assert time.monotonic() - started < 0.45
+    stats = loader.get_stats()
+    assert stats["query_ms_sum"] >= 600
+    assert stats["query_ms_max"] < stats["query_ms_sum"]
+
+
+def test_errors_are_raised_from_get(loader):
+    def fail():
+        raise ValueError("조회 실패")
+
+    loader.submit(fail)
+    with pytest.raises(ValueError):
+        loader.get(fail)
+
+
+def test_loads_service_queries(learning_service):
+    user_id = create_user(learning_service.db)
+    learning_service.save_chat_message(user_id, "Hello", "Hi")
+
+    loader = PageDataLoader()
+    assert loader.executor is get_page_executor()
+    loader.submit(learning_service.get_user_stats, user_id)
+    loader.submit(learning_service.get_recent_activities, user_id)
+    assert loader.get(learning_service.get_user_stats, user_id)['total_chats'] == 1
+    assert len(loader.get(learning_service.get_recent_activities, user_id)) == 1
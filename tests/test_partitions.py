@@ -0,0 +1,111 @@
+"""
+월 파티션 관리 테스트 (PostgreSQL 서버 필요: TEST_DATABASE_URL)
+"""
+
+import csv
+import gzip
+from datetime import datetime
+
+from conftest import create_user
+
+from app.core import partitions
+from app.core.config import settings
+from app.core.content_store import BLOBS_TABLE, content_hash
+from app.core.partitions import (
+    PARTITIONED_TABLES, add_months, month_start, partition_name
+)
+
+CHAT_TABLE = "claude_integration_chat_messages"
+ACTIVITIES_TABLE = "claude_integration_learning_activities"
+
+
+def add_chat(db, user_id, created_at, message="hello", response="stored in a blob"):
+    """블롭에 응답을 저장한 채팅 기록 추가 (앱의 저장 경로와 같은 형태)"""
+    with db.transaction() as tx:
+        tx.execute(
+            f"INSERT INTO {BLOBS_TABLE} (hash, content, byte_size) VALUES (%s, %s, %s) "
+            f"ON CONFLICT (hash) DO NOTHING",
+            (content_hash(response), response, len(response.encode("utf-8")))
+        )
+        tx.execute(
+            f"INSERT INTO {CHAT_TABLE} "
+            f"(user_id, user_message, ai_response_hash, created_at) "
+            f"VALUES (%s, %s, %s, %s)",
+            (user_id, message, content_hash(response), created_at)
+        )
+
+
+def test_archive_keeps_blob_content_after_gc(pg_db, tmp_path):
+    user_id = create_user(pg_db)
+    add_chat(pg_db, user_id, "2020-01-15 10:00:00", response="archived answer")
+    pg_db.ensure_partitions()
+
+    archived = pg_db.archive_expired_partitions(1, str(tmp_path))
+    chat_archive = next(item for item in archived if item['table'] == CHAT_TABLE)
+    assert chat_archive['partition'] == f"{CHAT_TABLE}_p202001"
+
+    # 파티션이 삭제되었으므로 참조 수가 0으로 보정되고 블롭도 삭제됨
+    result = pg_db.collect_content_blobs(grace_minutes=0)
+    assert result == {'recounted': 1, 'deleted': 1}
+    with gzip.open(chat_archive['path'], "rt", encoding="utf-8") as archive:
+        rows = list(csv.DictReader(archive))
+    assert [(row['user_message'], row['ai_response']) for row in rows] == [
+        ("hello", "archived answer")
+    ]
+    assert "search_vector" not in rows[0]
+
+
+def partition_exists(db, name):
+    return db.execute_query(
+        "SELECT to_regclass(%s) IS NOT NULL AS present", (name,)
+    )[0]['present']
+
+
+def test_bootstrap_creates_partitions_ahead(pg_db):
+    this_month = month_start(datetime.utcnow().date())
+    for table_name in PARTITIONED_TABLES:
+        for offset in range(settings.LEARNING_PARTITION_MONTHS_AHEAD + 1):
+            month = add_months(this_month, offset)
+            assert partition_exists(pg_db, partition_name(table_name, month))
+    assert pg_db.ensure_partitions() == []
+
+
+def test_rollover_creates_partitions_for_the_new_month(pg_db, monkeypatch):
+    class NextYear(datetime):
+        @classmethod
+        def utcnow(cls):
+            return cls(datetime.utcnow().year + 5, 1, 15)
+
+    monkeypatch.setattr(partitions, "datetime", NextYear)
+    created = pg_db.ensure_partitions()
+
+    year = datetime.utcnow().year + 5
+    assert f"{CHAT_TABLE}_p{year}01" in created
+    assert f"{CHAT_TABLE}_p{year}04" in created
+    assert pg_db.ensure_partitions() == []
+
+
+def test_default_partition_rows_are_drained_without_recounting(pg_db):
+    user_id = create_user(pg_db)
+    pg_db.execute_query(
+        f"INSERT INTO {ACTIVITIES_TABLE} "
+        f"(user_id, activity_type, description, created_at) "
+        f"VALUES (%s, 'chat', 'old', '2020-05-02 10:00:00')",
+        (user_id,)
+    )
+    default = f"{ACTIVITIES_TABLE}_default"
+    assert pg_db.execute_query(f"SELECT COUNT(*) AS n FROM {default}")[0]['n'] == 1
+
+    assert pg_db.ensure_partitions() == [f"{ACTIVITIES_TABLE}_p202005"]
+    assert pg_db.execute_query(f"SELECT COUNT(*) AS n FROM {default}")[0]['n'] == 0
+    moved = pg_db.execute_query(f"SELECT description FROM {ACTIVITIES_TABLE}_p202005")
+    assert [row['description'] for row in moved] == ["old"]
+    # 옮기는 동안 트리거를 끄므로 카운터와 일별 집계는 그대로
+    counters = pg_db.execute_query(
+        "SELECT total_activities FROM claude_integration_user_learning_counters"
+    )
+    assert counters[0]['total_activities'] == 1
+    rollup = pg_db.execute_query(
+        "SELECT SUM(activity_count) AS n FROM claude_integration_daily_activity_rollup"
+    )
+    assert rollup[0]['n'] == 1
@@ -0,0 +1,68 @@
+"""
+쿼리 시간 예산 테스트 (statement_timeout 재설정, 호출 전체 마감, 취소)
+"""
+
+import sqlite3
+import time
+
+import pytest
+from psycopg2.extensions import QueryCanceledError
+
+from app.core.config import settings
+from app.core.database import Database
+from app.core.deadlines import BATCH, INTERACTIVE
+
+SLOW_SQLITE_QUERY = """
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n)
+SELECT MAX(i) FROM n
+"""
+
+
+def test_budget_names_and_numbers_convert_to_milliseconds():
+    db = Database()
+    assert db.timeout_ms(INTERACTIVE) == settings.DB_INTERACTIVE_TIMEOUT_MS
+    assert db.timeout_ms(BATCH) == settings.DB_BATCH_TIMEOUT_MS
+    assert db.timeout_ms(250) == 250
+    assert db.timeout_ms(None) == 0
+    with pytest.raises(ValueError):
+        db.timeout_ms("forever")
+
+
+def statement_timeout(db, budget):
+    rows = db.execute_query("SHOW statement_timeout", budget=budget)
+    return rows[0]['statement_timeout']
+
+
+def test_statement_timeout_is_reset_on_every_borrow(pg_db):
+    assert statement_timeout(pg_db, 1234) == "1234ms"
+    assert statement_timeout(pg_db, None) == "0"
+
+    # 롤백된 SET은 세션 값을 알 수 없게 만들므로 다음 사용 때 다시 설정
+    with pytest.raises(RuntimeError):
+        with pg_db.transaction(budget=1234) as tx:
+            tx.execute("SET statement_timeout = 50")
+            raise RuntimeError("stop")
+    assert statement_timeout(pg_db, 1234) == "1234ms"
+
+
+def test_slow_statement_is_cancelled(pg_db):
+    started = time.monotonic()
+    with pytest.raises(QueryCanceledError):
+        pg_db.execute_query("SELECT pg_sleep(5)", budget=200)
+    assert time.monotonic() - started < 2
+    assert pg_db.execute_query("SELECT 1 AS ok")[0]['ok'] == 1
+
+
+def test_call_deadline_spans_statements(pg_db):
+    # 문장 하나는 예산 안이지만 호출 전체는 예산을 넘음
+    with pytest.raises(QueryCanceledError):
+        with pg_db.transaction(budget=300) as tx:
+            for _ in range(5):
+                tx.execute("SELECT pg_sleep(0.2)")
+
+
+def test_sqlite_budget_interrupts_long_queries(sqlite_db):
+    started = time.monotonic()
+    with pytest.raises(sqlite3.OperationalError):
+        sqlite_db.execute_query(SLOW_SQLITE_QUERY, budget=100)
+    assert time.monotonic() - started < 2
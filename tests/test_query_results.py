@@ -0,0 +1,73 @@
+"""
+execute_query 결과 판별(RETURNING 포함)과 준비된 문장 캐시 테스트
+"""
+
+import pytest
+
+from app.core.database import _to_server_placeholders
+
+INSERT_USER = (
+    "INSERT INTO claude_integration_users (username, email, password_hash, full_name) "
+    "VALUES (%s, %s, 'x', 'x')"
+)
+
+
+def test_returning_and_cte_statements_return_rows(any_db):
+    inserted = any_db.execute_query(
+        INSERT_USER + " RETURNING id, username", ("alice", "alice@example.com")
+    )
+    assert [row['username'] for row in inserted] == ["alice"]
+
+    rows = any_db.execute_query(
+        "WITH named AS (SELECT username FROM claude_integration_users) "
+        "SELECT username FROM named"
+    )
+    assert [row['username'] for row in rows] == ["alice"]
+
+
+def test_statements_without_rows_report_affected_rows(any_db):
+    any_db.execute_query(INSERT_USER, ("alice", "alice@example.com"))
+
+    updated = any_db.execute_query(
+        "UPDATE claude_integration_users SET full_name = %s", ("Alice",)
+    )
+    assert updated == [{"affected_rows": 1}]
+    assert any_db.execute_query(
+        "DELETE FROM claude_integration_users WHERE username = %s", ("nobody",)
+    ) == [{"affected_rows": 0}]
+
+
+def test_server_placeholders_reuse_named_parameters():
+    query = "SELECT %(a)s, %(b)s, %(a)s, '100%%'"
+    assert _to_server_placeholders(query) == ("SELECT $1, $2, $1, '100%'", ["a", "b"])
+    assert _to_server_placeholders("SELECT %s, %s") == ("SELECT $1, $2", None)
+    with pytest.raises(ValueError):
+        _to_server_placeholders("SELECT %s, %(a)s")
+
+
+def test_prepared_statement_is_prepared_once_per_connection(pg_db):
+    with pg_db.transaction() as tx:
+        for value in (1, 2):
+            rows = tx.execute_prepared(
+                "wq_probe", "SELECT %(v)s::INTEGER AS v, %(v)s::INTEGER + 1 AS w",
+                {'v': value}
+            )
+            assert rows == [{'v': value, 'w': value + 1}]
+        prepared = tx.execute(
+            "SELECT COUNT(*) AS n FROM pg_prepared_statements WHERE name = 'wq_probe'"
+        )
+        assert prepared[0]['n'] == 1
+        assert tx.connection.prepared_statements == {
+            'wq_probe': "SELECT %(v)s::INTEGER AS v, %(v)s::INTEGER + 1 AS w"
+        }
+
+
+def test_prepared_statement_survives_rollback_and_query_changes(pg_db):
+    with pytest.raises(RuntimeError):
+        with pg_db.transaction() as tx:
+            tx.execute_prepared("wq_probe", "SELECT 1 AS v")
+            raise RuntimeError("stop")
+
+    assert pg_db.execute_prepared("wq_probe", "SELECT 1 AS v") == [{'v': 1}]
+    # 같은 이름에 다른 쿼리를 주면 다시 PREPARE
+    assert pg_db.execute_prepared("wq_probe", "SELECT 2 AS v") == [{'v': 2}]
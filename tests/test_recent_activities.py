@@ -0,0 +1,55 @@
+"""
+최근 학습 활동 조회 테스트 (기록된 활동 우선, 원본 테이블 대체 활동)
+"""
+
+from datetime import datetime, timedelta
+
+from conftest import create_user
+
+BASE_TIME = datetime(2024, 3, 1, 9, 0)
+
+
+def add_row(db, table, column, user_id, text, created_at):
+    db.execute_query(
+        f"INSERT INTO claude_integration_{table} (user_id, {column}, created_at) "
+        f"VALUES (%s, %s, %s)",
+        (user_id, text, created_at)
+    )
+
+
+def test_recorded_activities_are_returned_newest_first(learning_service):
+    user_id = create_user(learning_service.db)
+    learning_service.save_chat_message(user_id, "first", "reply")
+    learning_service.save_grammar_check(user_id, "second", "fixed")
+    learning_service.save_vocabulary_check(user_id, "third", "meaning")
+
+    activities = learning_service.get_recent_activities(user_id, limit=2)
+    assert [activity.type for activity in activities] == [
+        "vocabulary_check", "grammar_check"
+    ]
+    assert activities[0].description == "어휘 분석 완료: third..."
+
+
+def test_fallback_derives_activities_from_learning_tables(learning_service):
+    db = learning_service.db
+    user_id = create_user(db)
+    add_row(db, "chat_messages", "user_message", user_id, "hello", BASE_TIME)
+    add_row(db, "grammar_checks", "original_text", user_id, "I goes",
+            BASE_TIME + timedelta(minutes=2))
+    add_row(db, "vocabulary_checks", "original_text", user_id, "word",
+            BASE_TIME + timedelta(minutes=1))
+    db.metrics.reset()
+
+    activities = learning_service.get_recent_activities(user_id, limit=2)
+    assert [(activity.type, activity.metadata) for activity in activities] == [
+        ("grammar_check", {'source': 'grammar_checks'}),
+        ("vocabulary_check", {'source': 'vocabulary_checks'}),
+    ]
+    assert activities[0].timestamp == BASE_TIME + timedelta(minutes=2)
+    queries = db.get_metrics_snapshot()["queries"]
+    assert sum(query["count"] for query in queries) == 1
+
+
+def test_user_without_records_has_no_activities(learning_service):
+    user_id = create_user(learning_service.db)
+    assert learning_service.get_recent_activities(user_id) == []
@@ -0,0 +1,59 @@
+"""
+경량 학습 기록 레코드 테스트 (튜플 저장, 딕셔너리식 접근, 한국 시간 표시)
+"""
+
+from datetime import datetime
+
+import pytest
+from conftest import create_user
+
+from app.services.records import (
+    ActivityRecord, ChatRecord, GrammarCheckRecord, format_kst, record_columns
+)
+
+CREATED = datetime(2024, 3, 1, 15, 30)
+
+
+def test_records_have_no_per_row_dict():
+    record = ChatRecord(1, "hi", "hello", "chat", CREATED)
+    assert not hasattr(record, "__dict__")
+    assert record_columns(ChatRecord) == ("user_message", "ai_response", "message_type")
+
+
+def test_dictionary_style_access():
+    record = GrammarCheckRecord(3, "I goes", "I go", CREATED)
+
+    assert record['corrected_text'] == "I go"
+    assert record[0] == 3
+    assert record.get('missing', "default") == "default"
+    with pytest.raises(KeyError):
+        record['missing']
+    assert record.to_dict() == {
+        'id': 3, 'original_text': "I goes", 'corrected_text': "I go",
+        'created_at': CREATED,
+    }
+
+
+def test_created_at_is_shown_in_korean_time():
+    record = ActivityRecord(1, "chat", "talk", {}, CREATED)
+    assert record.created_at == "2024-03-02 00:30"
+    assert record.type == "chat"
+    assert format_kst("2024-03-01T15:30:00Z") == "2024-03-02 00:30"
+    assert format_kst("not a date") == "not a date"
+
+
+def test_queries_build_records_from_tuple_rows(any_db):
+    user_id = create_user(any_db)
+    any_db.execute_query(
+        "INSERT INTO claude_integration_grammar_checks "
+        "(user_id, original_text, corrected_text, created_at) VALUES (%s, %s, %s, %s)",
+        (user_id, "I goes", "I go", CREATED)
+    )
+
+    rows = any_db.execute_query(
+        "SELECT id, original_text, corrected_text, created_at "
+        "FROM claude_integration_grammar_checks",
+        row_type=GrammarCheckRecord
+    )
+    assert isinstance(rows[0], GrammarCheckRecord)
+    assert (rows[0].original_text, rows[0].timestamp) == ("I goes", CREATED)
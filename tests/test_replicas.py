@@ -0,0 +1,99 @@
+"""
+읽기 복제본 라우팅 테스트 (분산, read-your-writes, 장애 시 프라이머리 대체)
+"""
+
+import psycopg2
+import pytest
+from psycopg2.extensions import parse_dsn
+
+from app.core.config import settings
+from app.core.database import Database
+from app.core.replicas import ReplicaRouter
+
+UNREACHABLE_DSN = "host=127.0.0.1 port=1 dbname=wordquest connect_timeout=1"
+PROBE_QUERY = "SELECT source FROM wq_routing_probe"
+
+
+def usable_router(count, **kwargs):
+    router = ReplicaRouter([f"dbname=replica{index}" for index in range(count)],
+                           **kwargs)
+    router._is_usable = lambda replica: True
+    return router
+
+
+def test_router_without_replicas_uses_the_primary():
+    router = ReplicaRouter([])
+    assert not router.enabled
+    assert router.choose(1) is None
+
+
+def test_router_spreads_reads_round_robin():
+    router = usable_router(2)
+    names = [router.choose().name for _ in range(4)]
+    assert names == ["replica1", "replica2", "replica1", "replica2"]
+    assert router.status()["replica_reads"] == 4
+
+
+def test_recent_writer_reads_from_the_primary():
+    router = usable_router(1, read_your_writes=60)
+    router.note_write(7)
+
+    assert router.choose(7) is None
+    assert router.choose(8) is not None
+    assert router.status()["read_your_writes"] == 1
+
+
+def test_unreachable_replica_is_skipped():
+    router = ReplicaRouter([UNREACHABLE_DSN], check_interval=60)
+
+    assert router.choose() is None
+    replica = router.replicas[0]
+    assert not replica.healthy
+    assert replica.last_error
+    assert router.status()["primary_fallbacks"] == 1
+
+
+@pytest.fixture
+def routed_db(pg_db, pg_replica_url, monkeypatch):
+    """프라이머리와 복제본에 같은 테이블을 두고 출처가 다른 값을 넣은 Database"""
+    pg_db.execute_query("CREATE TABLE wq_routing_probe (source TEXT)")
+    pg_db.execute_query("INSERT INTO wq_routing_probe VALUES ('primary')")
+    conn = psycopg2.connect(pg_replica_url)
+    with conn, conn.cursor() as cursor:
+        cursor.execute("CREATE TABLE wq_routing_probe (source TEXT)")
+        cursor.execute("INSERT INTO wq_routing_probe VALUES ('replica')")
+    conn.close()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", pg_replica_url)
+    db = Database()
+    yield db
+    db.close()
+
+
+def source(db, **kwargs):
+    return db.execute_query(PROBE_QUERY, **kwargs)[0]['source']
+
+
+def test_read_only_queries_go_to_the_replica(routed_db):
+    assert source(routed_db, read_only=True) == "replica"
+    assert source(routed_db) == "primary"
+
+    routed_db.note_write(1)
+    assert source(routed_db, read_only=True, user_id=1) == "primary"
+    assert source(routed_db, read_only=True, user_id=2) == "replica"
+
+
+def test_broken_replica_connection_falls_back_to_the_primary(
+    routed_db, pg_db, pg_replica_url
+):
+    assert source(routed_db, read_only=True) == "replica"
+    assert routed_db.replicas.replicas[0].status()["idle"] == 1
+    # 풀에 남은 복제본 연결을 서버에서 끊음
+    pg_db.execute_query(
+        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s",
+        (parse_dsn(pg_replica_url)['dbname'],)
+    )
+
+    assert source(routed_db, read_only=True) == "primary"
+    replica = routed_db.replicas.replicas[0]
+    assert not replica.healthy
+    assert replica.status()["in_use"] == 0
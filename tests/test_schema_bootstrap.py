@@ -0,0 +1,77 @@
+"""
+스키마 부트스트랩 캐시와 advisory lock 조율 테스트 (PostgreSQL 서버 필요: TEST_DATABASE_URL)
+"""
+
+import threading
+
+import pytest
+
+from app.core.database import Database
+from app.core.migrations import MIGRATIONS, SCHEMA_LOCK_ID, MigrationRunner
+
+
+def hold_schema_lock(db):
+    """다른 노드가 마이그레이션 중인 상황 (세션 advisory lock을 잡은 연결 반환)"""
+    conn = db.connection_pool.getconn()
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (SCHEMA_LOCK_ID,))
+    return conn
+
+
+def release_schema_lock(db, conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_unlock(%s)", (SCHEMA_LOCK_ID,))
+    conn.autocommit = False
+    db.connection_pool.putconn(conn)
+
+
+def test_waiting_for_the_schema_lock_times_out(pg_database):
+    pg_database.test_connection()
+    conn = hold_schema_lock(pg_database)
+    try:
+        with pytest.raises(TimeoutError):
+            MigrationRunner(pg_database, lock_timeout=0.2).run()
+    finally:
+        release_schema_lock(pg_database, conn)
+
+
+def test_current_schema_does_not_wait_for_the_lock(pg_db):
+    conn = hold_schema_lock(pg_db)
+    try:
+        assert MigrationRunner(pg_db, lock_timeout=0.2).run() == []
+    finally:
+        release_schema_lock(pg_db, conn)
+
+
+def test_bootstrap_runs_once_per_process(pg_db, monkeypatch):
+    def fail(self, allow_offline=False):
+        raise AssertionError("마이그레이션 실행기를 다시 호출함")
+
+    monkeypatch.setattr(MigrationRunner, "run", fail)
+    assert pg_db.create_tables_if_not_exist() == []
+
+
+def test_concurrent_nodes_apply_each_migration_once(pg_database):
+    nodes = [pg_database] + [Database() for _ in range(2)]
+    results = {}
+    errors = []
+
+    def bootstrap(index, db):
+        try:
+            results[index] = db.create_tables_if_not_exist()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=bootstrap, args=(index, db))
+               for index, db in enumerate(nodes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for db in nodes[1:]:
+        db.close()
+
+    assert errors == []
+    applied = sorted(version for versions in results.values() for version in versions)
+    assert applied == [migration.version for migration in MIGRATIONS]
@@ -0,0 +1,43 @@
+"""
+학습 기록 전문 검색 테스트 (기록 본문과 블롭 본문, 사용자 범위, 페이지)
+"""
+
+from conftest import create_user
+
+
+def test_search_matches_messages_and_blob_content(learning_service):
+    user_id = create_user(learning_service.db)
+    other_id = create_user(learning_service.db, "other")
+    learning_service.save_chat_message(user_id, "Tell me about penguins", "They swim")
+    learning_service.save_chat_message(user_id, "Hello", "Glaciers are melting")
+    learning_service.save_grammar_check(user_id, "Penguins is birds", "Penguins are")
+    learning_service.save_chat_message(other_id, "penguins again", "other user")
+
+    result = learning_service.search_history(user_id, "penguins")
+    assert result['page'] == 1 and not result['has_more']
+    assert sorted(hit.type for hit in result['items']) == ["chat", "grammar_check"]
+    assert all(hit.title != "penguins again" for hit in result['items'])
+
+    glaciers = learning_service.search_history(user_id, "glaciers")['items']
+    assert [hit.title for hit in glaciers] == ["Hello"]
+    assert "**Glaciers**" in glaciers[0].snippet
+
+
+def test_search_pages(learning_service):
+    user_id = create_user(learning_service.db)
+    for index in range(3):
+        learning_service.save_chat_message(user_id, f"walrus {index}", "answer")
+
+    first = learning_service.search_history(user_id, "walrus", limit=2)
+    second = learning_service.search_history(user_id, "walrus", limit=2, page=2)
+    assert (len(first['items']), first['has_more']) == (2, True)
+    assert (len(second['items']), second['has_more']) == (1, False)
+    ids = {hit.id for hit in first['items'] + second['items']}
+    assert len(ids) == 3
+
+
+def test_blank_query_returns_nothing(learning_service):
+    user_id = create_user(learning_service.db)
+    assert learning_service.search_history(user_id, "   ") == {
+        'items': [], 'page': 1, 'has_more': False
+    }
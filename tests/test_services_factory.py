@@ -0,0 +1,53 @@
+"""
+프로세스 단위 서비스 인스턴스 테스트 (공유, 정리, fork 후 재생성)
+"""
+
+import threading
+
+import pytest
+from conftest import use_database
+
+from app.services import factory
+from app.services.factory import close_services, get_services
+
+
+@pytest.fixture
+def services_db(sqlite_db, monkeypatch):
+    use_database(sqlite_db, monkeypatch)
+    monkeypatch.setattr(factory, "_services", None)
+    yield sqlite_db
+    close_services()
+
+
+def test_services_are_shared_across_calls_and_threads(services_db):
+    services = get_services()
+    assert get_services() is services
+    assert services.auth.db is services_db
+    assert services.learning.db is services_db
+
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(get_services()))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(other is services for other in seen)
+
+
+def test_close_services_releases_resources_once(services_db, monkeypatch):
+    closed = []
+    monkeypatch.setattr(services_db, "close", lambda: closed.append("db"))
+    services = get_services()
+
+    close_services()
+    close_services()
+    assert closed == ["db"]
+    assert get_services() is not services
+
+
+def test_forked_child_discards_parent_services(services_db):
+    services = get_services()
+    factory._reset_services_after_fork()
+    assert factory._services is None
+    assert get_services() is not services
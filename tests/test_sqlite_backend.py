@@ -0,0 +1,72 @@
+"""
+내장 SQLite 백엔드 테스트 (스키마, WAL, 스레드별 연결, 동시 쓰기)
+"""
+
+import threading
+
+from conftest import create_user, use_database
+
+from app.core.sqlite_backend import SQLITE_SCHEMA_VERSION, SqliteDatabase
+from app.services.learning_service import LearningService
+
+
+def test_schema_is_created_once(sqlite_db):
+    assert sqlite_db.create_tables_if_not_exist() == []
+    # 같은 파일을 여는 다른 프로세스는 user_version으로 최신 여부 판단
+    other = SqliteDatabase(sqlite_db.path)
+    assert other.create_tables_if_not_exist() == []
+    assert other.get_migration_status() == [{
+        'version': SQLITE_SCHEMA_VERSION, 'name': 'sqlite_schema',
+        'applied': True, 'applied_at': None,
+    }]
+    assert other.table_exists("claude_integration_chat_messages")
+    assert not other.table_exists("wq_missing")
+    other.close()
+
+
+def test_connections_use_wal_and_one_connection_per_thread(sqlite_db):
+    with sqlite_db.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        main_conn = conn
+
+    seen = []
+
+    def borrow():
+        seen.append(sqlite_db._thread_connection())
+
+    thread = threading.Thread(target=borrow)
+    thread.start()
+    thread.join()
+    assert seen[0] is not main_conn
+    assert sqlite_db._thread_connection() is main_conn
+
+
+def test_concurrent_writers_do_not_fail(sqlite_db, monkeypatch):
+    use_database(sqlite_db, monkeypatch)
+    learning_service = LearningService()
+    user_id = create_user(sqlite_db)
+    results = []
+
+    def write(worker):
+        for index in range(10):
+            results.append(
+                learning_service.save_chat_message(user_id, f"{worker}-{index}", "same")
+            )
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 40
+    assert learning_service.get_user_stats(user_id)['total_chats'] == 40
+
+
+def test_stream_query_returns_dict_rows(sqlite_db):
+    create_user(sqlite_db, "alice")
+    create_user(sqlite_db, "bob")
+    rows = list(sqlite_db.stream_query(
+        "SELECT username FROM claude_integration_users ORDER BY username", itersize=1
+    ))
+    assert rows == [{'username': "alice"}, {'username': "bob"}]
@@ -0,0 +1,110 @@
+"""
+SQLite 백엔드 유지보수 작업 테스트 (카운터/집계 재구축, 활동 백필, 블롭 정리, db_tools)
+"""
+
+import pytest
+from conftest import create_user
+
+import db_tools
+from app.core.content_store import BLOBS_TABLE
+
+COUNTERS_TABLE = "claude_integration_user_learning_counters"
+ROLLUP_TABLE = "claude_integration_daily_activity_rollup"
+ACTIVITIES_TABLE = "claude_integration_learning_activities"
+
+
+def add_activities(db, user_id, count):
+    for index in range(count):
+        db.execute_query(
+            f"INSERT INTO {ACTIVITIES_TABLE} (user_id, activity_type, description) "
+            f"VALUES (%s, 'chat', %s)",
+            (user_id, f"activity {index}")
+        )
+
+
+def test_rebuild_counters_restores_trigger_values(sqlite_db):
+    user_id = create_user(sqlite_db)
+    add_activities(sqlite_db, user_id, 3)
+    expected = dict(sqlite_db.execute_query(f"SELECT * FROM {COUNTERS_TABLE}")[0])
+    sqlite_db.execute_query(
+        f"UPDATE {COUNTERS_TABLE} SET total_activities = 99, first_activity_at = NULL"
+    )
+
+    assert sqlite_db.rebuild_user_learning_counters(user_id) == 1
+    rebuilt = dict(sqlite_db.execute_query(f"SELECT * FROM {COUNTERS_TABLE}")[0])
+    for column in ("total_chats", "total_activities", "first_activity_at",
+                   "last_activity_at"):
+        assert rebuilt[column] == expected[column]
+
+
+def test_rebuild_rollup_drops_stale_rows(sqlite_db):
+    user_id = create_user(sqlite_db)
+    add_activities(sqlite_db, user_id, 2)
+    sqlite_db.execute_query(
+        f"INSERT INTO {ROLLUP_TABLE} VALUES (%s, '2000-01-01', 'chat', 5)", (user_id,)
+    )
+
+    assert sqlite_db.rebuild_daily_activity_rollup() == 1
+    rows = sqlite_db.execute_query(
+        f"SELECT activity_type, activity_count FROM {ROLLUP_TABLE}"
+    )
+    assert [(row['activity_type'], row['activity_count']) for row in rows] == [
+        ('chat', 2)
+    ]
+
+
+def test_backfill_only_users_without_activities(sqlite_db):
+    learner = create_user(sqlite_db, "learner")
+    active = create_user(sqlite_db, "active")
+    for user_id in (learner, active):
+        sqlite_db.execute_query(
+            "INSERT INTO claude_integration_grammar_checks "
+            "(user_id, original_text, corrected_text) VALUES (%s, 'I goes', 'I go')",
+            (user_id,)
+        )
+    add_activities(sqlite_db, active, 1)
+
+    assert sqlite_db.backfill_learning_activities() == 1
+    assert sqlite_db.backfill_learning_activities() == 0
+    row = sqlite_db.execute_query(
+        f"SELECT activity_type, description, metadata FROM {ACTIVITIES_TABLE} "
+        f"WHERE user_id = %s", (learner,)
+    )[0]
+    assert row['activity_type'] == 'grammar_check'
+    assert row['description'] == '문법 검사 완료: I goes...'
+    assert row['metadata'] == {'source': 'grammar_checks', 'backfilled': True}
+
+
+def test_collect_blobs_recounts_and_respects_grace(sqlite_db):
+    sqlite_db.execute_query(
+        f"INSERT INTO {BLOBS_TABLE} (hash, content, byte_size, ref_count, created_at) "
+        f"VALUES (X'01', 'old', 3, 4, datetime('now', '-2 hours')), "
+        f"(X'02', 'new', 3, 4, CURRENT_TIMESTAMP)"
+    )
+
+    result = sqlite_db.collect_content_blobs(grace_minutes=60)
+    assert result == {'recounted': 2, 'deleted': 1}
+    rows = sqlite_db.execute_query(f"SELECT content, ref_count FROM {BLOBS_TABLE}")
+    assert [(row['content'], row['ref_count']) for row in rows] == [('new', 0)]
+
+
+@pytest.mark.parametrize("argv", [
+    ["partitions", "--archive"],
+    ["import", "users", "users.csv"],
+])
+def test_db_tools_rejects_postgres_only_commands(sqlite_db, argv, capsys):
+    args = db_tools.build_parser().parse_args(argv)
+    assert args.handler(sqlite_db, args) is False
+    assert "sqlite 백엔드에서는 지원하지 않는" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("argv", [
+    ["rebuild-counters"],
+    ["rebuild-rollup"],
+    ["backfill-activities"],
+    ["partitions"],
+    ["gc-blobs"],
+])
+def test_db_tools_maintenance_commands_run_on_sqlite(sqlite_db, argv):
+    args = db_tools.build_parser().parse_args(argv)
+    assert args.handler(sqlite_db, args) is True
@@ -0,0 +1,92 @@
+"""
+사용자별 통계 캐시 테스트 (적중, 세대 기반 무효화, 만료, 저장 시 무효화)
+"""
+
+from conftest import create_user
+
+from app.core import stats_cache
+from app.core.config import settings
+from app.core.stats_cache import InProcessStatsCache, StatsCache
+
+
+class Loader:
+    """호출 횟수를 세는 조회 함수"""
+
+    def __init__(self, value="value", during=None):
+        self.value = value
+        self.during = during
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.during:
+            self.during()
+        return self.value
+
+
+def test_values_are_cached_until_invalidated():
+    cache = InProcessStatsCache()
+    loader = Loader()
+
+    assert cache.get_or_load(1, "stats", loader) == "value"
+    assert cache.get_or_load(1, "stats", loader) == "value"
+    assert loader.calls == 1
+
+    cache.invalidate(1)
+    cache.get_or_load(1, "stats", loader)
+    assert loader.calls == 2
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+
+
+def test_value_loaded_during_an_invalidation_is_not_stored():
+    cache = InProcessStatsCache()
+    stale = Loader("stale", during=lambda: cache.invalidate(1))
+
+    assert cache.get_or_load(1, "stats", stale) == "stale"
+    fresh = Loader("fresh")
+    assert cache.get_or_load(1, "stats", fresh) == "fresh"
+    assert fresh.calls == 1
+
+
+def test_expiry_and_user_limit():
+    expired = InProcessStatsCache(ttl=0)
+    loader = Loader()
+    expired.get_or_load(1, "stats", loader)
+    expired.get_or_load(1, "stats", loader)
+    assert loader.calls == 2
+
+    bounded = InProcessStatsCache(max_users=2)
+    for user_id in (1, 2, 3):
+        bounded.get_or_load(user_id, "stats", Loader())
+    assert list(bounded._users) == [2, 3]
+
+
+def test_disabled_cache_always_loads_and_units_invalidate_users():
+    loader = Loader()
+    cache = StatsCache()
+    cache.get_or_load(1, "stats", loader)
+    cache.get_or_load(1, "stats", loader)
+    assert loader.calls == 2
+
+    memory = InProcessStatsCache()
+    memory.invalidate_units([[
+        ("claude_integration_chat_messages", ("user_id", "user_message"), (5, "hi")),
+    ]])
+    assert memory._users[5]["gen"] == 1
+
+
+def test_redis_without_url_falls_back_to_memory(monkeypatch):
+    monkeypatch.setattr(settings, "STATS_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "REDIS_URL", "")
+    assert isinstance(stats_cache._create_stats_cache(), InProcessStatsCache)
+
+
+def test_saving_a_record_refreshes_cached_stats(learning_service):
+    user_id = create_user(learning_service.db)
+    assert learning_service.get_user_stats(user_id)['total_chats'] == 0
+    assert learning_service.get_recent_activities(user_id) == []
+
+    learning_service.save_chat_message(user_id, "Hello", "Hi")
+    assert learning_service.get_user_stats(user_id)['total_chats'] == 1
+    assert len(learning_service.get_recent_activities(user_id)) == 1
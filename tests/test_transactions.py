@@ -0,0 +1,69 @@
+"""
+작업 단위 트랜잭션 API 테스트 (커밋, 롤백, 세이브포인트, 일괄 실행)
+"""
+
+import pytest
+
+INSERT_USER = (
+    "INSERT INTO claude_integration_users (username, email, password_hash, full_name) "
+    "VALUES (%s, %s, 'x', 'x')"
+)
+
+
+def usernames(db):
+    rows = db.execute_query(
+        "SELECT username FROM claude_integration_users ORDER BY username"
+    )
+    return [row['username'] for row in rows]
+
+
+def test_transaction_commits_every_statement(any_db):
+    with any_db.transaction() as tx:
+        tx.execute(INSERT_USER, ("alice", "alice@example.com"))
+        tx.execute(INSERT_USER, ("bob", "bob@example.com"))
+
+    assert usernames(any_db) == ["alice", "bob"]
+
+
+def test_transaction_rolls_back_on_error(any_db):
+    with pytest.raises(RuntimeError):
+        with any_db.transaction() as tx:
+            tx.execute(INSERT_USER, ("alice", "alice@example.com"))
+            raise RuntimeError("stop")
+
+    assert usernames(any_db) == []
+
+
+def test_savepoint_rolls_back_only_its_block(any_db):
+    with any_db.transaction() as tx:
+        tx.execute(INSERT_USER, ("alice", "alice@example.com"))
+        with pytest.raises(Exception):
+            with tx.savepoint():
+                tx.execute(INSERT_USER, ("bob", "bob@example.com"))
+                # username 중복으로 실패
+                tx.execute(INSERT_USER, ("alice", "other@example.com"))
+        tx.execute(INSERT_USER, ("carol", "carol@example.com"))
+
+    assert usernames(any_db) == ["alice", "carol"]
+
+
+def test_batch_helpers_run_in_the_same_transaction(any_db):
+    with any_db.transaction() as tx:
+        assert tx.execute_values(
+            "INSERT INTO claude_integration_users "
+            "(username, email, password_hash, full_name) VALUES %s",
+            [("alice", "alice@example.com", "x", "x"),
+             ("bob", "bob@example.com", "x", "x")]
+        ) == 2
+        tx.execute_many(INSERT_USER, [("carol", "carol@example.com")])
+        assert tx.execute_pipelined([
+            ("UPDATE claude_integration_users SET full_name = %s WHERE username = %s",
+             ("Alice", "alice")),
+            ("DELETE FROM claude_integration_users WHERE username = %s", ("bob",)),
+        ]) == 2
+
+    assert usernames(any_db) == ["alice", "carol"]
+    row = any_db.execute_query(
+        "SELECT full_name FROM claude_integration_users WHERE username = 'alice'"
+    )[0]
+    assert row['full_name'] == "Alice"
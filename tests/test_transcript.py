@@ -0,0 +1,140 @@
+"""
+채팅 화면 기록 테스트 (보관 개수, 밀려난 대화, 이전 대화 불러오기)
+"""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+from app.services.transcript import ChatTranscript, _turn_size
+
+
+class FakeHistory:
+    """LearningService의 채팅 기록 페이지 조회를 흉내 냄 (커서 = 이 시각 이전)"""
+
+    def __init__(self):
+        self.records = []  # 오래된 순
+
+    def save(self, turn):
+        # 저장 시각은 화면 기록 추가 시각 직후
+        self.records.append(SimpleNamespace(
+            user_message=turn.prompt, ai_response=turn.response,
+            timestamp=turn.timestamp + timedelta(microseconds=1)
+        ))
+
+    def cursor_before(self, created_at):
+        return created_at
+
+    def load_page(self, user_id, limit, cursor=None):
+        candidates = [r for r in self.records if cursor is None or r.timestamp < cursor]
+        items = list(reversed(candidates))[:limit]  # 최신순
+        has_more = len(candidates) > limit
+        next_cursor = items[-1].timestamp if has_more else None
+        return {'items': items, 'next_cursor': next_cursor}
+
+
+def chat(transcript, history, text, saved=True):
+    turn = transcript.add_turn(text, f"re: {text}", saved)
+    if saved:
+        history.save(turn)
+    return turn
+
+
+def load_all(transcript, history, page_size=2):
+    while transcript.can_load_earlier():
+        if not transcript.load_earlier(
+            history.load_page, 1, history.cursor_before, page_size=page_size
+        ):
+            break
+
+
+def prompts(transcript):
+    return [turn.prompt for turn in transcript.turns()]
+
+
+def test_recent_turns_are_bounded():
+    transcript = ChatTranscript(max_turns=3)
+    history = FakeHistory()
+    for index in range(5):
+        chat(transcript, history, f"m{index}")
+    assert prompts(transcript) == ["m2", "m3", "m4"]
+    assert transcript.evicted == 2
+    assert transcript.memory_bytes() == sum(
+        _turn_size(turn) for turn in transcript.turns()
+    )
+
+
+def test_load_earlier_returns_evicted_turns_without_overlap():
+    transcript = ChatTranscript(max_turns=3)
+    history = FakeHistory()
+    for index in range(6):
+        chat(transcript, history, f"m{index}")
+    load_all(transcript, history)
+    assert prompts(transcript) == [f"m{index}" for index in range(6)]
+    assert not transcript.can_load_earlier()
+
+
+def test_turns_evicted_after_loading_stay_visible():
+    transcript = ChatTranscript(max_turns=3)
+    history = FakeHistory()
+    for index in range(4):
+        chat(transcript, history, f"m{index}")
+    loaded = transcript.load_earlier(
+        history.load_page, 1, history.cursor_before, page_size=1
+    )
+    assert loaded == 1
+    for index in range(4, 8):
+        chat(transcript, history, f"m{index}")
+    assert prompts(transcript) == [f"m{index}" for index in range(8)]
+    load_all(transcript, history)
+    assert prompts(transcript) == [f"m{index}" for index in range(8)]
+
+
+def test_earlier_turns_are_capped_and_can_be_reloaded():
+    transcript = ChatTranscript(max_turns=2, max_earlier_turns=3)
+    history = FakeHistory()
+    for index in range(6):
+        chat(transcript, history, f"m{index}")
+    load_all(transcript, history)
+    assert prompts(transcript) == ["m1", "m2", "m3", "m4", "m5"]
+    assert transcript.earlier_full() and not transcript.can_load_earlier()
+
+    # 새 대화로 밀려난 대화가 붙으면 가장 오래된 대화부터 해제
+    chat(transcript, history, "m6")
+    chat(transcript, history, "m7")
+    assert prompts(transcript) == ["m3", "m4", "m5", "m6", "m7"]
+    assert len(transcript.earlier) == 3
+
+    # 해제한 대화는 다시 불러올 수 있음 (상한 안에서)
+    transcript.hide_earlier()
+    load_all(transcript, history, page_size=10)
+    assert prompts(transcript) == ["m3", "m4", "m5", "m6", "m7"]
+
+
+def test_unsaved_turns_are_not_used_as_boundary():
+    transcript = ChatTranscript(max_turns=3)
+    history = FakeHistory()
+    chat(transcript, history, "m0")
+    chat(transcript, history, "m1")
+    failed = chat(transcript, history, "m2")
+    transcript.mark_unsaved(failed)
+    chat(transcript, history, "m3")
+    load_all(transcript, history)
+    assert prompts(transcript) == ["m0", "m1", "m2", "m3"]
+
+
+def test_hide_and_clear_release_memory():
+    transcript = ChatTranscript(max_turns=2)
+    history = FakeHistory()
+    for index in range(5):
+        chat(transcript, history, f"m{index}")
+    recent_bytes = transcript.memory_bytes()
+    load_all(transcript, history)
+    assert transcript.memory_bytes() == sum(
+        _turn_size(turn) for turn in transcript.turns()
+    )
+    assert transcript.memory_bytes() > recent_bytes
+    transcript.hide_earlier()
+    assert transcript.memory_bytes() == recent_bytes
+    transcript.clear()
+    assert transcript.memory_bytes() == 0
+    assert len(transcript) == 0
@@ -0,0 +1,187 @@
+"""
+write-behind 버퍼 테스트 (실패 격리, 재시도, 저널 재처리)
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+from app.core.write_behind import WriteBehindBuffer, _encode_unit, fcntl
+
+TABLE = "claude_integration_learning_activities"
+COLUMNS = ("user_id", "activity_type", "description")
+
+
+def make_unit(user_id, description="ok"):
+    """학습 활동 한 건짜리 작업 단위"""
+    return [(TABLE, COLUMNS, (user_id, "chat", description))]
+
+
+class FakeDatabase:
+    """execute_values_batch만 흉내 내는 DB (실패 규칙은 fail(rows)가 예외를 던져 표현)"""
+
+    def __init__(self, fail=None):
+        self.rows = []
+        self.calls = 0
+        self.fail = fail
+
+    def execute_values_batch(self, statements, budget=None):
+        self.calls += 1
+        rows = [row for _, statement_rows in statements for row in statement_rows]
+        if self.fail:
+            self.fail(rows)
+        self.rows.extend(rows)
+        return len(rows)
+
+
+def reject_bad(rows):
+    """'BAD' 설명이 섞인 배치는 데이터 오류로 실패"""
+    if any(row[2] == "BAD" for row in rows):
+        raise ValueError("invalid byte sequence")
+
+
+def make_buffer(db, **kwargs):
+    kwargs.setdefault("flush_interval", 0.01)
+    return WriteBehindBuffer(db=db, **kwargs)
+
+
+def test_bad_unit_is_dead_lettered_and_others_saved(tmp_path):
+    db = FakeDatabase(fail=reject_bad)
+    dead_letter = tmp_path / "dead.ndjson"
+    buffer = make_buffer(db, batch_size=10, dead_letter_path=str(dead_letter))
+    try:
+        for user_id in range(5):
+            buffer.enqueue(make_unit(user_id))
+        buffer.enqueue(make_unit(99, "BAD"))
+        assert buffer.flush(timeout=5)
+        for user_id in range(5, 8):
+            buffer.enqueue(make_unit(user_id))
+        assert buffer.flush(timeout=5)
+    finally:
+        buffer.close()
+
+    assert sorted(row[0] for row in db.rows) == list(range(8))
+    stats = buffer.get_stats()
+    assert stats["dead_lettered"] == 1
+    assert stats["pending_retry"] == 0
+    lines = dead_letter.read_text(encoding="utf-8").splitlines()
+    entries = [json.loads(line) for line in lines]
+    assert len(entries) == 1
+    assert entries[0]["unit"][0][2] == [99, "chat", "BAD"]
+    assert "invalid byte sequence" in entries[0]["error"]
+
+
+def test_transient_failure_is_retried_without_dead_letter():
+    failures = {"left": 3}
+
+    def flaky(rows):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise sqlite3.OperationalError("database is locked")
+
+    db = FakeDatabase(fail=flaky)
+    buffer = make_buffer(db)
+    try:
+        for user_id in range(4):
+            buffer.enqueue(make_unit(user_id))
+        assert buffer.flush(timeout=5)
+    finally:
+        buffer.close()
+
+    assert sorted(row[0] for row in db.rows) == list(range(4))
+    assert buffer.get_stats()["dead_lettered"] == 0
+    assert buffer.get_stats()["failures"] == 3
+
+
+def test_pending_retry_is_capped():
+    def down(rows):
+        raise sqlite3.OperationalError("unable to open database file")
+
+    db = FakeDatabase(fail=down)
+    buffer = make_buffer(db, batch_size=2, max_queue=50, max_pending=3)
+    try:
+        for user_id in range(20):
+            buffer.enqueue(make_unit(user_id))
+        time.sleep(0.3)
+        stats = buffer.get_stats()
+        assert 0 < stats["pending_retry"] <= 3 + 2
+        assert stats["queued"] >= 20 - 5
+        assert not buffer.flush(timeout=0.1)
+    finally:
+        db.fail = None
+        assert buffer.flush(timeout=5)
+        buffer.close()
+    assert sorted(row[0] for row in db.rows) == list(range(20))
+
+
+def test_replays_orphan_journal_and_skips_bad_units(tmp_path):
+    journal = tmp_path / "wb.journal"
+    orphan = tmp_path / "wb.journal.4194999"
+    orphan.write_text(
+        _encode_unit(make_unit(1)) + "\n"
+        + "{not json\n"
+        + _encode_unit(make_unit(2, "BAD")) + "\n"
+        + _encode_unit(make_unit(3)) + "\n",
+        encoding="utf-8"
+    )
+    db = FakeDatabase(fail=reject_bad)
+    buffer = make_buffer(db, journal_path=str(journal))
+    try:
+        assert buffer.get_stats()["replayed"] == 3
+        assert not orphan.exists()
+        assert buffer.flush(timeout=5)
+    finally:
+        buffer.close()
+
+    assert sorted(row[0] for row in db.rows) == [1, 3]
+    assert buffer.get_stats()["dead_lettered"] == 1
+    # 모두 처리했으므로 이 프로세스의 저널도 정리됨
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.skipif(fcntl is None, reason="파일 잠금(fcntl)이 없는 플랫폼")
+def test_live_sibling_journal_is_not_replayed(tmp_path):
+    journal = tmp_path / "wb.journal"
+    sibling = tmp_path / "wb.journal.4194998"
+    sibling.write_text(_encode_unit(make_unit(7)) + "\n", encoding="utf-8")
+    with open(sibling, "a+", encoding="utf-8") as held:
+        fcntl.flock(held.fileno(), fcntl.LOCK_EX)
+        db = FakeDatabase()
+        buffer = make_buffer(db, journal_path=str(journal))
+        try:
+            assert buffer.get_stats()["replayed"] == 0
+            buffer.enqueue(make_unit(8))
+            assert buffer.flush(timeout=5)
+        finally:
+            buffer.close()
+
+    assert [row[0] for row in db.rows] == [8]
+    assert sibling.read_text(encoding="utf-8").strip() == _encode_unit(make_unit(7))
+
+
+def test_journal_is_per_process_and_kept_while_pending(tmp_path):
+    journal = tmp_path / "wb.journal"
+
+    def down(rows):
+        raise sqlite3.OperationalError("server closed the connection unexpectedly")
+
+    db = FakeDatabase(fail=down)
+    buffer = make_buffer(db, journal_path=str(journal))
+    own = tmp_path / f"wb.journal.{os.getpid()}"
+    buffer.enqueue(make_unit(5))
+    assert own.exists()
+    buffer.close(timeout=0.2)
+
+    # 저장하지 못한 작업은 저널에 남아 다음 시작 때 재처리됨
+    assert len(own.read_text(encoding="utf-8").splitlines()) == 1
+    db = FakeDatabase()
+    buffer = make_buffer(db, journal_path=str(journal))
+    try:
+        assert buffer.flush(timeout=5)
+    finally:
+        buffer.close()
+    assert [row[0] for row in db.rows] == [5]
+    assert not own.exists()